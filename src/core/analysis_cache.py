@@ -0,0 +1,111 @@
+# src/core/analysis_cache.py - Caché del análisis por etapas con claves de parámetros
+
+import os
+import pickle
+import hashlib
+from pathlib import Path
+from src.settings import (AUDIO_ANALYSIS, ANALYSIS_CACHE, ONSET_BANDS, ONSET_CONFIG,
+                          TEMPO_CONFIG, STRUCTURE_CONFIG, BAR_CONFIG, LOUDNESS_CONFIG)
+from src.core import loudness
+
+# Etapas en orden: cada una depende de la anterior
+STAGES = ('features', 'tempo', 'structure', 'chart')
+
+# Subir la versión de una etapa cuando cambie su código invalida esa etapa
+# y todas las siguientes
+STAGE_VERSIONS = {
+    'features': 2,
+    'tempo': 1,
+    'structure': 1,
+    'chart': 1,
+}
+
+
+def stage_params(stage):
+    """Parámetros de settings de los que depende una etapa"""
+    if stage == 'features':
+        return (AUDIO_ANALYSIS['sample_rate'], AUDIO_ANALYSIS['n_fft'],
+                AUDIO_ANALYSIS['hop_length'], AUDIO_ANALYSIS['timbre_bands'],
+                {name: band['range'] for name, band in ONSET_BANDS.items()},
+                # La sonoridad (momentánea e integrada) se calcula en esta etapa
+                LOUDNESS_CONFIG['momentary_window'], loudness.K_SHELF, loudness.K_HIGHPASS,
+                loudness.ABSOLUTE_GATE, loudness.RELATIVE_GATE, loudness.GATE_BLOCK,
+                loudness.GATE_STEP)
+    if stage == 'tempo':
+        return (TEMPO_CONFIG, AUDIO_ANALYSIS['tempo_range'])
+    if stage == 'structure':
+        return (STRUCTURE_CONFIG, BAR_CONFIG['beats_per_bar'], LOUDNESS_CONFIG['intensity_headroom'])
+    if stage == 'chart':
+        return (BAR_CONFIG, ONSET_CONFIG, ONSET_BANDS)
+    raise ValueError(f"Etapa desconocida: {stage}")
+
+
+class AnalysisCache:
+    """
+    Resultados intermedios del análisis guardados por etapa
+
+    La clave de cada etapa es el hash de la clave de la etapa anterior más
+    sus propios parámetros: cambiar un umbral de estructura solo invalida
+    estructura y chart, y la STFT (lo caro) se reutiliza. Los valores se
+    guardan como datos planos (dicts/arrays) y no como objetos, para que
+    cambiar una clase no rompa el caché.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir or ANALYSIS_CACHE['dir'])
+
+    def stage_keys(self, content_hash):
+        """Claves encadenadas de todas las etapas de una pista"""
+        keys = {}
+        parent = content_hash
+        for stage in STAGES:
+            payload = repr((parent, stage, STAGE_VERSIONS[stage], stage_params(stage)))
+            parent = hashlib.sha1(payload.encode('utf-8')).hexdigest()[:20]
+            keys[stage] = parent
+        return keys
+
+    def path_for(self, stage, key):
+        """Archivo de una etapa"""
+        return self.cache_dir / stage / f"{key}.pkl"
+
+    def has(self, stage, key):
+        return self.path_for(stage, key).exists()
+
+    def get(self, stage, key):
+        """Valor guardado de una etapa (None si no existe o está dañado)"""
+        path = self.path_for(stage, key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"⚠️ Caché de {stage} dañado, se recalcula: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, stage, key, value):
+        """Guarda el valor de una etapa de forma atómica"""
+        path = self.path_for(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def clear(self, stage=None):
+        """Vacía una etapa (o todas)"""
+        for name in ([stage] if stage else STAGES):
+            for path in (self.cache_dir / name).glob('*.pkl'):
+                path.unlink(missing_ok=True)
+
+
+_analysis_cache = None
+
+
+def get_analysis_cache():
+    """Instancia compartida del caché de análisis"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache()
+    return _analysis_cache
@@ -0,0 +1,218 @@
+# src/core/assets.py - Gestor de assets: caché de superficies, precarga y memoria
+
+import os
+import threading
+import time
+import pygame
+from src.settings import ASSET_CONFIG
+
+
+def surface_bytes(value):
+    """Bytes de píxeles de una superficie (o de una lista/dict de superficies)"""
+    if isinstance(value, pygame.Surface):
+        return value.get_pitch() * value.get_height()
+    if isinstance(value, dict):
+        return sum(surface_bytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(surface_bytes(item) for item in value)
+    return 0
+
+
+class AssetEntry:
+    """Asset en caché con su coste y sus usuarios"""
+
+    __slots__ = ('value', 'bytes', 'load_ms', 'preloaded', 'refs', 'last_used')
+
+    def __init__(self, value, load_ms, preloaded=False):
+        self.value = value
+        self.bytes = surface_bytes(value)
+        self.load_ms = load_ms
+        self.preloaded = preloaded
+        self.refs = 0
+        self.last_used = time.perf_counter()
+
+
+class AssetManager:
+    """
+    Caché de assets por clave con conteo de referencias
+
+    acquire() devuelve el asset (creándolo con su loader la primera vez) y
+    suma una referencia; release() la quita. Un asset sin referencias sigue
+    en caché para la próxima partida o pantalla, pero es candidato a
+    liberarse (el usado hace más tiempo primero) si se supera el
+    presupuesto de memoria.
+
+    Las imágenes se pueden precargar en un thread de fondo: allí solo se
+    decodifica el archivo; la conversión al formato de la pantalla se hace
+    en el thread principal cuando se piden.
+    """
+
+    def __init__(self, budget_mb=None):
+        self.budget = int((budget_mb or ASSET_CONFIG['budget_mb']) * 1024 * 1024)
+        self.entries = {}
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self._decoded = {}  # ruta -> superficie decodificada aún sin convertir
+        self.preload_thread = None
+        self._over_budget_warned = False
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def acquire(self, key, loader):
+        """Asset de key (cargado con loader si no está en caché); suma una referencia"""
+        entry = self.entries.get(key)
+        if entry is None:
+            start = time.perf_counter()
+            value = loader()
+            entry = AssetEntry(value, (time.perf_counter() - start) * 1000)
+            self.entries[key] = entry
+            self.total_bytes += entry.bytes
+        entry.refs += 1
+        entry.last_used = time.perf_counter()
+        self._enforce_budget()
+        return entry.value
+
+    def release(self, key):
+        """Quita una referencia; el asset queda en caché hasta que falte memoria"""
+        entry = self.entries.get(key)
+        if entry is not None and entry.refs > 0:
+            entry.refs -= 1
+        self._enforce_budget()
+
+    @staticmethod
+    def image_key(path, alpha=True):
+        return ('image', os.path.abspath(path), alpha)
+
+    def image(self, path, alpha=True):
+        """
+        Imagen convertida al formato de pantalla y compartida; suma una referencia
+
+        Usa la versión precargada si el thread de fondo ya la decodificó.
+        Lanza la excepción de pygame.image.load si el archivo no existe.
+        """
+        key = self.image_key(path, alpha)
+        with self.lock:
+            decoded = self._decoded.pop(key[1], None)
+        if key in self.entries:
+            # Ya en caché: la versión precargada sobra
+            return self.acquire(key, None)
+
+        def load():
+            surface = decoded if decoded is not None else pygame.image.load(path)
+            return surface.convert_alpha() if alpha else surface.convert()
+
+        image = self.acquire(key, load)
+        self.entries[key].preloaded = decoded is not None
+        return image
+
+    def release_image(self, path, alpha=True):
+        self.release(self.image_key(path, alpha))
+
+    def _cached(self, path):
+        """La imagen ya está en caché (con o sin alpha)"""
+        return self.image_key(path, True) in self.entries or self.image_key(path, False) in self.entries
+
+    def preload(self, paths):
+        """Decodifica en un thread de fondo las imágenes que aún no están en caché"""
+        pending = []
+        for path in paths:
+            path = os.path.abspath(path)
+            if not os.path.exists(path) or path in self._decoded:
+                continue
+            if self._cached(path):
+                continue
+            pending.append(path)
+        if not pending:
+            return None
+
+        def worker():
+            for path in pending:
+                # Pudo cargarse en el thread principal mientras tanto
+                if self._cached(path):
+                    continue
+                try:
+                    surface = pygame.image.load(path)
+                except (pygame.error, OSError) as e:
+                    print(f"⚠️ No se pudo precargar {os.path.basename(path)}: {e}")
+                    continue
+                with self.lock:
+                    if not self._cached(path):
+                        self._decoded[path] = surface
+
+        self.preload_thread = threading.Thread(target=worker, daemon=True)
+        self.preload_thread.start()
+        return self.preload_thread
+
+    def convert_pending(self, alpha=True):
+        """
+        Tarea (generador): convierte las imágenes precargadas, una por frame
+
+        Espera al thread de precarga y deja cada imagen convertida en caché
+        sin referencias, así la primera partida no paga la conversión.
+        """
+        while True:
+            with self.lock:
+                path = next(iter(self._decoded), None)
+                if path is not None and self._cached(path):
+                    # Se cargó mientras se decodificaba: se descarta
+                    del self._decoded[path]
+                    continue
+            if path is not None:
+                self.image(path, alpha)
+                self.release_image(path, alpha)
+                yield
+            elif self.preload_thread is not None and self.preload_thread.is_alive():
+                yield 0.05
+            elif not self._decoded:
+                return
+
+    def _enforce_budget(self):
+        """Libera assets sin referencias (los menos recientes primero) hasta caber"""
+        if self.total_bytes <= self.budget:
+            return
+        idle = sorted((key for key, entry in self.entries.items() if entry.refs == 0),
+                      key=lambda key: self.entries[key].last_used)
+        for key in idle:
+            if self.total_bytes <= self.budget:
+                break
+            self.total_bytes -= self.entries.pop(key).bytes
+        if self.total_bytes > self.budget and not self._over_budget_warned:
+            print(f"⚠️ Assets en uso por encima del presupuesto: "
+                  f"{self.total_bytes / 1048576:.1f} MB / {self.budget / 1048576:.0f} MB")
+            self._over_budget_warned = True
+
+    def report(self):
+        """Filas (nombre, bytes, ms de carga, precargado, referencias), de mayor a menor"""
+        rows = []
+        for key, entry in self.entries.items():
+            name = os.path.basename(key[1]) if key[0] == 'image' else ':'.join(map(str, key))
+            rows.append((name, entry.bytes, entry.load_ms, entry.preloaded, entry.refs))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
+
+    def print_report(self):
+        """Imprime el uso de memoria y el tiempo de carga de cada asset"""
+        print(f"🖼️ Assets: {len(self.entries)} en caché, "
+              f"{self.total_bytes / 1048576:.1f} MB / {self.budget / 1048576:.0f} MB")
+        for name, size, load_ms, preloaded, refs in self.report():
+            origin = 'precarga' if preloaded else 'disco'
+            print(f"   • {name:<28} {size / 1024:>9.0f} KB {load_ms:>7.1f} ms  {origin:<8} refs={refs}")
+
+    def clear(self):
+        """Vacía la caché (los assets en uso siguen vivos en quien los tenga)"""
+        self.entries.clear()
+        self.total_bytes = 0
+        with self.lock:
+            self._decoded.clear()
+
+
+_assets = None
+
+
+def get_assets():
+    """Instancia compartida del gestor de assets"""
+    global _assets
+    if _assets is None:
+        _assets = AssetManager()
+    return _assets
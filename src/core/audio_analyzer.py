@@ -1,14 +1,50 @@
 # src/core/audio_analyzer.py - Versión corregida
 
-import pygame
 import os
+import time
+import bisect
 import threading
+import numpy as np
+from src.settings import ONSET_CONFIG
+from src.core.beat_grid import BeatGrid
+from src.core.audio_features import SpectralFeatures, extract_features
+from src.core.pcm_cache import get_pcm_cache
+from src.core.audio_cache import compute_file_hash
+from src.core.waveform import load_peaks, load_or_build_peaks
+from src.core.loudness import intensity_from_loudness
+from src.core.structure import analyze_structure
+from src.core.tempo_map import TempoMap, build_tempo_map
+from src.core.bars import BarMap, estimate_downbeats, regular_bar_map
+from src.core.chart import SpawnChart, build_spawn_chart
+from src.core.analysis_cache import get_analysis_cache
+from src.core.music_library import get_library, STATUS_ANALYZED, STATUS_FAILED
+
+
+def normalized_curves(features):
+    """
+    Energía y brillo 0-1 por frame
+
+    La energía está en la escala de sonoridad normalizada (comparable entre
+    pistas); el brillo es el centroide relativo a su percentil 99.
+    """
+    centroid_scale = max(float(np.percentile(features.centroid, 99)), 1e-6)
+    rms_norm = intensity_from_loudness(features.momentary, features.loudness)
+    centroid_norm = np.clip(features.centroid / centroid_scale, 0.0, 1.0)
+    return rms_norm, centroid_norm
+
 
 class AudioAnalyzer:
-    """Analizador de audio simplificado usando solo pygame - CORREGIDO"""
+    """Analizador de audio: análisis rápido inmediato y características reales en background"""
     
-    def __init__(self, audio_path):
-        print(f"🎵 Cargando audio: {audio_path}")
+    def __init__(self, audio_path, verbose=True, background=True):
+        """
+        Args:
+            audio_path: archivo de audio
+            verbose: mostrar el progreso del análisis por consola
+            background: analizar en un thread (False = bloquea hasta terminar)
+        """
+        self.verbose = verbose
+        self._log(f"🎵 Cargando audio: {audio_path}")
         
         self.audio_path = audio_path
         self.duration = 180.0
@@ -25,35 +61,126 @@ class AudioAnalyzer:
         self.segments = []
         self.drops = []
         self.builds = []
+        self.segment_starts = []
+        self.drop_grid = BeatGrid([])
+        self.build_grid = BeatGrid([])
         self.beat_frames = []
+        self.beat_grid = BeatGrid([])
+        self.tempo_map = TempoMap([])
+        self.bar_map = regular_bar_map([])
+        self.features = None
         self.sr = 22050
+        self.error = None
+        self.stage_keys = {}  # Claves del caché por etapa (se calculan al analizar)
+        self.timings = {}  # Segundos por etapa del análisis completo
+        
+        # Si la biblioteca ya conoce la duración, el análisis rápido la usa
+        track = get_library().get_track(audio_path)
+        self.content_hash = track['content_hash'] if track else None
+        known = track is not None and track['analysis_status'] == STATUS_ANALYZED
+        if known and track['duration']:
+            self.duration = track['duration']
+        
+        # Sonoridad integrada (LUFS) para normalizar el volumen; None hasta medirla
+        self.loudness = track['loudness'] if known else None
+        
+        # Forma de onda ya generada en una partida anterior (None hasta tenerla)
+        self.waveform = load_peaks(self.content_hash)
         
         # Generar análisis básico inmediatamente
         self._generate_simple_analysis()
         
-        # Cargar audio en thread separado para no bloquear
-        self.load_thread = threading.Thread(target=self._load_audio_async)
-        self.load_thread.daemon = True
-        self.load_thread.start()
+        self._log(f"✅ Análisis rápido completado!")
+        self._log(f"   🥁 Tempo: {self.tempo} BPM")
+        self._log(f"   🎼 Beats estimados: {len(self.beat_times)}")
         
-        print(f"✅ Análisis rápido completado!")
-        print(f"   🥁 Tempo: {self.tempo} BPM")
-        print(f"   🎼 Beats estimados: {len(self.beat_times)}")
+        # Decodificar y extraer características en thread separado para no bloquear
+        if background:
+            self.load_thread = threading.Thread(target=self._load_audio_async)
+            self.load_thread.daemon = True
+            self.load_thread.start()
+        else:
+            self.load_thread = None
+            self._load_audio_async()
+    
+    def _log(self, message):
+        """Mensaje de progreso (solo en modo verbose)"""
+        if self.verbose:
+            print(message)
     
     def _load_audio_async(self):
         """Carga el audio en background sin bloquear"""
         try:
-            sound = pygame.mixer.Sound(self.audio_path)
-            self.duration = sound.get_length()
-            print(f"⏱️  Duración real: {self.duration:.1f}s")
+            self.content_hash = self.content_hash or compute_file_hash(self.audio_path)
+            self.stage_keys = get_analysis_cache().stage_keys(self.content_hash)
+            
+            # Con las características en caché solo se lee el PCM si falta la forma de onda
+            features_cached = get_analysis_cache().has('features', self.stage_keys['features'])
+            y, decode_error = None, None
+            if not features_cached or self.waveform is None:
+                y, decode_error = self._decode_pcm()
+            
+            if features_cached or y is not None:
+                stored = self._cached_stage('features', lambda: {
+                    'duration': len(y) / self.sr,
+                    'features': extract_features(y, self.sr).state(),
+                })
+                self.duration = stored['duration']
+                features = SpectralFeatures.from_state(stored['features'])
+            else:
+                # Sin decodificador completo: solo la duración vía pygame
+                # (requiere el mixer inicializado)
+                import pygame
+                if not pygame.mixer.get_init():
+                    raise RuntimeError(f"no se pudo decodificar ({type(decode_error).__name__}) {decode_error}".strip())
+                sound = pygame.mixer.Sound(self.audio_path)
+                self.duration = sound.get_length()
+                features = None
+            
+            if y is not None and self.waveform is None:
+                start = time.perf_counter()
+                self.waveform = load_or_build_peaks(self.content_hash, y, self.sr)
+                self.timings['waveform'] = time.perf_counter() - start
+            self._log(f"⏱️  Duración real: {self.duration:.1f}s")
             
             # Regenerar con duración real
             self._generate_simple_analysis()
+            if features is not None:
+                self._apply_features(features)
+            get_library().record_analysis(self.audio_path, self.duration, self.tempo,
+                                          loudness=self.loudness)
         except Exception as e:
-            print(f"⚠️ No se pudo cargar audio: {e}")
+            self.error = str(e)
+            self._log(f"⚠️ No se pudo cargar audio: {e}")
+            get_library().record_analysis(self.audio_path, status=STATUS_FAILED)
         finally:
             self.analyzing = False
     
+    def _decode_pcm(self):
+        """PCM desde el caché en disco (solo se decodifica la primera vez)"""
+        start = time.perf_counter()
+        try:
+            y, self.sr = get_pcm_cache().load(self.audio_path, self.content_hash)
+            return y, None
+        except Exception as e:
+            self._log(f"⚠️ Decodificación completa no disponible: {e}")
+            return None, e
+        finally:
+            self.timings['decode'] = time.perf_counter() - start
+    
+    def _cached_stage(self, stage, compute):
+        """Resultado de una etapa desde el caché, o calculado y guardado"""
+        start = time.perf_counter()
+        cache = get_analysis_cache()
+        key = self.stage_keys.get(stage)
+        value = cache.get(stage, key) if key else None
+        if value is None:
+            value = compute()
+            if key:
+                cache.put(stage, key, value)
+        self.timings[stage] = time.perf_counter() - start
+        return value
+    
     def _generate_simple_analysis(self):
         """Genera análisis musical simplificado"""
         import math
@@ -125,11 +252,95 @@ class AudioAnalyzer:
         
         # Frames (compatibilidad)
         self.beat_frames = list(range(len(self.beat_times)))
+        
+        # Índice para búsquedas por tiempo (se asigna al final: el thread
+        # de carga puede reemplazarlo mientras el juego lo consulta)
+        self.tempo_map = TempoMap(self.beat_times)
+        self.beat_grid = BeatGrid(self.beat_times)
+        self._index_structure()
+        self.bar_map = regular_bar_map(self.beat_times, self.segment_starts)
+        self.chart = build_spawn_chart(self)
+    
+    def _apply_tempo_map(self, tempo_map):
+        """Sustituye la rejilla de 120 BPM por los beats detectados"""
+        beat_times = tempo_map.beat_times.tolist()
+        intervals = tempo_map.intervals.tolist()
+        
+        self.tempo = round(tempo_map.bpm, 1)
+        self.beat_times = beat_times
+        self.beat_intervals = intervals + intervals[-1:]
+        self.avg_beat_interval = 60.0 / tempo_map.bpm
+        self.beat_frames = list(range(len(beat_times)))
+        self.tempo_map = tempo_map
+        self.beat_grid = BeatGrid(beat_times)
+        
+        segments = tempo_map.segments
+        if len(segments) > 1:
+            self._log(f"   🥁 Tempo variable: "
+                  + " → ".join(f"{segment['bpm']:.0f}" for segment in segments[:6])
+                  + (" …" if len(segments) > 6 else "") + " BPM")
+        else:
+            self._log(f"   🥁 Tempo: {self.tempo} BPM")
+    
+    def _index_structure(self):
+        """Reconstruye los índices de segmentos, drops y builds"""
+        self.segment_starts = [segment['start'] for segment in self.segments]
+        self.drop_grid = BeatGrid(self.drops)
+        self.build_grid = BeatGrid(self.builds)
+    
+    def _apply_features(self, features):
+        """Sustituye la energía simulada por la medida en el audio"""
+        self.loudness = features.loudness
+        rms_norm, centroid_norm = normalized_curves(features)
+        
+        self._log(f"   🔊 Sonoridad: {self.loudness:.1f} LUFS")
+        self._log(f"   🥁 Onsets por banda: "
+              + ", ".join(f"{name}={len(features.band_onsets[name])}"
+                          for name in features.band_names))
+        
+        self.times = features.times
+        self.rms_norm = rms_norm
+        self.spectral_centroid_norm = centroid_norm
+        self.features = features
+        
+        # Beats reales (con tempo variable); sin onsets suficientes se
+        # conserva la rejilla fija
+        beat_times = self._cached_stage('tempo', lambda: build_tempo_map(features).beat_times)
+        tempo_map = TempoMap(beat_times)
+        if len(tempo_map) >= 8:
+            self._apply_tempo_map(tempo_map)
+        
+        # Estructura real: segmentos por novedad, builds y drops por energía,
+        # y el "uno" de cada compás
+        def compute_structure():
+            return {
+                'structure': analyze_structure(features, self.beat_times, self.duration,
+                                               rms_norm, centroid_norm),
+                'downbeats': estimate_downbeats(self.tempo_map.beat_times, features,
+                                                self.tempo_map.segment_beats),
+            }
+        stored = self._cached_stage('structure', compute_structure)
+        structure = stored['structure']
+        self.segments = structure['segments']
+        self.drops = structure['drops']
+        self.builds = structure['builds']
+        self._index_structure()
+        self._log(f"   🧩 Segmentos: {len(self.segments)}, drops: {len(self.drops)}, "
+              f"builds: {len(self.builds)}")
+        
+        # Compases y frases alineadas con los límites de sección
+        self.bar_map = BarMap(self.tempo_map.beat_times, stored['downbeats'], self.segment_starts)
+        self._log(f"   🎼 Compases: {len(self.bar_map)}")
+        
+        # Chart de spawn sobre el análisis definitivo; lleva su propio mapa de
+        # compases, así quien lo use nunca mezcla índices de dos rejillas
+        self.chart = SpawnChart.from_state(
+            self._cached_stage('chart', lambda: build_spawn_chart(self).state()), self.bar_map)
     
     def get_energy_at_time(self, time):
         """Obtiene la energía en un momento específico"""
         # CORRECCIÓN: Verificar que times esté inicializado y no vacío
-        if not hasattr(self, 'times') or not self.times:
+        if not hasattr(self, 'times') or len(self.times) == 0:
             return 0.5
             
         if time < 0 or time > self.duration:
@@ -147,10 +358,9 @@ class AudioAnalyzer:
         
         # Buscar el segmento actual
         current_segment_energy = 0.5
-        for segment in self.segments:
-            if segment['start'] <= time <= segment['end']:
-                current_segment_energy = segment['energy']
-                break
+        idx = bisect.bisect_right(self.segment_starts, time) - 1
+        if 0 <= idx < len(self.segments) and time <= self.segments[idx]['end']:
+            current_segment_energy = self.segments[idx]['energy']
         
         # Combinar energía instantánea con promedio del segmento
         intensity = (energy * 0.7 + current_segment_energy * 0.3)
@@ -159,31 +369,66 @@ class AudioAnalyzer:
     
     def is_beat(self, time, tolerance=0.1):
         """Verifica si hay un beat cerca del tiempo dado"""
-        for beat_time in self.beat_times:
-            if abs(beat_time - time) < tolerance:
-                return True
-        return False
+        return self.beat_grid.within(time, tolerance)
+    
+    def get_nearest_beat(self, time):
+        """Obtiene el tiempo del beat más cercano"""
+        return self.beat_grid.nearest(time)
+    
+    def get_beats_between(self, start, end):
+        """Obtiene los beats dentro de [start, end]"""
+        return self.beat_grid.between(start, end)
+    
+    def get_band_at_time(self, time, window=None):
+        """Banda (low/mid/high) del onset más fuerte cerca de time y su fuerza"""
+        if self.features is None:
+            return None, 0.0
+        window = ONSET_CONFIG['match_window'] if window is None else window
+        return self.features.band_at(time, window)
     
     def is_drop(self, time, tolerance=0.3):
         """Verifica si hay un drop cerca del tiempo dado"""
-        for drop_time in self.drops:
-            if abs(drop_time - time) < tolerance:
-                return True
-        return False
+        return self.drop_grid.within(time, tolerance)
     
     def is_build(self, time, tolerance=0.3):
         """Verifica si hay un build cerca del tiempo dado"""
-        for build_time in self.builds:
-            if abs(build_time - time) < tolerance:
-                return True
-        return False
+        return self.build_grid.within(time, tolerance)
+    
+    def get_tempo_at(self, time):
+        """Tempo local (BPM) en el instante dado"""
+        return self.tempo_map.tempo_at(time)
+    
+    def get_beat_period_at(self, time):
+        """Duración del beat (segundos) en el instante dado"""
+        return self.tempo_map.period_at(time)
+    
+    def time_to_beat(self, time):
+        """Convierte segundos a posición fraccionaria en beats"""
+        return self.tempo_map.time_to_beat(time)
+    
+    def beat_to_time(self, beat):
+        """Convierte una posición en beats a segundos"""
+        return self.tempo_map.beat_to_time(beat)
+    
+    def get_next_downbeat(self, time):
+        """Tiempo del siguiente downbeat (inicio de compás)"""
+        return self.bar_map.next_downbeat_after(time)
+    
+    def get_phrase_at(self, time, bars=None):
+        """Índice de la frase (de bars compases) que contiene time"""
+        return self.bar_map.phrase_at(time, bars)
+    
+    def get_beats_into_bar(self, time):
+        """Posición del beat dentro de su compás (0 = downbeat)"""
+        return self.bar_map.beats_into_bar(time)
+    
+    def get_beats_into_phrase(self, time, bars=None):
+        """Beats transcurridos desde el inicio de la frase"""
+        return self.bar_map.beats_into_phrase(time, bars)
     
     def get_next_beat_time(self, current_time):
         """Obtiene el tiempo del siguiente beat"""
-        for beat_time in self.beat_times:
-            if beat_time > current_time:
-                return beat_time
-        return None
+        return self.beat_grid.next_after(current_time)
     
     def get_difficulty_at_time(self, time):
         """Calcula la dificultad sugerida basada en la música"""
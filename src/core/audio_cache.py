@@ -6,6 +6,15 @@ import hashlib
 import pickle
 from pathlib import Path
 
+def compute_file_hash(filepath):
+    """Genera hash MD5 del contenido de un archivo"""
+    hash_md5 = hashlib.md5()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            hash_md5.update(chunk)
+    return hash_md5.hexdigest()
+
+
 class AudioCache:
     """Sistema de caché para evitar re-analizar el mismo audio"""
     
@@ -15,11 +24,7 @@ class AudioCache:
     
     def _get_file_hash(self, filepath):
         """Genera hash único del archivo"""
-        hash_md5 = hashlib.md5()
-        with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        return compute_file_hash(filepath)
     
     def get_cache_path(self, audio_path):
         """Obtiene ruta del archivo de caché"""
@@ -0,0 +1,214 @@
+# src/core/audio_features.py - Características espectrales y onsets por banda (una sola STFT)
+
+import numpy as np
+from src.settings import AUDIO_ANALYSIS, ONSET_BANDS, ONSET_CONFIG
+from src.core.loudness import k_weighted_hop_energy, momentary_loudness, integrated_loudness
+
+# Frames de STFT procesados por bloque (limita la memoria en pistas largas)
+STFT_BLOCK_FRAMES = 1024
+
+
+def load_audio(path, sr=None):
+    """Decodifica un archivo a PCM mono float32 con la frecuencia de muestreo dada"""
+    sr = sr or AUDIO_ANALYSIS['sample_rate']
+
+    try:
+        import soundfile as sf
+        data, file_sr = sf.read(path, dtype='float32', always_2d=True)
+    except (ImportError, RuntimeError):
+        # Formatos que libsndfile no soporta: librosa/audioread
+        import librosa
+        y, _ = librosa.load(path, sr=sr, mono=True)
+        return np.ascontiguousarray(y, dtype=np.float32), sr
+
+    y = data.mean(axis=1)
+    if file_sr != sr:
+        from math import gcd
+        from scipy.signal import resample_poly
+        g = gcd(sr, file_sr)
+        y = resample_poly(y, sr // g, file_sr // g)
+
+    return np.ascontiguousarray(y, dtype=np.float32), sr
+
+
+def _band_matrix(freqs, bands):
+    """Matriz (bandas x bins) para sumar la STFT por banda con un solo producto"""
+    matrix = np.zeros((len(bands), len(freqs)), dtype=np.float32)
+    for i, (low, high) in enumerate(bands):
+        matrix[i, (freqs >= low) & (freqs < high)] = 1.0
+    return matrix
+
+
+def moving_mean(values, radius):
+    """Media móvil centrada usando suma acumulada (O(n))"""
+    n = len(values)
+    csum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    positions = np.arange(n)
+    lo = np.clip(positions - radius, 0, n)
+    hi = np.clip(positions + radius + 1, 0, n)
+    return (csum[hi] - csum[lo]) / (hi - lo)
+
+
+def pick_onsets(envelope, frame_rate, threshold_window=None, delta=None, min_gap=None):
+    """
+    Detecta picos de una envolvente de onsets
+
+    Un frame es onset si es máximo local y supera la media móvil más delta.
+    Returns:
+        Índices de frame de los onsets
+    """
+    threshold_window = ONSET_CONFIG['threshold_window'] if threshold_window is None else threshold_window
+    delta = ONSET_CONFIG['threshold_delta'] if delta is None else delta
+    min_gap = ONSET_CONFIG['min_gap'] if min_gap is None else min_gap
+
+    if len(envelope) < 3:
+        return np.zeros(0, dtype=np.int64)
+
+    threshold = moving_mean(envelope, max(1, int(threshold_window * frame_rate))) + delta
+    center = envelope[1:-1]
+    is_peak = ((center >= envelope[:-2]) & (center > envelope[2:])
+               & (center > threshold[1:-1]))
+    peaks = np.flatnonzero(is_peak) + 1
+
+    # Separación mínima entre onsets (solo se recorren los picos)
+    gap = int(min_gap * frame_rate)
+    keep = []
+    last = -gap - 1
+    for idx in peaks:
+        if idx - last > gap:
+            keep.append(idx)
+            last = idx
+    return np.asarray(keep, dtype=np.int64)
+
+
+class SpectralFeatures:
+    """Características por frame y onsets por banda de una pista"""
+
+    def __init__(self, sr, hop_length, rms, centroid, band_names, band_envelopes, timbre,
+                 momentary=None, loudness=None):
+        self.sr = sr
+        self.hop_length = hop_length
+        self.frame_rate = sr / hop_length
+        self.times = np.arange(len(rms)) / self.frame_rate
+
+        self.rms = rms
+        self.centroid = centroid
+        self.band_names = list(band_names)
+        self.band_envelopes = band_envelopes  # (bandas x frames), normalizadas 0-1
+        self.timbre = timbre  # Espectro logarítmico compacto (bandas log x frames)
+        self.momentary = momentary  # Sonoridad momentánea por frame (LUFS)
+        self.loudness = loudness  # Sonoridad integrada de la pista (LUFS)
+
+        self.band_onsets = {}
+        self.band_strengths = {}
+        for i, name in enumerate(self.band_names):
+            frames = pick_onsets(band_envelopes[i], self.frame_rate)
+            self.band_onsets[name] = frames / self.frame_rate
+            self.band_strengths[name] = band_envelopes[i][frames]
+
+    def band_at(self, time, window):
+        """
+        Banda con el onset más fuerte a menos de window segundos de time
+
+        Returns:
+            (nombre de banda, fuerza 0-1) o (None, 0.0) si no hay onsets cerca
+        """
+        best_band = None
+        best_strength = 0.0
+
+        for name in self.band_names:
+            onsets = self.band_onsets[name]
+            lo = np.searchsorted(onsets, time - window, side='left')
+            hi = np.searchsorted(onsets, time + window, side='right')
+            if hi > lo:
+                strength = float(self.band_strengths[name][lo:hi].max())
+                if strength > best_strength:
+                    best_band = name
+                    best_strength = strength
+
+        return best_band, best_strength
+
+    def state(self):
+        """Arrays base para guardar en caché (los onsets se recalculan al cargar)"""
+        return {
+            'sr': self.sr,
+            'hop_length': self.hop_length,
+            'rms': self.rms,
+            'centroid': self.centroid,
+            'band_names': self.band_names,
+            'band_envelopes': self.band_envelopes,
+            'timbre': self.timbre,
+            'momentary': self.momentary,
+            'loudness': self.loudness,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(**state)
+
+
+def _log_band_edges(sr, count, low=40.0):
+    """Bordes de bandas espaciadas logarítmicamente hasta Nyquist"""
+    edges = np.geomspace(low, sr / 2.0, count + 1)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def extract_features(y, sr, n_fft=None, hop_length=None, bands=None):
+    """
+    Calcula RMS, centroide espectral, espectro compacto, onsets por banda y sonoridad
+
+    Se hace una sola STFT (por bloques de frames) y todas las bandas se
+    obtienen con un producto matricial sobre el flujo espectral. La
+    sonoridad usa la energía ponderada K por hop, alineada con los frames.
+    """
+    n_fft = n_fft or AUDIO_ANALYSIS['n_fft']
+    hop_length = hop_length or AUDIO_ANALYSIS['hop_length']
+    bands = bands or ONSET_BANDS
+
+    band_names = list(bands)
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sr).astype(np.float32)
+    band_matrix = _band_matrix(freqs, [bands[name]['range'] for name in band_names])
+    timbre_matrix = _band_matrix(freqs, _log_band_edges(sr, AUDIO_ANALYSIS['timbre_bands']))
+    window = np.hanning(n_fft).astype(np.float32)
+
+    # Frames centrados como vista sin copia
+    padded = np.pad(y.astype(np.float32, copy=False), n_fft // 2)
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop_length]
+    n_frames = len(frames)
+
+    rms = np.empty(n_frames, dtype=np.float32)
+    centroid = np.empty(n_frames, dtype=np.float32)
+    band_flux = np.empty((len(band_names), n_frames), dtype=np.float32)
+    timbre = np.empty((len(timbre_matrix), n_frames), dtype=np.float32)
+    previous_log = None
+
+    for start in range(0, n_frames, STFT_BLOCK_FRAMES):
+        block = frames[start:start + STFT_BLOCK_FRAMES]
+        magnitude = np.abs(np.fft.rfft(block * window, axis=1)).astype(np.float32)
+        end = start + len(block)
+
+        rms[start:end] = np.sqrt(np.mean(block * block, axis=1))
+        total = magnitude.sum(axis=1)
+        centroid[start:end] = (magnitude @ freqs) / np.maximum(total, 1e-10)
+        timbre[:, start:end] = np.log1p(timbre_matrix @ (magnitude * magnitude).T)
+
+        # Flujo espectral rectificado sobre magnitud logarítmica
+        log_mag = np.log1p(magnitude * 100.0)
+        if previous_log is None:
+            previous_log = log_mag[:1]
+        diff = np.diff(np.concatenate((previous_log, log_mag)), axis=0)
+        np.maximum(diff, 0.0, out=diff)
+        band_flux[:, start:end] = band_matrix @ diff.T
+        previous_log = log_mag[-1:]
+
+    # Normalizar cada envolvente a 0-1 (percentil alto para ignorar picos aislados)
+    scale = np.percentile(band_flux, 99.5, axis=1, keepdims=True)
+    band_envelopes = np.clip(band_flux / np.maximum(scale, 1e-10), 0.0, 1.0)
+
+    # Sonoridad (LUFS) sobre la misma rejilla de frames
+    energy = k_weighted_hop_energy(y, sr, hop_length)
+    momentary = momentary_loudness(energy, sr, hop_length, n_frames)
+    loudness = integrated_loudness(energy, sr, hop_length)
+
+    return SpectralFeatures(sr, hop_length, rms, centroid, band_names, band_envelopes, timbre,
+                            momentary, loudness)
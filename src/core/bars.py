@@ -0,0 +1,160 @@
+# src/core/bars.py - Downbeats, compases y frases (4/8/16 compases)
+
+import bisect
+import numpy as np
+from src.settings import BAR_CONFIG
+
+
+def _zscore(values):
+    """Estandariza un vector (sin varianza -> ceros)"""
+    std = values.std()
+    return (values - values.mean()) / std if std > 1e-9 else np.zeros_like(values)
+
+
+def estimate_downbeats(beat_times, features, segment_beats, beats_per_bar=None):
+    """
+    Elige la fase del compás (qué beat es el "uno") en cada tramo de tempo
+
+    Puntúa cada fase por la energía de graves en el beat (bombo) y por el
+    cambio de timbre respecto al beat anterior (cambios de acorde/sección).
+
+    Returns:
+        Índices de beat de los downbeats (int32)
+    """
+    beats_per_bar = beats_per_bar or BAR_CONFIG['beats_per_bar']
+    beat_times = np.asarray(beat_times, dtype=np.float64)
+    n = len(beat_times)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32)
+
+    frames = np.clip(np.round(beat_times * features.frame_rate).astype(np.int64),
+                     0, features.band_envelopes.shape[1] - 1)
+
+    # Graves alrededor del beat (máximo en ±2 frames)
+    low = features.band_envelopes[0]
+    neighbourhood = np.clip(frames[:, None] + np.arange(-2, 3)[None, :], 0, len(low) - 1)
+    kick = low[neighbourhood].max(axis=1)
+
+    # Cambio de timbre entre beats consecutivos
+    timbre = features.timbre[:, frames].T
+    change = np.zeros(n)
+    change[1:] = np.linalg.norm(np.diff(timbre, axis=0), axis=1)
+
+    score = _zscore(kick) + _zscore(change)
+
+    downbeats = []
+    bounds = list(segment_beats) + [n]
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        if hi <= lo:
+            continue
+        positions = np.arange(lo, hi)
+        phase_scores = [score[positions[(positions - lo) % beats_per_bar == phase]].mean()
+                        if np.any((positions - lo) % beats_per_bar == phase) else -np.inf
+                        for phase in range(beats_per_bar)]
+        phase = int(np.argmax(phase_scores))
+        downbeats.extend(range(lo + phase, hi, beats_per_bar))
+
+    return np.asarray(downbeats, dtype=np.int32)
+
+
+class BarMap:
+    """
+    Compases y frases como arrays enteros compactos
+
+    - downbeats: índice de beat de cada compás
+    - beat_bar: compás de cada beat (-1 antes del primer downbeat)
+    - phrase_index[L]: frase de L compases de cada compás
+    - phrase_start_bars[L]: primer compás de cada frase
+
+    Las frases se reinician en cada límite de sección, así una frase nunca
+    cruza un cambio de estructura.
+    """
+
+    def __init__(self, beat_times, downbeats, section_starts=(), phrase_lengths=None):
+        self.beat_times = np.asarray(beat_times, dtype=np.float64)
+        self.downbeats = np.asarray(downbeats, dtype=np.int32)
+        self.bar_times = self.beat_times[self.downbeats] if len(self.downbeats) else np.zeros(0)
+        self.phrase_lengths = tuple(phrase_lengths or BAR_CONFIG['phrase_lengths'])
+
+        self.beat_bar = (np.searchsorted(self.downbeats, np.arange(len(self.beat_times)),
+                                         side='right') - 1).astype(np.int32)
+
+        # Compás en que empieza cada sección (siempre incluye el primero)
+        n_bars = len(self.downbeats)
+        bars = np.arange(n_bars)
+        section_bars = np.unique(np.concatenate((
+            [0], np.searchsorted(self.bar_times, np.asarray(section_starts, dtype=np.float64))
+        ))).astype(np.int64)
+        section_bars = section_bars[section_bars < max(n_bars, 1)]
+        section_of_bar = section_bars[np.searchsorted(section_bars, bars, side='right') - 1] \
+            if n_bars else np.zeros(0, dtype=np.int64)
+        offset_in_section = bars - section_of_bar
+
+        self.phrase_index = {}
+        self.phrase_start_bars = {}
+        for length in self.phrase_lengths:
+            starts = offset_in_section % length == 0
+            self.phrase_index[length] = (np.cumsum(starts) - 1).astype(np.int32)
+            self.phrase_start_bars[length] = np.flatnonzero(starts).astype(np.int32)
+
+    def __len__(self):
+        return len(self.downbeats)
+
+    def _beat_index(self, time):
+        """Índice del beat más cercano a time (None si no hay beats)"""
+        times = self.beat_times
+        if len(times) == 0:
+            return None
+        idx = bisect.bisect_left(times, time)
+        if idx == len(times) or (idx > 0 and time - times[idx - 1] <= times[idx] - time):
+            idx -= 1
+        return idx
+
+    def next_downbeat_after(self, time):
+        """Tiempo del primer downbeat estrictamente posterior a time"""
+        idx = bisect.bisect_right(self.bar_times, time)
+        return float(self.bar_times[idx]) if idx < len(self.bar_times) else None
+
+    def bar_at(self, time):
+        """Compás que contiene time (-1 antes del primer downbeat)"""
+        return bisect.bisect_right(self.bar_times, time) - 1
+
+    def phrase_at(self, time, length=None):
+        """Índice de la frase de length compases que contiene time"""
+        length = length or BAR_CONFIG['spawn_phrase_bars']
+        bar = self.bar_at(time)
+        return int(self.phrase_index[length][bar]) if bar >= 0 else -1
+
+    def beats_into_bar(self, time):
+        """Posición del beat más cercano dentro de su compás (0 = downbeat)"""
+        beat = self._beat_index(time)
+        if beat is None or self.beat_bar[beat] < 0:
+            return None
+        return int(beat - self.downbeats[self.beat_bar[beat]])
+
+    def beats_into_phrase(self, time, length=None):
+        """Beats desde el inicio de la frase del beat más cercano a time"""
+        length = length or BAR_CONFIG['spawn_phrase_bars']
+        beat = self._beat_index(time)
+        if beat is None or self.beat_bar[beat] < 0:
+            return None
+        phrase = self.phrase_index[length][self.beat_bar[beat]]
+        start_bar = self.phrase_start_bars[length][phrase]
+        return int(beat - self.downbeats[start_bar])
+
+    def phrase_times(self, length=None):
+        """Tiempos de inicio de todas las frases de length compases"""
+        length = length or BAR_CONFIG['spawn_phrase_bars']
+        return self.bar_times[self.phrase_start_bars[length]]
+
+
+def regular_bar_map(beat_times, section_starts=()):
+    """Compases regulares empezando en el primer beat (análisis simplificado)"""
+    downbeats = np.arange(0, len(beat_times), BAR_CONFIG['beats_per_bar'])
+    return BarMap(beat_times, downbeats, section_starts)
+
+
+def build_bar_map(tempo_map, features, section_starts=()):
+    """Detecta downbeats sobre los beats del mapa de tempo y agrupa en frases"""
+    downbeats = estimate_downbeats(tempo_map.beat_times, features, tempo_map.segment_beats)
+    return BarMap(tempo_map.beat_times, downbeats, section_starts)
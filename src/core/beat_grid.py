@@ -0,0 +1,107 @@
+# src/core/beat_grid.py - Índice de beats y juicio de timing de entradas
+
+import bisect
+from src.settings import TIMING_WINDOWS, JUDGEMENT_CONFIG
+
+
+class BeatGrid:
+    """Lista ordenada de beats con búsquedas binarias O(log n)"""
+
+    def __init__(self, beat_times):
+        self.times = sorted(float(t) for t in beat_times)
+
+    def __len__(self):
+        return len(self.times)
+
+    def nearest_index(self, time):
+        """Índice del beat más cercano a time (None si no hay beats)"""
+        if not self.times:
+            return None
+
+        idx = bisect.bisect_left(self.times, time)
+
+        if idx == 0:
+            return 0
+        if idx == len(self.times):
+            return idx - 1
+
+        # Comparar solo con los dos vecinos
+        if time - self.times[idx - 1] <= self.times[idx] - time:
+            return idx - 1
+        return idx
+
+    def nearest(self, time):
+        """Tiempo del beat más cercano"""
+        idx = self.nearest_index(time)
+        return None if idx is None else self.times[idx]
+
+    def offset(self, time):
+        """Distancia con signo al beat más cercano (negativo = antes del beat)"""
+        beat_time = self.nearest(time)
+        return None if beat_time is None else time - beat_time
+
+    def within(self, time, tolerance):
+        """Verifica si hay un beat a menos de tolerance segundos"""
+        beat_time = self.nearest(time)
+        return beat_time is not None and abs(beat_time - time) < tolerance
+
+    def next_after(self, time):
+        """Primer beat estrictamente posterior a time"""
+        idx = bisect.bisect_right(self.times, time)
+        return self.times[idx] if idx < len(self.times) else None
+
+    def between(self, start, end):
+        """Beats en el intervalo cerrado [start, end]"""
+        lo = bisect.bisect_left(self.times, start)
+        hi = bisect.bisect_right(self.times, end)
+        return self.times[lo:hi]
+
+
+class TimingJudge:
+    """Clasifica acciones del jugador según su distancia al beat"""
+
+    GRADES = ('perfect', 'great', 'good', 'miss')
+
+    def __init__(self, difficulty='normal', input_offset=None):
+        self.windows = TIMING_WINDOWS.get(difficulty, TIMING_WINDOWS['normal'])
+        self.input_offset = (JUDGEMENT_CONFIG['input_offset']
+                             if input_offset is None else input_offset)
+        self.counts = {grade: 0 for grade in self.GRADES}
+
+    def judge(self, beat_grid, time):
+        """
+        Juzga una acción realizada en time (segundos del reloj de audio)
+
+        Returns:
+            dict con 'grade', 'offset', 'beat_time' y 'time', o None si
+            no hay beats contra los que juzgar
+        """
+        if beat_grid is None or not len(beat_grid):
+            return None
+
+        time -= self.input_offset
+        beat_time = beat_grid.nearest(time)
+        offset = time - beat_time
+        distance = abs(offset)
+
+        grade = 'miss'
+        for candidate in ('perfect', 'great', 'good'):
+            if distance <= self.windows[candidate]:
+                grade = candidate
+                break
+
+        return {
+            'grade': grade,
+            'offset': offset,
+            'beat_time': beat_time,
+            'time': time,
+        }
+
+    def record(self, judgement):
+        """Cuenta en las estadísticas un juicio que resolvió algo (esquive o golpe)"""
+        self.counts[judgement['grade']] += 1
+
+    def reset(self):
+        """Reinicia las estadísticas de juicio"""
+        for grade in self.GRADES:
+            self.counts[grade] = 0
@@ -0,0 +1,84 @@
+# src/core/chart.py - Chart de spawn: candidatos de obstáculo por beat
+
+import numpy as np
+from src.settings import BAR_CONFIG, ONSET_BANDS
+
+# Tipos de obstáculo en el orden en que se guardan en el chart
+OBSTACLE_KINDS = ('spike', 'box', 'flying')
+
+
+class SpawnChart:
+    """
+    Datos de spawn precalculados para cada beat de la pista
+
+    Solo contiene lo que depende del análisis (intensidad, probabilidad,
+    acentos de frase y tipo por banda); la velocidad de la dificultad y el
+    azar se aplican al jugar, así el mismo chart sirve para cualquier partida.
+    """
+
+    def __init__(self, beat_times, intensity, spawn_chance, accent, kind, bar_map=None):
+        self.beat_times = np.asarray(beat_times, dtype=np.float64)
+        self.intensity = np.asarray(intensity, dtype=np.float32)
+        self.spawn_chance = np.asarray(spawn_chance, dtype=np.float32)
+        self.accent = np.asarray(accent, dtype=bool)
+        self.kind = np.asarray(kind, dtype=np.int8)  # -1 = sin banda dominante
+        # Compases de esta misma rejilla (no va al caché: se reconstruye)
+        self.bar_map = bar_map
+
+    def __len__(self):
+        return len(self.beat_times)
+
+    def indices_between(self, start, end):
+        """Índices de los beats en el intervalo cerrado [start, end]"""
+        lo = int(np.searchsorted(self.beat_times, start, side='left'))
+        hi = int(np.searchsorted(self.beat_times, end, side='right'))
+        return range(lo, hi)
+
+    def obstacle_at(self, index):
+        """Tipo de obstáculo según la banda del onset (None si no hay)"""
+        kind = self.kind[index]
+        return OBSTACLE_KINDS[kind] if kind >= 0 else None
+
+    def state(self):
+        """Arrays del chart para guardarlo en caché"""
+        return {
+            'beat_times': self.beat_times,
+            'intensity': self.intensity,
+            'spawn_chance': self.spawn_chance,
+            'accent': self.accent,
+            'kind': self.kind,
+        }
+
+    @classmethod
+    def from_state(cls, state, bar_map=None):
+        return cls(bar_map=bar_map, **state)
+
+
+def build_spawn_chart(analyzer):
+    """Recorre los beats del análisis y calcula sus datos de spawn"""
+    beat_times = np.asarray(analyzer.beat_times, dtype=np.float64)
+    n = len(beat_times)
+    intensity = np.zeros(n, dtype=np.float32)
+    spawn_chance = np.zeros(n, dtype=np.float32)
+    accent = np.zeros(n, dtype=bool)
+    kind = np.full(n, -1, dtype=np.int8)
+
+    for i, beat_time in enumerate(beat_times):
+        value = analyzer.get_intensity_at_time(beat_time)
+        intensity[i] = value
+
+        # Probabilidad basada en intensidad, reforzada en el "uno" del compás
+        chance = 0.3 + (value * 0.5)  # 30% - 80%
+        if analyzer.get_beats_into_bar(beat_time) == 0:
+            chance += BAR_CONFIG['downbeat_spawn_boost']
+        spawn_chance[i] = chance
+
+        # Inicio de frase: patrón garantizado y con acento máximo
+        accent[i] = analyzer.get_beats_into_phrase(beat_time) in BAR_CONFIG['phrase_pattern_beats']
+
+        # Tipo según la banda del onset (bombo, caja, hi-hat)
+        band, _ = analyzer.get_band_at_time(beat_time)
+        if band:
+            kind[i] = OBSTACLE_KINDS.index(ONSET_BANDS[band]['obstacle'])
+
+    return SpawnChart(beat_times, intensity, spawn_chance, accent, kind, analyzer.bar_map)
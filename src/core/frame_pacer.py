@@ -0,0 +1,84 @@
+# src/core/frame_pacer.py - Ritmo de frames adaptativo con invalidación
+
+import pygame
+from src.settings import FPS, FRAME_PACING
+
+# Eventos de ventana que obligan a volver a presentar el último frame
+REDRAW_EVENTS = (
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWRESIZED,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWFOCUSGAINED,
+)
+
+
+class FramePacer:
+    """
+    Decide cuándo renderizar y a qué velocidad avanzar el loop
+
+    Una pantalla animada se redibuja en cada tick, pero baja a 'idle_fps'
+    cuando no hay entrada del jugador durante 'idle_after' segundos. Una
+    pantalla estática solo se redibuja cuando alguien la invalida (un
+    evento de ventana o un cambio de estado) y mientras tanto el loop
+    solo sondea eventos a 'static_fps'.
+    """
+
+    def __init__(self, clock, animated=True, active_fps=FPS,
+                 idle_fps=None, static_fps=None, idle_after=None):
+        self.clock = clock
+        self.animated = animated
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps or FRAME_PACING['idle_fps']
+        self.static_fps = static_fps or FRAME_PACING['static_fps']
+        # idle_after=False desactiva la bajada de FPS (p. ej. durante el juego)
+        self.idle_after = FRAME_PACING['idle_after'] if idle_after is None else idle_after
+
+        self.idle_time = 0.0
+        self.dirty = True
+        self.frames_rendered = 0
+
+    @property
+    def idle(self):
+        """True si no hubo entrada reciente del jugador"""
+        return self.idle_after is not False and self.idle_time >= self.idle_after
+
+    def current_fps(self):
+        """FPS objetivo para el próximo tick"""
+        if self.animated:
+            return self.idle_fps if self.idle else self.active_fps
+
+        if self.dirty or self.idle_time < FRAME_PACING['input_boost']:
+            return self.active_fps
+        return self.static_fps
+
+    def tick(self):
+        """Espera al siguiente frame y retorna el delta time en segundos"""
+        dt = self.clock.tick(self.current_fps()) / 1000.0
+        self.idle_time += dt
+        return dt
+
+    def process_events(self, events):
+        """Registra actividad del jugador y eventos de ventana"""
+        for event in events:
+            if event.type in REDRAW_EVENTS:
+                self.dirty = True
+            else:
+                self.idle_time = 0.0
+
+    def invalidate(self):
+        """Marca que el contenido cambió y hay que redibujar"""
+        self.dirty = True
+
+    def set_animated(self, animated):
+        """Cambia entre modo animado y estático (invalida el frame actual)"""
+        self.animated = animated
+        self.dirty = True
+
+    def should_render(self):
+        """Indica si hay que dibujar este frame (consume la invalidación)"""
+        render = self.animated or self.dirty
+        self.dirty = False
+        if render:
+            self.frames_rendered += 1
+        return render
@@ -0,0 +1,129 @@
+# src/core/loudness.py - Sonoridad integrada (LUFS, ponderación K) y ganancia de reproducción
+
+import numpy as np
+from src.settings import LOUDNESS_CONFIG
+
+# Umbrales de la norma ITU-R BS.1770 (bloques de 400 ms con salto de 100 ms)
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+GATE_BLOCK = 0.4
+GATE_STEP = 0.1
+
+# Filtro K: shelving de agudos (ganancia dB, Q, Hz) y paso alto RLB (Q, Hz)
+K_SHELF = (4.0, 1 / np.sqrt(2), 1500.0)
+K_HIGHPASS = (0.5, 38.0)
+
+
+def k_weighting_sos(sr):
+    """
+    Filtro K (shelving de +4 dB en 1.5 kHz y paso alto en 38 Hz) para sr
+
+    Los coeficientes de la norma están dados a 48 kHz; aquí se recalculan
+    con las fórmulas de biquad para la frecuencia de análisis.
+    """
+    sections = []
+
+    # Shelving de agudos (efecto de la cabeza)
+    gain_db, q, fc = K_SHELF
+    a = 10 ** (gain_db / 40)
+    w0 = 2 * np.pi * fc / sr
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    sqrt_a = np.sqrt(a)
+    sections.append([
+        a * ((a + 1) + (a - 1) * cos_w0 + 2 * sqrt_a * alpha),
+        -2 * a * ((a - 1) + (a + 1) * cos_w0),
+        a * ((a + 1) + (a - 1) * cos_w0 - 2 * sqrt_a * alpha),
+        (a + 1) - (a - 1) * cos_w0 + 2 * sqrt_a * alpha,
+        2 * ((a - 1) - (a + 1) * cos_w0),
+        (a + 1) - (a - 1) * cos_w0 - 2 * sqrt_a * alpha,
+    ])
+
+    # Paso alto (curva RLB)
+    q, fc = K_HIGHPASS
+    w0 = 2 * np.pi * fc / sr
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    sections.append([
+        (1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2,
+        1 + alpha, -2 * cos_w0, 1 - alpha,
+    ])
+
+    sos = np.asarray(sections, dtype=np.float64)
+    sos[:, :3] /= sos[:, 3:4]
+    sos[:, 3:] /= sos[:, 3:4]
+    return sos
+
+
+def _to_lufs(power):
+    """Potencia media ponderada -> LUFS (mono)"""
+    return -0.691 + 10 * np.log10(np.maximum(power, 1e-12))
+
+
+def k_weighted_hop_energy(y, sr, hop_length):
+    """Suma de la señal ponderada K al cuadrado en cada bloque de hop_length muestras"""
+    from scipy.signal import sosfilt  # scipy tarda en importarse: solo al analizar
+    weighted = sosfilt(k_weighting_sos(sr), np.asarray(y, dtype=np.float32)).astype(np.float32)
+    weighted *= weighted
+    remainder = len(weighted) % hop_length
+    if remainder:
+        weighted = np.pad(weighted, (0, hop_length - remainder))
+    return weighted.reshape(-1, hop_length).sum(axis=1, dtype=np.float64)
+
+
+def _window_power(energy, hop_length, starts, size):
+    """Potencia media de ventanas de size hops que empiezan en starts"""
+    cumulative = np.concatenate(([0.0], np.cumsum(energy)))
+    lo = np.clip(starts, 0, len(energy))
+    hi = np.clip(starts + size, 0, len(energy))
+    samples = np.maximum(hi - lo, 1) * hop_length
+    return (cumulative[hi] - cumulative[lo]) / samples
+
+
+def integrated_loudness(energy, sr, hop_length):
+    """Sonoridad integrada con las dos puertas de BS.1770 (LUFS)"""
+    frame_rate = sr / hop_length
+    size = max(1, int(round(GATE_BLOCK * frame_rate)))
+    step = max(1, int(round(GATE_STEP * frame_rate)))
+    starts = np.arange(0, max(len(energy) - size, 0) + 1, step)
+
+    power = _window_power(energy, hop_length, starts, size)
+    gated = power[_to_lufs(power) > ABSOLUTE_GATE]
+    if len(gated) == 0:
+        return float(ABSOLUTE_GATE)
+
+    threshold = _to_lufs(gated.mean()) + RELATIVE_GATE
+    gated = gated[_to_lufs(gated) > threshold]
+    return float(_to_lufs(gated.mean()))
+
+
+def momentary_loudness(energy, sr, hop_length, n_frames):
+    """Sonoridad momentánea (ventana de 400 ms) centrada en cada frame (LUFS)"""
+    size = max(1, int(round(LOUDNESS_CONFIG['momentary_window'] * sr / hop_length)))
+    starts = np.arange(n_frames) - size // 2
+    return _to_lufs(_window_power(energy, hop_length, starts, size)).astype(np.float32)
+
+
+def intensity_from_loudness(momentary, loudness):
+    """
+    Intensidad 0-1 comparable entre pistas
+
+    Se mide el nivel que oye el jugador tras normalizar la pista (momentánea
+    menos integrada) como amplitud relativa a un techo fijo por encima de la
+    referencia, en vez de escalar cada pista por su propio percentil.
+    """
+    relative = np.asarray(momentary, dtype=np.float32) - loudness - LOUDNESS_CONFIG['intensity_headroom']
+    return np.clip(10 ** (relative / 20), 0.0, 1.0)
+
+
+def playback_volume(loudness, base_volume):
+    """
+    Volumen del mixer para que la pista suene a la sonoridad de referencia
+
+    base_volume es el volumen deseado para una pista que ya está en la
+    referencia; el mixer no amplifica, así que el resultado se limita a 1.
+    """
+    if loudness is None:
+        return base_volume
+    gain = 10 ** ((LOUDNESS_CONFIG['target_lufs'] - loudness) / 20)
+    return float(min(1.0, base_volume * gain))
@@ -0,0 +1,215 @@
+# src/core/music_library.py - Índice persistente de la biblioteca de música
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from src.settings import MUSIC_DIR, SUPPORTED_AUDIO_FORMATS
+from src.core.audio_cache import compute_file_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    path TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    content_hash TEXT,
+    duration REAL,
+    tempo REAL,
+    loudness REAL,
+    analysis_status TEXT NOT NULL DEFAULT 'pending'
+);
+CREATE INDEX IF NOT EXISTS idx_tracks_filename ON tracks(filename COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tracks_hash ON tracks(content_hash);
+"""
+
+TRACK_COLUMNS = "path, filename, size, mtime, content_hash, duration, tempo, loudness, analysis_status"
+
+# Columnas añadidas después de la primera versión del índice
+MIGRATIONS = {
+    'loudness': "ALTER TABLE tracks ADD COLUMN loudness REAL",
+}
+
+# Estados de análisis de una pista
+STATUS_PENDING = 'pending'
+STATUS_ANALYZED = 'analyzed'
+STATUS_FAILED = 'failed'
+
+
+class MusicLibrary:
+    """
+    Índice de pistas con metadatos y estado de análisis
+
+    El escaneo compara tamaño y fecha de modificación con el índice y solo
+    vuelve a leer (hash) los archivos nuevos o modificados. Es seguro
+    llamarlo desde un thread de fondo: todas las operaciones comparten una
+    conexión protegida por un lock.
+    """
+
+    def __init__(self, db_path='data/library.db', music_dir=MUSIC_DIR):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.music_dir = music_dir
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+        # Versión del índice: aumenta cuando un escaneo cambia algo
+        self.version = 0
+        self.scan_thread = None
+
+    def _migrate(self):
+        """Añade las columnas que falten en un índice creado por una versión anterior"""
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(tracks)")}
+        with self.conn:
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    self.conn.execute(statement)
+    
+    def _list_audio_files(self):
+        """Lista (ruta, nombre, tamaño, mtime) de los archivos soportados"""
+        files = []
+        if not os.path.isdir(self.music_dir):
+            return files
+
+        with os.scandir(self.music_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if not any(entry.name.lower().endswith(ext) for ext in SUPPORTED_AUDIO_FORMATS):
+                    continue
+                stat = entry.stat()
+                files.append((os.path.abspath(entry.path), entry.name,
+                              stat.st_size, stat.st_mtime))
+        return files
+
+    def scan(self):
+        """
+        Sincroniza el índice con el directorio de música
+
+        Returns:
+            dict con el número de pistas 'added', 'changed' y 'removed'
+        """
+        files = self._list_audio_files()
+
+        with self.lock:
+            known = {
+                row['path']: (row['size'], row['mtime'])
+                for row in self.conn.execute("SELECT path, size, mtime FROM tracks")
+            }
+
+        on_disk = set()
+        changed = []
+        for path, filename, size, mtime in files:
+            on_disk.add(path)
+            if known.get(path) != (size, mtime):
+                changed.append((path, filename, size, mtime))
+
+        removed = [path for path in known if path not in on_disk]
+
+        # Solo se leen los archivos nuevos o modificados
+        updates = []
+        for path, filename, size, mtime in changed:
+            try:
+                content_hash = compute_file_hash(path)
+            except OSError as e:
+                print(f"⚠️ No se pudo leer {filename}: {e}")
+                continue
+            updates.append((path, filename, size, mtime, content_hash))
+
+        with self.lock, self.conn:
+            for path, filename, size, mtime, content_hash in updates:
+                # Si el contenido no cambió se conserva el análisis previo
+                self.conn.execute(
+                    "INSERT INTO tracks (path, filename, size, mtime, content_hash) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (path) DO UPDATE SET "
+                    "filename = excluded.filename, size = excluded.size, "
+                    "mtime = excluded.mtime, content_hash = excluded.content_hash, "
+                    "duration = CASE WHEN tracks.content_hash = excluded.content_hash "
+                    "THEN tracks.duration ELSE NULL END, "
+                    "tempo = CASE WHEN tracks.content_hash = excluded.content_hash "
+                    "THEN tracks.tempo ELSE NULL END, "
+                    "loudness = CASE WHEN tracks.content_hash = excluded.content_hash "
+                    "THEN tracks.loudness ELSE NULL END, "
+                    "analysis_status = CASE WHEN tracks.content_hash = excluded.content_hash "
+                    "THEN tracks.analysis_status ELSE 'pending' END",
+                    (path, filename, size, mtime, content_hash)
+                )
+            self.conn.executemany("DELETE FROM tracks WHERE path = ?",
+                                  [(path,) for path in removed])
+
+        new_paths = sum(1 for path, *_ in updates if path not in known)
+        stats = {
+            'added': new_paths,
+            'changed': len(updates) - new_paths,
+            'removed': len(removed),
+        }
+
+        if updates or removed:
+            self.version += 1
+
+        return stats
+
+    def scan_async(self):
+        """Lanza un escaneo incremental en un thread de fondo"""
+        if self.scan_thread and self.scan_thread.is_alive():
+            return self.scan_thread
+
+        def worker():
+            try:
+                stats = self.scan()
+                if any(stats.values()):
+                    print(f"📚 Biblioteca actualizada: {stats}")
+            except Exception as e:
+                print(f"⚠️ Error escaneando biblioteca: {e}")
+
+        self.scan_thread = threading.Thread(target=worker, daemon=True)
+        self.scan_thread.start()
+        return self.scan_thread
+
+    def tracks(self):
+        """Todas las pistas del índice ordenadas por nombre"""
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {TRACK_COLUMNS} FROM tracks ORDER BY filename COLLATE NOCASE"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_track(self, path):
+        """Metadatos de una pista (None si no está indexada)"""
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT {TRACK_COLUMNS} FROM tracks WHERE path = ?",
+                (os.path.abspath(path),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def record_analysis(self, path, duration=None, tempo=None, status=STATUS_ANALYZED,
+                        loudness=None):
+        """Guarda el resultado del análisis de una pista indexada"""
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE tracks SET duration = COALESCE(?, duration), "
+                "tempo = COALESCE(?, tempo), loudness = COALESCE(?, loudness), "
+                "analysis_status = ? WHERE path = ?",
+                (duration, tempo, loudness, status, os.path.abspath(path))
+            )
+        if cursor.rowcount:
+            self.version += 1
+
+
+_library = None
+
+
+def get_library():
+    """Instancia compartida del índice de la biblioteca"""
+    global _library
+    if _library is None:
+        _library = MusicLibrary()
+    return _library
@@ -0,0 +1,137 @@
+# src/core/pcm_cache.py - Caché de PCM decodificado en disco (memory-mapped)
+
+import os
+import numpy as np
+from pathlib import Path
+from src.settings import AUDIO_ANALYSIS, PCM_CACHE
+from src.core.audio_cache import compute_file_hash
+from src.core.audio_features import load_audio
+
+
+class PCMCache:
+    """
+    PCM mono float32 remuestreado, guardado por hash de contenido
+
+    Cada pista es un .npy que se abre con mmap: re-analizar, generar la
+    forma de onda o leer un fragmento no decodifica el MP3 ni carga la
+    canción entera en memoria. El directorio se limita a max_mb borrando
+    primero las entradas usadas hace más tiempo (LRU por fecha de acceso).
+    """
+
+    def __init__(self, cache_dir=None, max_mb=None, sample_rate=None):
+        self.cache_dir = Path(cache_dir or PCM_CACHE['dir'])
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int((max_mb or PCM_CACHE['max_mb']) * 1024 * 1024)
+        self.sample_rate = sample_rate or AUDIO_ANALYSIS['sample_rate']
+
+    def path_for(self, content_hash):
+        """Ruta del archivo de PCM de un hash"""
+        return self.cache_dir / f"{content_hash}_{self.sample_rate}.npy"
+
+    def _touch(self, path):
+        """Marca la entrada como usada recientemente"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def get(self, content_hash):
+        """PCM en caché como memmap de solo lectura (None si no existe)"""
+        path = self.path_for(content_hash)
+        if not path.exists():
+            return None
+        try:
+            pcm = np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"⚠️ PCM en caché dañado, se descarta: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        self._touch(path)
+        return pcm
+
+    def put(self, content_hash, pcm):
+        """Guarda PCM de forma atómica y aplica el límite de tamaño"""
+        path = self.path_for(content_hash)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(pcm, dtype=np.float32))
+        os.replace(tmp_path, path)
+        self._enforce_limit(keep=path)
+        return path
+
+    def load(self, audio_path, content_hash=None):
+        """
+        PCM de un archivo de audio, decodificando solo la primera vez
+
+        Returns:
+            (memmap float32, sample_rate)
+        """
+        content_hash = content_hash or compute_file_hash(audio_path)
+        pcm = self.get(content_hash)
+        if pcm is None:
+            y, _ = load_audio(audio_path, self.sample_rate)
+            self.put(content_hash, y)
+            pcm = self.get(content_hash)
+        return pcm, self.sample_rate
+
+    def read(self, content_hash, start=0.0, end=None):
+        """
+        Fragmento [start, end) en segundos, leído del memmap (None si no hay caché)
+
+        Retorna una vista del archivo: solo se leen de disco las muestras
+        que se usen.
+        """
+        pcm = self.get(content_hash)
+        if pcm is None:
+            return None
+        first = max(0, int(round(start * self.sample_rate)))
+        last = len(pcm) if end is None else min(len(pcm), int(round(end * self.sample_rate)))
+        return pcm[first:max(first, last)]
+
+    def _entries(self):
+        """Entradas del caché ordenadas de la menos a la más reciente"""
+        entries = []
+        for path in self.cache_dir.glob('*.npy'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def total_bytes(self):
+        """Tamaño total ocupado en disco"""
+        return sum(size for _, size, _ in self._entries())
+
+    def _enforce_limit(self, keep=None):
+        """Borra las entradas menos usadas hasta quedar bajo el límite"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                # En uso (p. ej. mmap abierto en Windows): se intenta más tarde
+                continue
+
+    def clear(self):
+        """Vacía el caché"""
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+
+
+_pcm_cache = None
+
+
+def get_pcm_cache():
+    """Instancia compartida del caché de PCM"""
+    global _pcm_cache
+    if _pcm_cache is None:
+        _pcm_cache = PCMCache()
+    return _pcm_cache
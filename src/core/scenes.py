@@ -0,0 +1,143 @@
+# src/core/scenes.py - Pila de escenas con un único loop de frames
+
+import pygame
+from src.settings import SCENE_CONFIG
+from src.core.frame_pacer import FramePacer
+from src.core.startup import first_frame_presented
+from src.core.tasks import TaskScheduler
+
+
+class Scene:
+    """
+    Pantalla del juego (menú, selector, partida...)
+
+    No tiene loop propio: el SceneRuntime llama a update() y draw() en cada
+    frame mientras la escena está en lo alto de la pila. Para terminar, la
+    escena llama a finish(resultado) y el runtime se lo pasa a quien la abrió.
+    """
+
+    animated = True  # False: solo se redibuja cuando el pacer se invalida
+
+    def __init__(self):
+        self.runtime = None
+        self.pacer = None
+        self.on_result = None
+
+    def enter(self, runtime):
+        """Al entrar en la pila"""
+        self.runtime = runtime
+        if self.pacer is None:
+            self.pacer = FramePacer(runtime.clock, animated=self.animated)
+        self.pacer.invalidate()
+
+    def exit(self):
+        """Al salir de la pila (también al cerrar la aplicación)"""
+        pass
+
+    def resume(self, result):
+        """Vuelve a estar arriba tras cerrarse la escena que abrió"""
+        self.pacer.idle_time = 0.0
+        self.pacer.invalidate()
+
+    def update(self, dt, events):
+        """Lógica de un frame con los eventos ya leídos"""
+        pass
+
+    def draw(self, screen):
+        """Dibuja la escena (el runtime hace el flip)"""
+        pass
+
+    def finish(self, result=None):
+        """Cierra la escena y entrega el resultado"""
+        if self.runtime is not None:
+            self.runtime.pop(self, result)
+
+
+class SceneRuntime:
+    """
+    Loop único de la aplicación
+
+    Cada frame: tick del pacer de la escena activa, eventos, update, draw
+    (si el pacer lo pide) y las tareas de fondo con el tiempo que sobre del
+    presupuesto. Las pantallas se apilan en lugar de anidar loops, así que
+    cerrar la ventana o volver al menú no depende de que cada loop lo
+    propague.
+    """
+
+    def __init__(self, screen, clock, tasks=None):
+        self.screen = screen
+        self.clock = clock
+        self.tasks = tasks or TaskScheduler()
+        self.stack = []
+        self.running = False
+        self.result = None
+        self.task_budget = SCENE_CONFIG['task_budget_ms'] / 1000.0
+
+    @property
+    def top(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene, on_result=None):
+        """Abre una escena encima de la actual; on_result recibe su resultado"""
+        scene.on_result = on_result
+        self.stack.append(scene)
+        scene.enter(self)
+        # Lo que tardó en construirse la escena no cuenta como dt de su primer frame
+        self.clock.tick()
+        return scene
+
+    def pop(self, scene=None, result=None):
+        """Cierra la escena de arriba (o scene, con las que tenga encima)"""
+        scene = scene or self.top
+        if scene not in self.stack:
+            return
+        while self.stack:
+            closed = self.stack.pop()
+            closed.exit()
+            if closed is scene:
+                break
+
+        if self.stack:
+            self.top.resume(result)
+        if scene.on_result is not None:
+            scene.on_result(result)
+        if not self.stack:
+            self.running = False
+            self.result = result
+
+    def quit(self, result='quit'):
+        """Cierra todas las escenas (de arriba abajo) y termina el loop"""
+        while self.stack:
+            self.stack.pop().exit()
+        self.tasks.cancel_all()
+        self.running = False
+        self.result = result
+
+    def run(self, scene=None, on_result=None):
+        """Ejecuta el loop hasta que la pila se vacíe; retorna el último resultado"""
+        if scene is not None:
+            self.push(scene, on_result)
+        self.running = bool(self.stack)
+
+        while self.running:
+            scene = self.top
+            dt = scene.pacer.tick()
+
+            events = pygame.event.get()
+            scene.pacer.process_events(events)
+            if any(event.type == pygame.QUIT for event in events):
+                self.quit()
+                break
+
+            scene.update(dt, events)
+
+            # La escena pudo cerrarse o abrir otra: se dibuja la que quede arriba
+            scene = self.top
+            if scene is not None and scene.pacer.should_render():
+                scene.draw(self.screen)
+                pygame.display.flip()
+                first_frame_presented()
+
+            self.tasks.run(self.task_budget)
+
+        return self.result
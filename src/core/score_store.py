@@ -0,0 +1,317 @@
+# src/core/score_store.py - Almacenamiento de puntuaciones en SQLite (WAL)
+
+import json
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    song_hash TEXT NOT NULL,
+    song_name TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    combo INTEGER NOT NULL DEFAULT 0,
+    perfect_dodges INTEGER NOT NULL DEFAULT 0,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_board ON runs(song_hash, difficulty, score DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_difficulty ON runs(difficulty, score DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_score ON runs(score DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_player ON runs(name, id);
+
+CREATE TABLE IF NOT EXISTS personal_bests (
+    name TEXT NOT NULL,
+    song_hash TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (name, song_hash, difficulty)
+) WITHOUT ROWID;
+
+-- Partidas por score en cada tabla, a dos niveles (score exacto y cubo de
+-- SCORE_BUCKET puntos) para calcular posiciones sin recorrer las partidas.
+-- '*' agrupa todas las canciones o todas las dificultades.
+CREATE TABLE IF NOT EXISTS score_counts (
+    song_hash TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    PRIMARY KEY (song_hash, difficulty, score)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS score_buckets (
+    song_hash TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    PRIMARY KEY (song_hash, difficulty, bucket)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+ENTRY_COLUMNS = "id, name, score, difficulty, combo, perfect_dodges, song_name, song_hash, date"
+
+SCORE_BUCKET = 1000  # Puntos por cubo de score_buckets
+ALL_BOARDS = '*'     # Comodín de canción/dificultad en los conteos
+
+
+class ScoreStore:
+    """
+    Historial completo de partidas con tablas por (canción, dificultad)
+
+    Cada partida es una fila de 'runs' (log de solo inserción). Los índices
+    sobre (song_hash, difficulty, score) permiten leer el top N y el umbral
+    de high score con una búsqueda en el índice, sin ordenar ni cargar el
+    historial completo.
+
+    La posición de un score sale de los conteos por cubo y por score
+    exacto, que se actualizan con cada partida: su coste depende del rango
+    de scores, no del número de partidas guardadas (ver rank()).
+
+    A igual score va primero la partida más antigua, tanto en top() como
+    en rank().
+    """
+
+    def __init__(self, db_path='data/scores.db', legacy_json='data/scores.json'):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+
+        # WAL: las escrituras se confirman de forma atómica y un cierre
+        # inesperado nunca deja la base de datos a medio escribir
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._build_score_counts()
+
+        if legacy_json:
+            self._import_legacy_json(Path(legacy_json))
+
+    def _build_score_counts(self):
+        """Reconstruye los conteos de posición si faltan o cambió SCORE_BUCKET"""
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'score_bucket'"
+        ).fetchone()
+        if row and row['value'] == str(SCORE_BUCKET):
+            return
+
+        boards = (
+            ("song_hash", "difficulty"),
+            ("song_hash", f"'{ALL_BOARDS}'"),
+            (f"'{ALL_BOARDS}'", "difficulty"),
+            (f"'{ALL_BOARDS}'", f"'{ALL_BOARDS}'"),
+        )
+        with self.conn:
+            self.conn.execute("DELETE FROM score_counts")
+            self.conn.execute("DELETE FROM score_buckets")
+            for song_column, difficulty_column in boards:
+                self.conn.execute(
+                    f"INSERT INTO score_counts (song_hash, difficulty, score, runs) "
+                    f"SELECT {song_column}, {difficulty_column}, score, COUNT(*) FROM runs "
+                    f"GROUP BY 1, 2, 3"
+                )
+            self.conn.execute(
+                "INSERT INTO score_buckets (song_hash, difficulty, bucket, runs) "
+                "SELECT song_hash, difficulty, score / ?, SUM(runs) FROM score_counts "
+                "GROUP BY 1, 2, 3",
+                (SCORE_BUCKET,)
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('score_bucket', ?)",
+                (str(SCORE_BUCKET),)
+            )
+
+    def _import_legacy_json(self, json_path):
+        """Importa una sola vez las puntuaciones del antiguo scores.json"""
+        if not json_path.exists():
+            return
+
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'legacy_json_imported'"
+        ).fetchone()
+        if row:
+            return
+
+        try:
+            with open(json_path, 'r') as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"⚠️ No se pudo importar {json_path}: {e}")
+            return
+
+        with self.conn:
+            for entry in entries:
+                song_name = entry.get('song', '')
+                self._insert_run(
+                    song_hash=f"name:{song_name}",
+                    song_name=song_name,
+                    difficulty=entry.get('difficulty', 'normal'),
+                    name=entry.get('name', 'Player'),
+                    score=int(entry.get('score', 0)),
+                    combo=int(entry.get('combo', 0)),
+                    perfect_dodges=int(entry.get('perfect_dodges', 0)),
+                    date=entry.get('date', ''),
+                )
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('legacy_json_imported', ?)",
+                (datetime.now().isoformat(),)
+            )
+
+        print(f"📦 {len(entries)} puntuaciones importadas de {json_path}")
+
+    def _insert_run(self, song_hash, song_name, difficulty, name, score,
+                    combo, perfect_dodges, date):
+        """Inserta una partida y actualiza el récord personal (sin commit)"""
+        cursor = self.conn.execute(
+            "INSERT INTO runs (song_hash, song_name, difficulty, name, score, "
+            "combo, perfect_dodges, date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (song_hash, song_name, difficulty, name, score, combo, perfect_dodges, date)
+        )
+        run_id = cursor.lastrowid
+
+        self.conn.execute(
+            "INSERT INTO personal_bests (name, song_hash, difficulty, run_id, score) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (name, song_hash, difficulty) DO UPDATE SET "
+            "run_id = excluded.run_id, score = excluded.score "
+            "WHERE excluded.score > personal_bests.score",
+            (name, song_hash, difficulty, run_id, score)
+        )
+
+        # Una partida cuenta en su tabla y en las agregadas
+        bucket = score // SCORE_BUCKET
+        for board_song, board_difficulty in ((song_hash, difficulty), (song_hash, ALL_BOARDS),
+                                             (ALL_BOARDS, difficulty), (ALL_BOARDS, ALL_BOARDS)):
+            self.conn.execute(
+                "INSERT INTO score_counts (song_hash, difficulty, score, runs) "
+                "VALUES (?, ?, ?, 1) "
+                "ON CONFLICT (song_hash, difficulty, score) DO UPDATE SET runs = runs + 1",
+                (board_song, board_difficulty, score)
+            )
+            self.conn.execute(
+                "INSERT INTO score_buckets (song_hash, difficulty, bucket, runs) "
+                "VALUES (?, ?, ?, 1) "
+                "ON CONFLICT (song_hash, difficulty, bucket) DO UPDATE SET runs = runs + 1",
+                (board_song, board_difficulty, bucket)
+            )
+        return run_id
+
+    def add_run(self, name, score, difficulty, combo, perfect_dodges, song_name, song_hash):
+        """Registra una partida en una transacción atómica. Retorna su id"""
+        date = datetime.now().strftime('%Y-%m-%d %H:%M')
+        with self.conn:
+            return self._insert_run(song_hash, song_name, difficulty, name,
+                                    score, combo, perfect_dodges, date)
+
+    def _board_filter(self, song_hash, difficulty):
+        """Construye el WHERE de una tabla (global, por dificultad o por canción)"""
+        clauses = []
+        params = []
+        if song_hash is not None:
+            clauses.append("song_hash = ?")
+            params.append(song_hash)
+        if difficulty is not None:
+            clauses.append("difficulty = ?")
+            params.append(difficulty)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def top(self, song_hash=None, difficulty=None, limit=10):
+        """Mejores partidas de una tabla, ordenadas por score"""
+        where, params = self._board_filter(song_hash, difficulty)
+        rows = self.conn.execute(
+            f"SELECT {ENTRY_COLUMNS} FROM runs {where} "
+            f"ORDER BY score DESC, id ASC LIMIT ?",
+            params + [limit]
+        ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def score_at(self, position, song_hash=None, difficulty=None):
+        """Score en la posición dada (1 = primero) o None si no existe"""
+        where, params = self._board_filter(song_hash, difficulty)
+        row = self.conn.execute(
+            f"SELECT score FROM runs {where} ORDER BY score DESC LIMIT 1 OFFSET ?",
+            params + [position - 1]
+        ).fetchone()
+        return row['score'] if row else None
+
+    def rank(self, score, song_hash=None, difficulty=None):
+        """
+        Posición que ocupa en la tabla una partida nueva con este score (1 = primero)
+
+        Los empates quedan detrás de las partidas anteriores, igual que en
+        top(). Se suman los cubos por encima del suyo y, dentro de su cubo,
+        los scores exactos iguales o mayores: cada consulta es un rango del
+        índice (O(log n) para encontrarlo) y lee como mucho una fila por cubo
+        no vacío por encima (max_score / SCORE_BUCKET; unas decenas con los
+        scores de una partida) más una por score distinto dentro del cubo
+        (SCORE_BUCKET como máximo). No crece con el número de partidas.
+        """
+        board = (song_hash if song_hash is not None else ALL_BOARDS,
+                 difficulty if difficulty is not None else ALL_BOARDS)
+        bucket = score // SCORE_BUCKET
+        above = self.conn.execute(
+            "SELECT COALESCE(SUM(runs), 0) FROM score_buckets "
+            "WHERE song_hash = ? AND difficulty = ? AND bucket > ?",
+            board + (bucket,)
+        ).fetchone()[0]
+        inside = self.conn.execute(
+            "SELECT COALESCE(SUM(runs), 0) FROM score_counts "
+            "WHERE song_hash = ? AND difficulty = ? AND score >= ? AND score < ?",
+            board + (score, (bucket + 1) * SCORE_BUCKET)
+        ).fetchone()[0]
+        return above + inside + 1
+
+    def personal_best(self, name, song_hash, difficulty):
+        """Mejor partida de un jugador en una canción y dificultad"""
+        row = self.conn.execute(
+            "SELECT r.* FROM personal_bests pb JOIN runs r ON r.id = pb.run_id "
+            "WHERE pb.name = ? AND pb.song_hash = ? AND pb.difficulty = ?",
+            (name, song_hash, difficulty)
+        ).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def history(self, name=None, limit=50):
+        """Partidas más recientes (opcionalmente de un jugador)"""
+        if name is None:
+            rows = self.conn.execute(
+                f"SELECT {ENTRY_COLUMNS} FROM runs ORDER BY id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                f"SELECT {ENTRY_COLUMNS} FROM runs WHERE name = ? ORDER BY id DESC LIMIT ?",
+                (name, limit)
+            ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def count(self):
+        """Número total de partidas almacenadas"""
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def _row_to_entry(self, row):
+        """Convierte una fila al formato de entrada del leaderboard"""
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'score': row['score'],
+            'difficulty': row['difficulty'],
+            'combo': row['combo'],
+            'perfect_dodges': row['perfect_dodges'],
+            'song': row['song_name'],
+            'song_hash': row['song_hash'],
+            'date': row['date'],
+        }
+
+    def close(self):
+        """Cierra la conexión"""
+        self.conn.close()
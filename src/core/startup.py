@@ -0,0 +1,92 @@
+# src/core/startup.py - Arranque: imports diferidos y tiempo hasta el primer frame
+
+import importlib
+import sys
+import threading
+import time
+from src.settings import STARTUP_CONFIG
+
+# Referencia de tiempo: este módulo es lo primero que importa src.main
+_start = time.perf_counter()
+
+_marks = []  # (fase, ms desde el inicio)
+_imports = []  # (módulo, ms que tardó en importarse)
+_first_frame_ms = None
+_first_frame_callbacks = []
+_lock = threading.Lock()
+
+
+def elapsed_ms():
+    """Milisegundos desde el inicio del arranque"""
+    return (time.perf_counter() - _start) * 1000
+
+
+def mark(phase):
+    """Registra el final de una fase del arranque"""
+    _marks.append((phase, elapsed_ms()))
+
+
+def lazy_import(name):
+    """
+    Importa un módulo en su primer uso y apunta cuánto costó
+
+    Los módulos pesados (juego, análisis de audio, selectores) se cargan
+    así en lugar de en la cabecera de src.main, para no retrasar el menú.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        _imports.append((name, (time.perf_counter() - start) * 1000))
+    return module
+
+
+def on_first_frame(callback):
+    """Ejecuta callback justo después del primer frame presentado"""
+    if _first_frame_ms is not None:
+        callback()
+    else:
+        _first_frame_callbacks.append(callback)
+
+
+def first_frame_presented():
+    """La primera pantalla ya es visible: cierra la medida y lanza lo diferido"""
+    global _first_frame_ms
+    if _first_frame_ms is not None:
+        return
+    _first_frame_ms = elapsed_ms()
+    mark('primer frame')
+
+    budget = STARTUP_CONFIG['first_frame_budget_ms']
+    if _first_frame_ms > budget:
+        print(f"⚠️ Primer frame en {_first_frame_ms:.0f} ms (presupuesto {budget} ms)")
+    if report_enabled():
+        print_report()
+
+    while _first_frame_callbacks:
+        _first_frame_callbacks.pop(0)()
+
+
+def time_to_first_frame():
+    """Milisegundos hasta el primer frame (None si aún no se presentó)"""
+    return _first_frame_ms
+
+
+def report_enabled():
+    return STARTUP_CONFIG['report'] or '--startup-report' in sys.argv
+
+
+def print_report():
+    """Imprime las fases del arranque y los imports diferidos"""
+    print(f"⏱️ Arranque (presupuesto del primer frame: "
+          f"{STARTUP_CONFIG['first_frame_budget_ms']} ms)")
+    previous = 0.0
+    for phase, at in _marks:
+        print(f"   • {phase:<28} {at:>8.1f} ms  (+{at - previous:.1f})")
+        previous = at
+    with _lock:
+        imports = list(_imports)
+    for name, ms in imports:
+        print(f"   📦 {name:<27} {ms:>8.1f} ms")
@@ -0,0 +1,180 @@
+# src/core/structure.py - Segmentación estructural: segmentos, builds y drops
+
+import numpy as np
+from src.settings import STRUCTURE_CONFIG
+from src.core.audio_features import pick_onsets
+
+
+def beat_sync(values, frame_rate, beat_times):
+    """
+    Promedia frames entre beats consecutivos
+
+    Args:
+        values: array (frames,) o (dims, frames)
+        frame_rate: frames por segundo
+        beat_times: tiempos de beat ordenados
+    Returns:
+        array (beats,) o (dims, beats); el beat i cubre [beat_i, beat_i+1)
+    """
+    n_frames = values.shape[-1]
+    starts = np.round(np.asarray(beat_times) * frame_rate).astype(np.int64)
+    starts = np.clip(starts, 0, n_frames - 1)
+
+    sums = np.add.reduceat(values, starts, axis=-1)
+    counts = np.maximum(np.diff(np.append(starts, n_frames)), 1)
+    return sums / counts
+
+
+def _window_means(values, before, after):
+    """Media de los 'before' valores anteriores y de los 'after' siguientes a cada índice"""
+    n = len(values)
+    csum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    positions = np.arange(n)
+
+    lo = np.clip(positions - before, 0, n)
+    past = (csum[positions] - csum[lo]) / np.maximum(positions - lo, 1)
+
+    hi = np.clip(positions + after, 0, n)
+    future = (csum[hi] - csum[positions]) / np.maximum(hi - positions, 1)
+    return past, future
+
+
+def banded_similarity(features, max_lag):
+    """
+    Auto-similitud limitada a una banda diagonal
+
+    Returns:
+        array (beats x max_lag) con S[i, k] = sim(beat i, beat i + k);
+        memoria O(n * max_lag) en lugar de O(n²)
+    """
+    n = len(features)
+    similarity = np.zeros((n, max_lag), dtype=np.float32)
+    for lag in range(min(max_lag, n)):
+        similarity[:n - lag, lag] = np.einsum('ij,ij->i', features[:n - lag], features[lag:])
+    return similarity
+
+
+def novelty_curve(similarity, half_width):
+    """
+    Novedad de Foote con kernel de tablero de ajedrez sobre la banda diagonal
+
+    La novedad en el beat i compara la similitud dentro de los bloques
+    [i-w, i) y [i, i+w) con la similitud cruzada entre ellos.
+    """
+    n = len(similarity)
+    width = 2 * half_width
+
+    # Pesos por (posición en la ventana p, lag k): el signo solo depende de
+    # si ambos beats caen del mismo lado del centro
+    p = np.arange(width)[:, None]
+    k = np.arange(width)[None, :]
+    valid = (k >= 1) & (p + k < width)
+    same_side = (p < half_width) == (p + k < half_width)
+    sigma = half_width / 2.0
+    taper = (np.exp(-0.5 * ((p - half_width + 0.5) / sigma) ** 2)
+             * np.exp(-0.5 * ((p + k - half_width + 0.5) / sigma) ** 2))
+    weights = np.where(valid, np.where(same_side, 1.0, -1.0) * taper, 0.0).astype(np.float32)
+
+    padded = np.zeros((n + width, width), dtype=np.float32)
+    padded[half_width:half_width + n] = similarity[:, :width]
+
+    novelty = np.zeros(n, dtype=np.float32)
+    for offset in range(width):
+        novelty += padded[offset:offset + n] @ weights[offset]
+
+    # Escala absoluta: 1 = bloques idénticos por dentro y opuestos entre sí
+    return np.maximum(novelty, 0.0) / np.abs(weights).sum()
+
+
+def _normalize_rows(features):
+    """Estandariza cada dimensión y normaliza cada beat a norma 1"""
+    features = features - features.mean(axis=0)
+    features /= np.maximum(features.std(axis=0), 1e-6)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, 1e-6)
+
+
+def analyze_structure(features, beat_times, duration, rms_norm, centroid_norm, config=None):
+    """
+    Segmenta una pista a partir de sus características y sus beats
+
+    Returns:
+        dict con 'segments' (start, end, energy, duration), 'drops' y
+        'builds' (tiempos en segundos) y 'novelty' (curva por beat)
+    """
+    config = config or STRUCTURE_CONFIG
+    beat_times = np.asarray(beat_times, dtype=np.float64)
+    n_beats = len(beat_times)
+    half_width = config['novelty_half_width']
+
+    if n_beats < 4 * half_width:
+        energy = float(np.mean(rms_norm)) if len(rms_norm) else 0.5
+        return {
+            'segments': [{'start': 0.0, 'end': duration, 'energy': energy, 'duration': duration}],
+            'drops': [],
+            'builds': [],
+            'novelty': np.zeros(n_beats, dtype=np.float32),
+        }
+
+    frame_rate = features.frame_rate
+
+    # Matriz beat-síncrona (beats x dims) y curva de novedad
+    beat_features = _normalize_rows(beat_sync(features.timbre, frame_rate, beat_times).T)
+    similarity = banded_similarity(beat_features, 2 * half_width)
+    novelty = novelty_curve(similarity, half_width)
+
+    boundaries = pick_onsets(novelty, 1.0,
+                             threshold_window=half_width,
+                             delta=config['novelty_delta'],
+                             min_gap=config['min_segment_beats'])
+
+    # Energía por beat
+    beat_energy = beat_sync(np.asarray(rms_norm, dtype=np.float32), frame_rate, beat_times)
+    beat_brightness = beat_sync(np.asarray(centroid_norm, dtype=np.float32), frame_rate, beat_times)
+
+    # Segmentos entre límites
+    edges = [0] + [int(b) for b in boundaries if 0 < b < n_beats] + [n_beats]
+    segments = []
+    for start_idx, end_idx in zip(edges[:-1], edges[1:]):
+        start = 0.0 if start_idx == 0 else float(beat_times[start_idx])
+        end = duration if end_idx == n_beats else float(beat_times[end_idx])
+        segments.append({
+            'start': start,
+            'end': end,
+            'energy': float(beat_energy[start_idx:end_idx].mean()),
+            'duration': end - start,
+        })
+
+    # Drops: salto brusco entre la energía anterior y la posterior
+    drop_window = config['drop_window']
+    past, future = _window_means(beat_energy, drop_window, drop_window)
+    jump = np.where(np.arange(n_beats) >= drop_window, future - past, 0.0)
+    drop_idx = pick_onsets(jump, 1.0, threshold_window=half_width,
+                           delta=config['drop_threshold'] / 2,
+                           min_gap=config['min_segment_beats'])
+    drop_idx = drop_idx[jump[drop_idx] >= config['drop_threshold']]
+
+    # Builds: subida sostenida de energía + brillo que no se explica por un drop
+    build_window = config['build_window']
+    lift = 0.5 * beat_energy + 0.5 * beat_brightness
+    smoothed, _ = _window_means(lift, 4, 0)
+    rise = np.zeros(n_beats)
+    rise[:n_beats - build_window] = smoothed[build_window:] - smoothed[:n_beats - build_window]
+    build_idx = pick_onsets(rise, 1.0, threshold_window=half_width,
+                            delta=config['build_threshold'] / 2,
+                            min_gap=build_window)
+    build_idx = build_idx[rise[build_idx] >= config['build_threshold']]
+    if len(drop_idx):
+        # Descartar subidas cuya ventana contiene un drop (el salto ya es el drop)
+        next_drop = np.searchsorted(drop_idx, build_idx, side='left')
+        has_drop = next_drop < len(drop_idx)
+        contains_drop = has_drop & (drop_idx[np.minimum(next_drop, len(drop_idx) - 1)]
+                                    < build_idx + build_window)
+        build_idx = build_idx[~contains_drop]
+
+    return {
+        'segments': segments,
+        'drops': [float(beat_times[i]) for i in drop_idx],
+        'builds': [float(beat_times[i]) for i in build_idx],
+        'novelty': novelty,
+    }
@@ -0,0 +1,147 @@
+# src/core/tasks.py - Tareas cooperativas (generadores) repartidas entre frames
+
+import queue
+import threading
+import time
+from collections import deque
+
+
+class Task:
+    """
+    Trabajo de fondo en curso
+
+    Una tarea es un generador que cede el control con yield:
+      - yield (None): sigue en el siguiente hueco de tiempo
+      - yield segundos: duerme ese tiempo
+      - resultado = yield otra_tarea: espera a que termine y recibe su resultado
+    Lo que devuelve el generador (return) es el resultado de la tarea.
+    """
+
+    __slots__ = ('name', 'generator', 'on_done', 'done', 'cancelled', 'result',
+                 'error', 'wake_at', 'waiting_on')
+
+    def __init__(self, name, generator=None, on_done=None):
+        self.name = name
+        self.generator = generator
+        self.on_done = on_done
+        self.done = False
+        self.cancelled = False
+        self.result = None
+        self.error = None
+        self.wake_at = 0.0
+        self.waiting_on = None
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TaskScheduler:
+    """
+    Ejecuta tareas en el thread principal con un presupuesto por frame
+
+    run(budget) avanza las tareas por turnos hasta agotar el presupuesto, así
+    que el trabajo largo se reparte entre frames sin congelar la pantalla.
+    El trabajo bloqueante (E/S, imports, decodificar) va a un thread con
+    run_in_thread(): su resultado vuelve al thread principal y el callback
+    on_done se llama desde run(), nunca desde el thread de fondo.
+    """
+
+    def __init__(self):
+        self.tasks = deque()
+        self._finished = queue.SimpleQueue()  # Tareas de thread ya terminadas
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def spawn(self, generator, on_done=None, name=None):
+        """Añade una tarea generadora; on_done(resultado) al terminar"""
+        task = Task(name or getattr(generator, '__name__', 'task'), generator, on_done)
+        self.tasks.append(task)
+        return task
+
+    def run_in_thread(self, fn, on_done=None, name=None):
+        """Ejecuta fn en un thread; on_done(resultado) llega en el thread principal"""
+        task = Task(name or getattr(fn, '__name__', 'thread'), on_done=on_done)
+
+        def worker():
+            try:
+                task.result = fn()
+            except Exception as e:
+                task.error = e
+            self._finished.put(task)
+
+        threading.Thread(target=worker, daemon=True).start()
+        return task
+
+    def _finish(self, task, result=None, error=None):
+        task.done = True
+        task.generator = None
+        if error is not None:
+            task.error = error
+        elif result is not None:
+            task.result = result
+        if task.error is not None:
+            print(f"⚠️ Tarea '{task.name}' falló: {task.error}")
+        elif task.on_done is not None and not task.cancelled:
+            task.on_done(task.result)
+
+    def _step(self, task, now):
+        """Avanza una tarea hasta su siguiente yield"""
+        value = None
+        if task.waiting_on is not None:
+            value = task.waiting_on.result
+            task.waiting_on = None
+        try:
+            request = task.generator.send(value)
+        except StopIteration as stop:
+            self._finish(task, stop.value)
+            return
+        except Exception as e:
+            self._finish(task, error=e)
+            return
+
+        if isinstance(request, Task):
+            task.waiting_on = request
+        elif request:
+            task.wake_at = now + request
+        self.tasks.append(task)
+
+    def _ready(self, task, now):
+        if task.waiting_on is not None:
+            return task.waiting_on.done
+        return task.wake_at <= now
+
+    def run(self, budget):
+        """Avanza las tareas durante como mucho budget segundos"""
+        # Resultados de los threads: los callbacks corren aquí
+        while True:
+            try:
+                task = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(task)
+
+        start = time.perf_counter()
+        deadline = start + budget
+        progressed = True
+        while self.tasks and progressed and time.perf_counter() < deadline:
+            # Una pasada por turnos; se repite mientras alguna tarea avance
+            progressed = False
+            for _ in range(len(self.tasks)):
+                task = self.tasks.popleft()
+                if task.cancelled:
+                    task.done = True
+                    continue
+                now = time.perf_counter()
+                if not self._ready(task, now):
+                    self.tasks.append(task)
+                    continue
+                self._step(task, now)
+                progressed = True
+                if time.perf_counter() >= deadline:
+                    break
+
+    def cancel_all(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks.clear()
@@ -0,0 +1,263 @@
+# src/core/tempo_map.py - Seguimiento de beats y mapa de tempo variable
+
+import bisect
+import numpy as np
+from src.settings import AUDIO_ANALYSIS, TEMPO_CONFIG
+
+
+def onset_envelope(features):
+    """Envolvente de onsets global (media de las bandas)"""
+    return features.band_envelopes.mean(axis=0)
+
+
+def _sliding_median(values, radius):
+    """Mediana móvil centrada (bordes replicados)"""
+    if len(values) == 0 or radius <= 0:
+        return np.asarray(values, dtype=np.float64)
+    padded = np.pad(np.asarray(values, dtype=np.float64), radius, mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1)
+    return np.median(windows, axis=1)
+
+
+def estimate_local_period(envelope, frame_rate, config=None):
+    """
+    Estima el periodo de beat (en frames) para cada frame
+
+    Autocorrelación de la envolvente por ventanas (todas en un solo lote de
+    FFT), ponderada por un prior log-normal alrededor de prior_bpm y
+    suavizada con Viterbi entre ventanas.
+    """
+    config = config or TEMPO_CONFIG
+    min_bpm, max_bpm = AUDIO_ANALYSIS['tempo_range']
+    n = len(envelope)
+
+    window = min(int(config['window'] * frame_rate), n)
+    hop = max(1, int(config['hop'] * frame_rate))
+    lag_min = max(1, int(60.0 * frame_rate / max_bpm))
+    lag_max = min(window - 1, int(np.ceil(60.0 * frame_rate / min_bpm)))
+
+    if window < 2 or lag_max <= lag_min:
+        return np.full(n, 60.0 * frame_rate / config['prior_bpm'])
+
+    padded = np.pad(envelope, window // 2)
+    frames = np.lib.stride_tricks.sliding_window_view(padded, window)[::hop]
+    frames = (frames - frames.mean(axis=1, keepdims=True)) * np.hanning(window)
+
+    spectrum = np.fft.rfft(frames, n=2 * window, axis=1)
+    autocorr = np.fft.irfft(np.abs(spectrum) ** 2, axis=1)[:, lag_min:lag_max + 1]
+
+    lags = np.arange(lag_min, lag_max + 1)
+    bpm = 60.0 * frame_rate / lags
+    prior = np.exp(-0.5 * (np.log2(bpm / config['prior_bpm']) / config['prior_width']) ** 2)
+    strength = np.maximum(autocorr, 0.0) * prior
+    strength /= np.maximum(strength.max(axis=1, keepdims=True), 1e-9)
+
+    # Viterbi sobre los lags: cambiar de tempo cuesta proporcional a la
+    # distancia en octavas, así una ventana ambigua (p. ej. 3:4) no rompe
+    # un tempo estable pero un cambio sostenido sí se sigue
+    change_cost = config['change_penalty'] * np.abs(np.log2(lags[:, None] / lags[None, :]))
+    accumulated = strength[0].copy()
+    backpointers = np.zeros(strength.shape, dtype=np.int64)
+    columns = np.arange(len(lags))
+    for w in range(1, len(strength)):
+        candidates = accumulated[:, None] - change_cost
+        backpointers[w] = np.argmax(candidates, axis=0)
+        accumulated = candidates[backpointers[w], columns] + strength[w]
+
+    path = np.empty(len(strength), dtype=np.int64)
+    path[-1] = int(np.argmax(accumulated))
+    for w in range(len(strength) - 1, 0, -1):
+        path[w - 1] = backpointers[w, path[w]]
+    best = lags[path].astype(np.float64)
+
+    # Llevar el periodo de cada ventana a cada frame
+    centers = np.arange(len(best)) * hop
+    return np.interp(np.arange(n), centers, best)
+
+
+def track_beats(envelope, period, tightness=None):
+    """
+    Programación dinámica de beats (Ellis) con periodo variable por frame
+
+    score[t] = env[t] + max_prev(score[prev] - tightness * log(d / p_t)²)
+    con d = t - prev en [p_t / 2, 2 p_t]. Como d >= p_min / 2, los frames
+    de un bloque de ese tamaño no dependen entre sí y se calculan juntos.
+
+    Returns:
+        Índices de frame de los beats
+    """
+    tightness = TEMPO_CONFIG['tightness'] if tightness is None else tightness
+    n = len(envelope)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    env = envelope / max(float(envelope.std()), 1e-9)
+    offsets = np.arange(1, int(np.ceil(2 * period.max())) + 1)
+    block = max(1, int(period.min() // 2))
+
+    score = np.zeros(n)
+    backlink = np.full(n, -1, dtype=np.int64)
+
+    for start in range(0, n, block):
+        t = np.arange(start, min(start + block, n))
+        p = period[t][:, None]
+        prev = t[:, None] - offsets[None, :]
+        valid = (prev >= 0) & (offsets >= p / 2) & (offsets <= 2 * p)
+
+        transition = -tightness * np.log(offsets / p) ** 2
+        candidates = np.where(valid, score[np.maximum(prev, 0)] + transition, -np.inf)
+
+        best = np.argmax(candidates, axis=1)
+        rows = np.arange(len(t))
+        best_value = candidates[rows, best]
+        has_prev = np.isfinite(best_value)
+
+        score[t] = env[t] + np.where(has_prev, best_value, 0.0)
+        backlink[t] = np.where(has_prev, prev[rows, best], -1)
+
+    # Último beat: mejor puntuación dentro del último periodo
+    tail = max(1, int(period[-1]))
+    beat = n - tail + int(np.argmax(score[n - tail:]))
+    beats = []
+    while beat >= 0:
+        beats.append(beat)
+        beat = backlink[beat]
+    beats = np.asarray(beats[::-1], dtype=np.int64)
+
+    # Descartar beats en el silencio inicial y final
+    active = np.flatnonzero(envelope > 0.05 * float(envelope.max()))
+    if len(active) == 0 or envelope.max() <= 0:
+        return np.zeros(0, dtype=np.int64)
+    return beats[(beats >= active[0]) & (beats <= active[-1])]
+
+
+class TempoMap:
+    """
+    Beats con tempo variable por tramos
+
+    Guarda los tiempos de beat como array acumulado: la conversión
+    tiempo <-> beat es una interpolación y el tempo local una búsqueda
+    binaria, sin recorrer listas.
+    """
+
+    def __init__(self, beat_times, config=None):
+        config = config or TEMPO_CONFIG
+        self.beat_times = np.asarray(beat_times, dtype=np.float64)
+        self.beat_index = np.arange(len(self.beat_times), dtype=np.float64)
+
+        if len(self.beat_times) >= 2:
+            self.intervals = np.diff(self.beat_times)
+            beat_bpm = self._local_bpm(config['smoothing_beats'] // 2)
+        else:
+            self.intervals = np.full(1, 0.5)
+            beat_bpm = np.full(1, 120.0)
+
+        self.segment_beats, self.segment_bpm = self._segment(
+            beat_bpm, config['change_tolerance'], config['smoothing_beats'])
+        self.bpm = float(np.median(beat_bpm))
+
+    def _local_bpm(self, radius):
+        """
+        Tempo por intervalo medido sobre un tramo de beats vecinos
+
+        Promediar sobre el tramo elimina la cuantización a frames de cada
+        intervalo individual.
+        """
+        last = len(self.beat_times) - 1
+        positions = np.arange(len(self.intervals))
+        lo = np.maximum(positions - radius, 0)
+        hi = np.minimum(positions + 1 + radius, last)
+        span = self.beat_times[hi] - self.beat_times[lo]
+        return 60.0 * (hi - lo) / np.maximum(span, 1e-6)
+
+    def _segment(self, beat_bpm, tolerance, min_length):
+        """Agrupa beats consecutivos con tempo similar en segmentos"""
+        starts = [0]
+        reference = beat_bpm[0]
+
+        for i in range(1, len(beat_bpm)):
+            if abs(beat_bpm[i] - reference) > tolerance * reference:
+                # Un tramo más corto que la ventana de suavizado es la
+                # transición entre dos tempos: se absorbe en el siguiente
+                if len(starts) > 1 and i - starts[-1] < min_length:
+                    starts[-1] = i
+                else:
+                    starts.append(i)
+                reference = beat_bpm[i]
+
+        # Unir tramos vecinos cuyo tempo final quedó dentro de la tolerancia
+        merged = [starts[0]]
+        bpms = []
+        bounds = starts + [len(beat_bpm)]
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            bpm = float(np.median(beat_bpm[lo:hi]))
+            if bpms and abs(bpm - bpms[-1]) <= tolerance * bpms[-1]:
+                bpms[-1] = float(np.median(beat_bpm[merged[-1]:hi]))
+                continue
+            if bpms:
+                merged.append(lo)
+            bpms.append(bpm)
+
+        return np.asarray(merged, dtype=np.int64), np.asarray(bpms)
+
+    def __len__(self):
+        return len(self.beat_times)
+
+    @property
+    def segments(self):
+        """Segmentos de tempo como lista de dicts (start, end, bpm)"""
+        result = []
+        starts = list(self.segment_beats) + [len(self.beat_times) - 1]
+        for i, bpm in enumerate(self.segment_bpm):
+            result.append({
+                'start': float(self.beat_times[starts[i]]) if len(self.beat_times) else 0.0,
+                'end': float(self.beat_times[starts[i + 1]]) if len(self.beat_times) else 0.0,
+                'bpm': float(bpm),
+            })
+        return result
+
+    def period_at(self, time):
+        """Duración del beat (segundos) en el instante dado"""
+        if len(self.beat_times) < 2:
+            return float(self.intervals[0])
+        idx = bisect.bisect_right(self.beat_times, time) - 1
+        idx = min(max(idx, 0), len(self.intervals) - 1)
+        return float(self.intervals[idx])
+
+    def tempo_at(self, time):
+        """Tempo del segmento (BPM) en el instante dado"""
+        if len(self.beat_times) == 0:
+            return float(self.segment_bpm[0])
+        beat = bisect.bisect_right(self.beat_times, time) - 1
+        segment = bisect.bisect_right(self.segment_beats, max(beat, 0)) - 1
+        return float(self.segment_bpm[segment])
+
+    def time_to_beat(self, time):
+        """Posición fraccionaria en beats (extrapola con el primer/último periodo)"""
+        times = self.beat_times
+        if len(times) < 2:
+            return time / float(self.intervals[0])
+        if time < times[0]:
+            return (time - times[0]) / self.intervals[0]
+        if time > times[-1]:
+            return len(times) - 1 + (time - times[-1]) / self.intervals[-1]
+        return float(np.interp(time, times, self.beat_index))
+
+    def beat_to_time(self, beat):
+        """Tiempo (segundos) de una posición en beats, inversa de time_to_beat"""
+        times = self.beat_times
+        if len(times) < 2:
+            return beat * float(self.intervals[0])
+        if beat < 0:
+            return times[0] + beat * self.intervals[0]
+        if beat > len(times) - 1:
+            return times[-1] + (beat - len(times) + 1) * self.intervals[-1]
+        return float(np.interp(beat, self.beat_index, times))
+
+
+def build_tempo_map(features, config=None):
+    """Detecta los beats de una pista y construye su mapa de tempo"""
+    envelope = onset_envelope(features)
+    period = estimate_local_period(envelope, features.frame_rate, config)
+    beat_frames = track_beats(envelope, period, (config or TEMPO_CONFIG)['tightness'])
+    return TempoMap(beat_frames / features.frame_rate, config)
@@ -0,0 +1,116 @@
+# src/core/timers.py - Temporizadores en un heap con handles cancelables
+
+import heapq
+
+
+class TimerHandle:
+    """
+    Referencia a un temporizador programado
+
+    El mismo handle sirve para toda la vida del temporizador: se puede
+    reiniciar (restart) o cancelar sin buscarlo en el heap.
+    """
+
+    __slots__ = ('due', 'duration', 'callback', 'active', 'generation')
+
+    def __init__(self, due, duration, callback):
+        self.due = due
+        self.duration = duration
+        self.callback = callback
+        self.active = True
+        self.generation = 0
+
+
+class TimerHeap:
+    """
+    Planificador de temporizadores sobre un reloj propio
+
+    advance(dt) solo toca los temporizadores que vencen: el coste por frame
+    es proporcional a los que disparan, no a los que existen. Cancelar o
+    reiniciar deja la entrada vieja en el heap y se descarta al salir
+    (borrado perezoso); si se acumulan demasiadas, el heap se compacta.
+    """
+
+    def __init__(self):
+        self.time = 0.0
+        self._heap = []
+        self._seq = 0  # Desempate estable entre temporizadores del mismo instante
+        self._live = 0
+        self._stale = 0
+
+    def __len__(self):
+        """Temporizadores activos"""
+        return self._live
+
+    def _push(self, handle):
+        self._seq += 1
+        heapq.heappush(self._heap, (handle.due, self._seq, handle.generation, handle))
+
+    def schedule(self, delay, callback):
+        """Llama a callback dentro de delay segundos del reloj; devuelve el handle"""
+        handle = TimerHandle(self.time + delay, delay, callback)
+        self._live += 1
+        self._push(handle)
+        return handle
+
+    def restart(self, handle, delay=None):
+        """Vuelve a programar handle (con su duración si no se indica otra)"""
+        if handle.active:
+            self._stale += 1
+        else:
+            handle.active = True
+            self._live += 1
+        handle.generation += 1
+        if delay is not None:
+            handle.duration = delay
+        handle.due = self.time + handle.duration
+        self._push(handle)
+        self._maybe_compact()
+
+    def cancel(self, handle):
+        """Cancela handle (sin efecto si ya venció o estaba cancelado)"""
+        if handle is None or not handle.active:
+            return
+        handle.active = False
+        self._live -= 1
+        self._stale += 1
+        self._maybe_compact()
+
+    def remaining(self, handle):
+        """Segundos hasta que venza handle (0 si no está activo)"""
+        if handle is None or not handle.active:
+            return 0.0
+        return max(0.0, handle.due - self.time)
+
+    def elapsed(self, handle):
+        """Segundos desde que se programó handle"""
+        return self.time - (handle.due - handle.duration)
+
+    def advance(self, dt):
+        """Avanza el reloj y ejecuta los temporizadores vencidos en orden"""
+        self.time += dt
+        heap = self._heap
+        while heap and heap[0][0] <= self.time:
+            _, _, generation, handle = heapq.heappop(heap)
+            if not handle.active or generation != handle.generation:
+                self._stale -= 1
+                continue
+            handle.active = False
+            self._live -= 1
+            handle.callback()
+
+    def _maybe_compact(self):
+        """Reconstruye el heap si la mayoría de entradas están obsoletas"""
+        if self._stale > 64 and self._stale > 2 * self._live:
+            self._heap = [entry for entry in self._heap
+                          if entry[3].active and entry[2] == entry[3].generation]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def clear(self):
+        """Cancela todos los temporizadores"""
+        for entry in self._heap:
+            entry[3].active = False
+        self._heap = []
+        self._live = 0
+        self._stale = 0
@@ -0,0 +1,184 @@
+# src/core/waveform.py - Pirámides de picos (min/max/RMS) para dibujar formas de onda
+
+import numpy as np
+from pathlib import Path
+from src.settings import WAVEFORM_CONFIG
+from src.core.pcm_cache import get_pcm_cache
+
+# Muestras leídas por bloque al construir el primer nivel (múltiplo del bloque)
+READ_CHUNK = 1 << 20
+
+
+class WaveformPeaks:
+    """
+    Resumen multi-resolución de una pista
+
+    El nivel 0 guarda min/max/RMS por bloque de block_size muestras y cada
+    nivel siguiente agrupa pares del anterior. Para dibujar a cualquier
+    ancho se elige el nivel más grueso que aún tenga al menos una columna
+    por píxel, así el coste no depende de la duración de la canción.
+    Los valores se guardan cuantizados a 8 bits.
+    """
+
+    def __init__(self, levels, block_size, sample_rate, duration):
+        self.levels = levels  # Lista de (min int8, max int8, rms uint8)
+        self.block_size = block_size
+        self.sample_rate = sample_rate
+        self.duration = duration
+
+    def _level_for(self, width):
+        """Nivel más grueso con al menos width columnas"""
+        for index in range(len(self.levels) - 1, -1, -1):
+            if len(self.levels[index][0]) >= width:
+                return index
+        return 0
+
+    def columns(self, width):
+        """
+        Reduce la forma de onda a width columnas
+
+        Returns:
+            (mins, maxs, rms) como float32 en [-1, 1] / [0, 1]
+        """
+        mins, maxs, rms = self.levels[self._level_for(width)]
+        count = len(mins)
+        if count == 0:
+            zeros = np.zeros(width, dtype=np.float32)
+            return zeros, zeros, zeros
+
+        width = min(width, count)
+        starts = (np.arange(width) * count) // width
+        sizes = np.diff(np.append(starts, count))
+
+        col_min = np.minimum.reduceat(mins, starts).astype(np.float32) / 127.0
+        col_max = np.maximum.reduceat(maxs, starts).astype(np.float32) / 127.0
+        energy = np.add.reduceat((rms.astype(np.float32) / 255.0) ** 2, starts)
+        col_rms = np.sqrt(energy / sizes)
+        return col_min, col_max, col_rms
+
+    def save(self, path):
+        """Guarda la pirámide en un .npz"""
+        arrays = {
+            'block_size': np.int64(self.block_size),
+            'sample_rate': np.int64(self.sample_rate),
+            'duration': np.float64(self.duration),
+        }
+        for index, (mins, maxs, rms) in enumerate(self.levels):
+            arrays[f'min_{index}'] = mins
+            arrays[f'max_{index}'] = maxs
+            arrays[f'rms_{index}'] = rms
+
+        path = Path(path)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        """Carga una pirámide guardada con save()"""
+        with np.load(path) as data:
+            levels = []
+            index = 0
+            while f'min_{index}' in data:
+                levels.append((data[f'min_{index}'], data[f'max_{index}'], data[f'rms_{index}']))
+                index += 1
+            return cls(levels, int(data['block_size']), int(data['sample_rate']),
+                       float(data['duration']))
+
+
+def build_peaks(pcm, sample_rate, block_size=None):
+    """Construye la pirámide leyendo el PCM por bloques (apto para memmap)"""
+    block_size = block_size or WAVEFORM_CONFIG['block_size']
+    total = len(pcm)
+    n_blocks = max(1, -(-total // block_size))
+
+    mins = np.empty(n_blocks, dtype=np.float32)
+    maxs = np.empty(n_blocks, dtype=np.float32)
+    sumsq = np.empty(n_blocks, dtype=np.float32)
+
+    chunk = (READ_CHUNK // block_size) * block_size
+    for start in range(0, max(total, 1), chunk):
+        samples = np.asarray(pcm[start:start + chunk], dtype=np.float32)
+        if len(samples) % block_size:
+            samples = np.pad(samples, (0, block_size - len(samples) % block_size))
+        blocks = samples.reshape(-1, block_size)
+        first = start // block_size
+        mins[first:first + len(blocks)] = blocks.min(axis=1)
+        maxs[first:first + len(blocks)] = blocks.max(axis=1)
+        sumsq[first:first + len(blocks)] = np.einsum('ij,ij->i', blocks, blocks)
+
+    rms = np.sqrt(sumsq / block_size)
+    levels = [_quantize(mins, maxs, rms)]
+
+    # Niveles sucesivos agrupando pares
+    while len(mins) > WAVEFORM_CONFIG['min_columns']:
+        if len(mins) % 2:
+            mins = np.append(mins, mins[-1])
+            maxs = np.append(maxs, maxs[-1])
+            rms = np.append(rms, rms[-1])
+        mins = np.minimum(mins[0::2], mins[1::2])
+        maxs = np.maximum(maxs[0::2], maxs[1::2])
+        rms = np.sqrt((rms[0::2] ** 2 + rms[1::2] ** 2) / 2)
+        levels.append(_quantize(mins, maxs, rms))
+
+    return WaveformPeaks(levels, block_size, sample_rate, total / sample_rate)
+
+
+def _quantize(mins, maxs, rms):
+    """Convierte un nivel a 8 bits"""
+    return (
+        np.clip(np.round(mins * 127), -127, 127).astype(np.int8),
+        np.clip(np.round(maxs * 127), -127, 127).astype(np.int8),
+        np.clip(np.round(rms * 255), 0, 255).astype(np.uint8),
+    )
+
+
+def peaks_path(content_hash):
+    """Ruta del archivo de picos de una pista"""
+    return Path(WAVEFORM_CONFIG['dir']) / f"{content_hash}.npz"
+
+
+def load_peaks(content_hash):
+    """Picos guardados de una pista (None si aún no se generaron)"""
+    if not content_hash:
+        return None
+    path = peaks_path(content_hash)
+    if not path.exists():
+        return None
+    try:
+        return WaveformPeaks.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Forma de onda dañada, se regenerará: {e}")
+        path.unlink(missing_ok=True)
+        return None
+
+
+def load_or_build_peaks(content_hash, pcm, sample_rate):
+    """Carga los picos de disco o los genera a partir del PCM y los guarda"""
+    peaks = load_peaks(content_hash)
+    if peaks is None:
+        peaks = _build_and_save(content_hash, pcm, sample_rate)
+    return peaks
+
+
+def build_cached_peaks(content_hash):
+    """
+    Genera los picos de una pista cuyo PCM ya está en caché (None si no lo está)
+
+    El PCM se lee por fragmentos a través del memmap: ni se decodifica el
+    audio ni se carga la canción entera en memoria.
+    """
+    pcm_cache = get_pcm_cache()
+    pcm = pcm_cache.read(content_hash)
+    if pcm is None:
+        return None
+    return _build_and_save(content_hash, pcm, pcm_cache.sample_rate)
+
+
+def _build_and_save(content_hash, pcm, sample_rate):
+    peaks = build_peaks(pcm, sample_rate)
+    path = peaks_path(content_hash)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    peaks.save(path)
+    return peaks
@@ -0,0 +1,70 @@
+# src/effects/transient.py - Efectos de UI de vida corta en slots reutilizables
+
+class EffectSlot:
+    """Slot reutilizable: los campos del efecto se asignan como atributos"""
+
+    def __init__(self, index):
+        self.index = index
+        self.start = 0.0
+        self.duration = 0.0
+        self.handle = None
+
+
+class EffectPool:
+    """
+    Número fijo de slots para un tipo de efecto (mensajes, puntos, indicadores)
+
+    Cada efecto vive en un slot preasignado y su caducidad es un temporizador
+    del TimerHeap que libera el slot; la posición y la opacidad se calculan
+    al dibujar a partir del tiempo transcurrido, así que no hay listas que
+    recorrer ni copiar en cada frame. Si se llenan, se recicla el efecto más
+    antiguo.
+    """
+
+    def __init__(self, timers, capacity):
+        self.timers = timers
+        self.slots = [EffectSlot(i) for i in range(capacity)]
+        self.free = list(range(capacity - 1, -1, -1))
+        self.active = {}  # índice -> slot, en orden de creación
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active.values())
+
+    def spawn(self, duration, **fields):
+        """Ocupa un slot durante duration segundos con los campos dados"""
+        if self.free:
+            slot = self.slots[self.free.pop()]
+        else:
+            # Sin huecos: se recicla el más antiguo
+            slot = self.active.pop(next(iter(self.active)))
+            self.timers.cancel(slot.handle)
+
+        slot.__dict__.update(fields)
+        slot.start = self.timers.time
+        slot.duration = duration
+        slot.handle = self.timers.schedule(duration, lambda: self.release(slot))
+        self.active[slot.index] = slot
+        return slot
+
+    def release(self, slot):
+        """Devuelve el slot al pool"""
+        if self.active.pop(slot.index, None) is None:
+            return
+        self.timers.cancel(slot.handle)
+        slot.handle = None
+        self.free.append(slot.index)
+
+    def age(self, slot):
+        """Segundos desde que apareció el efecto"""
+        return self.timers.time - slot.start
+
+    def progress(self, slot):
+        """Fracción 0-1 de la vida del efecto"""
+        return min(1.0, self.age(slot) / slot.duration) if slot.duration > 0 else 1.0
+
+    def clear(self):
+        for slot in list(self.active.values()):
+            self.release(slot)
@@ -0,0 +1,155 @@
+# src/entities/enemy_waves.py - Oleadas y disparos de enemigos programados sobre compases
+
+import zlib
+import numpy as np
+from src.settings import WIDTH, ENEMY_TYPES, ENEMY_CONFIG, ENEMY_WAVES, BAR_CONFIG
+from src.core.bars import regular_bar_map
+
+# Tipos de enemigo en el orden en que se guardan en la cola
+ENEMY_KINDS = tuple(ENEMY_TYPES)
+
+# Acciones de la cola (a igual tiempo, las apariciones van antes que los disparos)
+EVENT_SPAWN = 0
+EVENT_FIRE = 1
+
+
+class EnemySchedule:
+    """
+    Cola de eventos de enemigos ordenada por tiempo
+
+    Cada evento es una aparición (tipo, altura, id) o un disparo del enemigo
+    con ese id, siempre sobre un beat. Se consume con un cursor: en cada
+    frame solo se miran los eventos entre el cursor y el tiempo actual.
+    """
+
+    def __init__(self, times, action, kind, uid, y):
+        order = np.lexsort((action, times))
+        self.times = np.asarray(times, dtype=np.float64)[order]
+        self.action = np.asarray(action, dtype=np.int8)[order]
+        self.kind = np.asarray(kind, dtype=np.int8)[order]
+        self.uid = np.asarray(uid, dtype=np.int32)[order]
+        self.y = np.asarray(y, dtype=np.float32)[order]
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.times)
+
+    def seek(self, time):
+        """Coloca el cursor en el primer evento en o después de time"""
+        self.cursor = int(np.searchsorted(self.times, time, side='left'))
+
+    def pop_due(self, time):
+        """Eventos con tiempo <= time aún no consumidos (como slice)"""
+        end = int(np.searchsorted(self.times, time, side='right'))
+        due = slice(self.cursor, max(end, self.cursor))
+        self.cursor = due.stop
+        return due
+
+    def pending_for(self, uids):
+        """Eventos aún no consumidos de los enemigos uids como (times, action, kind, uid, y)"""
+        rest = slice(self.cursor, len(self.times))
+        keep = np.isin(self.uid[rest], uids)
+        return tuple(values[rest][keep] for values in
+                     (self.times, self.action, self.kind, self.uid, self.y))
+
+    def merged(self, events):
+        """Nueva cola con estos eventos añadidos (formato de pending_for)"""
+        own = (self.times, self.action, self.kind, self.uid, self.y)
+        return EnemySchedule(*(np.concatenate([a, b]) for a, b in zip(own, events)))
+
+    def spawn_count(self):
+        return int(np.count_nonzero(self.action == EVENT_SPAWN))
+
+
+def _fallback_grid():
+    """Beats regulares cuando no hay análisis de audio"""
+    period = 60.0 / ENEMY_WAVES['fallback_bpm']
+    beat_times = np.arange(0.0, ENEMY_WAVES['fallback_duration'], period)
+    return beat_times, np.full(len(beat_times), 0.5, dtype=np.float32), regular_bar_map(beat_times), []
+
+
+def schedule_seed(analyzer):
+    """Semilla estable por pista (misma canción = mismas oleadas)"""
+    if analyzer is None:
+        return 0
+    key = analyzer.content_hash or analyzer.audio_path
+    return zlib.crc32(str(key).encode('utf-8'))
+
+
+def build_enemy_schedule(analyzer, ground_y, seed=None, spawn_mult=1.0, first_uid=0):
+    """
+    Programa todas las oleadas y disparos de la pista
+
+    En cada compás puede entrar una oleada (probabilidad según la intensidad
+    del downbeat y la dificultad); el inicio de frase y los drops la
+    garantizan y la agrandan. Cada enemigo de la oleada aparece en un beat
+    consecutivo y dispara cada fire_beats beats mientras está en pantalla.
+    Todo sale de un generador con semilla: misma pista y semilla, mismas
+    oleadas.
+    """
+    chart = analyzer.chart if analyzer else None
+    if chart is not None and len(chart) > 0:
+        beat_times = chart.beat_times
+        intensity = chart.intensity
+        bar_map = chart.bar_map if chart.bar_map is not None else analyzer.bar_map
+        drop_times = analyzer.drops
+    else:
+        beat_times, intensity, bar_map, drop_times = _fallback_grid()
+
+    rng = np.random.default_rng(schedule_seed(analyzer) if seed is None else seed)
+    weights = np.array([ENEMY_WAVES['type_weights'].get(kind, 0) for kind in ENEMY_KINDS],
+                       dtype=np.float64)
+    weights /= weights.sum()
+
+    # Segundos que un enemigo tarda en cruzar la pantalla
+    lifetime = (WIDTH + 50 - ENEMY_CONFIG['despawn_x']) / (ENEMY_CONFIG['speed'] * 60)
+    phrase_bars = set(bar_map.phrase_start_bars[BAR_CONFIG['spawn_phrase_bars']].tolist())
+    drop_bars = {bar_map.bar_at(t) for t in drop_times}
+
+    times, action, kind, uid, y = [], [], [], [], []
+    next_uid = first_uid
+    n_beats = len(beat_times)
+
+    for bar, beat in enumerate(bar_map.downbeats.tolist()):
+        if bar < ENEMY_WAVES['warmup_bars']:
+            continue
+        level = float(intensity[beat])
+        accent = bar in phrase_bars or bar in drop_bars
+        chance = (ENEMY_WAVES['base_chance'] + ENEMY_WAVES['intensity_chance'] * level) * spawn_mult
+        roll = rng.random()
+        if not accent and roll >= chance:
+            continue
+
+        size = 1 + int(bar in phrase_bars and level > 0.5) + int(bar in drop_bars)
+        for k in range(min(size, ENEMY_WAVES['max_wave'])):
+            spawn_beat = beat + k
+            if spawn_beat >= n_beats:
+                break
+            type_index = int(rng.choice(len(ENEMY_KINDS), p=weights))
+            enemy_type = ENEMY_KINDS[type_index]
+            if enemy_type == 'turret':
+                height = ground_y - 60
+            else:
+                height = int(rng.integers(ground_y - 250, ground_y - 100))
+
+            spawn_time = float(beat_times[spawn_beat])
+            times.append(spawn_time)
+            action.append(EVENT_SPAWN)
+            kind.append(type_index)
+            uid.append(next_uid)
+            y.append(height)
+
+            # Disparos en los beats siguientes mientras siga en pantalla
+            step = ENEMY_TYPES[enemy_type]['fire_beats']
+            for fire_beat in range(spawn_beat + step, n_beats, step):
+                fire_time = float(beat_times[fire_beat])
+                if fire_time - spawn_time > lifetime:
+                    break
+                times.append(fire_time)
+                action.append(EVENT_FIRE)
+                kind.append(type_index)
+                uid.append(next_uid)
+                y.append(0.0)
+            next_uid += 1
+
+    return EnemySchedule(times, action, kind, uid, y)
@@ -3,8 +3,17 @@
 import pygame
 import random
 import math
-from src.settings import (WIDTH, HEIGHT, OBSTACLE_CONFIG, OBSTACLE_TYPES, 
+from src.settings import (WIDTH, HEIGHT, OBSTACLE_CONFIG, OBSTACLE_TYPES, COLLISION_CONFIG,
                           RED, PURPLE, YELLOW, GREEN, BLUE, WHITE)
+from src.core.collision import (rect_box, first_swept_hit, hits_in_order,
+                                mask_from_surface, masks_touch)
+
+# Máscaras de colisión de la silueta base: {(tipo, fase): máscara}
+_mask_cache = {}
+
+# Máscaras del cuerpo circular de los power-ups: {tamaño: máscara}
+_powerup_masks = {}
+
 
 class Obstacle(pygame.sprite.Sprite):
     """Obstáculo mejorado"""
@@ -50,6 +59,13 @@ class Obstacle(pygame.sprite.Sprite):
             -int(self.height * hitbox_shrink)
         )
         
+        # Hitbox en float (sin truncar) ahora y al inicio del frame, para la
+        # colisión continua
+        self.box = self._hit_box(self.y)
+        self.prev_box = self.box
+        self.bounds = self._sprite_box(self.y)
+        self.prev_bounds = self.bounds
+        
         self.update_visual()
     
     def update_visual(self):
@@ -67,11 +83,11 @@ class Obstacle(pygame.sprite.Sprite):
         
         # Dibujar según tipo
         if self.type == 'spike':
-            self._draw_spike_improved(w, h)
+            self._draw_spike_improved(self.image, w, h)
         elif self.type == 'box':
-            self._draw_box_improved(w, h)
+            self._draw_box_improved(self.image, w, h)
         elif self.type == 'flying':
-            self._draw_flying_improved(w, h)
+            self._draw_flying_improved(self.image, w, h)
         
         # Resplandor si está sincronizado
         if self.sync_beat and self.glow_intensity > 0:
@@ -81,74 +97,74 @@ class Obstacle(pygame.sprite.Sprite):
             self.image.blit(glow_surf, (-10, -10))
             self.glow_intensity -= 0.05
     
-    def _draw_spike_improved(self, w, h):
+    def _draw_spike_improved(self, surface, w, h):
         """Dibuja espiga mejorada"""
         points = [(w // 2, 5), (w - 5, h - 5), (5, h - 5)]
         
         # Sombra
         shadow_points = [(p[0] + 2, p[1] + 2) for p in points]
-        pygame.draw.polygon(self.image, (100, 0, 0), shadow_points)
+        pygame.draw.polygon(surface, (100, 0, 0), shadow_points)
         
         # Cuerpo principal
-        pygame.draw.polygon(self.image, self.color, points)
+        pygame.draw.polygon(surface, self.color, points)
         
         # Highlight
         highlight_points = [(w // 2, 8), (w // 2 + 5, h // 2), (w // 2, h // 2)]
-        pygame.draw.polygon(self.image, (255, 150, 150), highlight_points)
+        pygame.draw.polygon(surface, (255, 150, 150), highlight_points)
         
         # Borde
-        pygame.draw.polygon(self.image, (200, 0, 0), points, 3)
+        pygame.draw.polygon(surface, (200, 0, 0), points, 3)
     
-    def _draw_box_improved(self, w, h):
+    def _draw_box_improved(self, surface, w, h):
         """Dibuja caja mejorada"""
         main_rect = (5, 5, w - 10, h - 10)
         
         # Sombra
         shadow_rect = (7, 7, w - 10, h - 10)
-        pygame.draw.rect(self.image, (80, 40, 10), shadow_rect, border_radius=5)
+        pygame.draw.rect(surface, (80, 40, 10), shadow_rect, border_radius=5)
         
         # Cuerpo
-        pygame.draw.rect(self.image, self.color, main_rect, border_radius=5)
+        pygame.draw.rect(surface, self.color, main_rect, border_radius=5)
         
         # Efecto 3D - tapa
         top_points = [(5, 5), (w - 5, 5), (w - 8, 8), (8, 8)]
-        pygame.draw.polygon(self.image, (180, 120, 60), top_points)
+        pygame.draw.polygon(surface, (180, 120, 60), top_points)
         
         # Efecto 3D - lado
         right_points = [(w - 5, 5), (w - 5, h - 5), (w - 8, h - 8), (w - 8, 8)]
-        pygame.draw.polygon(self.image, (100, 60, 20), right_points)
+        pygame.draw.polygon(surface, (100, 60, 20), right_points)
         
         # Tablas de madera
         plank_y = 15
         while plank_y < h - 15:
-            pygame.draw.line(self.image, (100, 50, 20), 
+            pygame.draw.line(surface, (100, 50, 20), 
                            (10, plank_y), (w - 10, plank_y), 2)
             plank_y += 15
         
         # Clavos
         for nail_x in [12, w - 12]:
             for nail_y in [12, h // 2, h - 12]:
-                pygame.draw.circle(self.image, (60, 60, 60), (nail_x, nail_y), 3)
-                pygame.draw.circle(self.image, (100, 100, 100), (nail_x, nail_y), 2)
+                pygame.draw.circle(surface, (60, 60, 60), (nail_x, nail_y), 3)
+                pygame.draw.circle(surface, (100, 100, 100), (nail_x, nail_y), 2)
         
         # Borde
-        pygame.draw.rect(self.image, (100, 50, 20), main_rect, 3, border_radius=5)
+        pygame.draw.rect(surface, (100, 50, 20), main_rect, 3, border_radius=5)
     
-    def _draw_flying_improved(self, w, h):
+    def _draw_flying_improved(self, surface, w, h):
         """Dibuja enemigo volador"""
         center = (w // 2, h // 2)
         float_offset = int(math.sin(self.animation_time * 3) * 3)
         
         # Cuerpo principal (fantasma)
-        pygame.draw.circle(self.image, self.color, 
+        pygame.draw.circle(surface, self.color, 
                           (center[0], center[1] + float_offset), 
                           min(w, h) // 2 - 3)
         
         # Brazos flotantes
-        pygame.draw.circle(self.image, self.color, 
+        pygame.draw.circle(surface, self.color, 
                           (center[0] - 8, center[1] + float_offset - 5), 
                           min(w, h) // 3)
-        pygame.draw.circle(self.image, self.color, 
+        pygame.draw.circle(surface, self.color, 
                           (center[0] + 8, center[1] + float_offset - 5), 
                           min(w, h) // 3)
         
@@ -161,20 +177,20 @@ class Obstacle(pygame.sprite.Sprite):
         
         wave_points.append((w - 5, center[1] + float_offset))
         wave_points.append((5, center[1] + float_offset))
-        pygame.draw.polygon(self.image, self.color, wave_points)
+        pygame.draw.polygon(surface, self.color, wave_points)
         
         # Ojos
         eye_y = center[1] + float_offset - 5
-        pygame.draw.ellipse(self.image, WHITE, (center[0] - 12, eye_y - 5, 8, 10))
-        pygame.draw.circle(self.image, (0, 0, 0), (center[0] - 8, eye_y), 3)
-        pygame.draw.ellipse(self.image, WHITE, (center[0] + 4, eye_y - 5, 8, 10))
-        pygame.draw.circle(self.image, (0, 0, 0), (center[0] + 8, eye_y), 3)
+        pygame.draw.ellipse(surface, WHITE, (center[0] - 12, eye_y - 5, 8, 10))
+        pygame.draw.circle(surface, (0, 0, 0), (center[0] - 8, eye_y), 3)
+        pygame.draw.ellipse(surface, WHITE, (center[0] + 4, eye_y - 5, 8, 10))
+        pygame.draw.circle(surface, (0, 0, 0), (center[0] + 8, eye_y), 3)
         
         # Cejas
-        pygame.draw.line(self.image, (0, 0, 0), 
+        pygame.draw.line(surface, (0, 0, 0), 
                         (center[0] - 15, eye_y - 8), 
                         (center[0] - 5, eye_y - 6), 3)
-        pygame.draw.line(self.image, (0, 0, 0), 
+        pygame.draw.line(surface, (0, 0, 0), 
                         (center[0] + 5, eye_y - 6), 
                         (center[0] + 15, eye_y - 8), 3)
         
@@ -187,10 +203,10 @@ class Obstacle(pygame.sprite.Sprite):
             (center[0] + 5, mouth_y + 5),
             (center[0] + 10, mouth_y)
         ]
-        pygame.draw.lines(self.image, (0, 0, 0), False, mouth_points, 3)
+        pygame.draw.lines(surface, (0, 0, 0), False, mouth_points, 3)
         
         # Borde brillante
-        pygame.draw.circle(self.image, WHITE, 
+        pygame.draw.circle(surface, WHITE, 
                           (center[0], center[1] + float_offset), 
                           min(w, h) // 2 - 3, 2)
         
@@ -199,7 +215,7 @@ class Obstacle(pygame.sprite.Sprite):
         glow_surf = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
         glow_color = (*self.color, 50)
         pygame.draw.circle(glow_surf, glow_color, (glow_radius, glow_radius), glow_radius)
-        self.image.blit(glow_surf, 
+        surface.blit(glow_surf, 
                        (center[0] - glow_radius, center[1] + float_offset - glow_radius))
     
     def trigger_beat_pulse(self):
@@ -207,24 +223,70 @@ class Obstacle(pygame.sprite.Sprite):
         self.pulse_time = 1.0
         self.glow_intensity = 1.0
     
+    def _hit_box(self, y):
+        """Hitbox (left, top, right, bottom) en float para la posición actual"""
+        left = self.x + self.width * 0.1
+        top = y + self.height * 0.1
+        return (left, top, left + self.hitbox.width, top + self.hitbox.height)
+    
+    def _sprite_box(self, y):
+        """Caja completa del sprite en float (para la colisión por píxeles)"""
+        return (self.x, y, self.x + self.width, y + self.height)
+    
+    def _mask_phase(self):
+        """Fase de animación cuantizada que decide la silueta (solo voladores)"""
+        if self.type != 'flying':
+            return 0
+        phases = COLLISION_CONFIG['flying_mask_phases']
+        cycle = (self.animation_time * 3 / (2 * math.pi)) % 1.0
+        return int(cycle * phases) % phases
+    
+    def collision_mask(self):
+        """
+        Máscara de la silueta actual, compartida entre obstáculos del mismo tipo
+        
+        Se genera una vez por tipo y fase a partir del dibujo base (sin pulso
+        ni resplandor, que son solo decorativos).
+        """
+        key = (self.type, self._mask_phase())
+        mask = _mask_cache.get(key)
+        if mask is None:
+            surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            if self.type == 'spike':
+                self._draw_spike_improved(surface, self.width, self.height)
+            elif self.type == 'box':
+                self._draw_box_improved(surface, self.width, self.height)
+            elif self.type == 'flying':
+                # Dibujar en el instante que representa la fase
+                phases = COLLISION_CONFIG['flying_mask_phases']
+                animation_time = self.animation_time
+                self.animation_time = (key[1] + 0.5) / phases * 2 * math.pi / 3
+                self._draw_flying_improved(surface, self.width, self.height)
+                self.animation_time = animation_time
+            mask = mask_from_surface(surface)
+            _mask_cache[key] = mask
+        return mask
+    
     def update(self, dt):
         """Actualiza obstáculo"""
         self.animation_time += dt
+        self.prev_box = self.box
+        self.prev_bounds = self.bounds
         self.x -= self.speed * dt * 60
         self.rect.x = int(self.x)
         
-        # Actualizar hitbox
-        self.hitbox.x = self.rect.x + int(self.width * 0.1)
-        
         # Movimiento de voladores
+        y = self.y
         if self.type == 'flying':
             self.fly_time += dt * self.fly_speed
-            offset_y = math.sin(self.fly_time) * 30
-            self.rect.y = int(self.y + offset_y)
-            self.hitbox.y = self.rect.y + int(self.height * 0.1)
-        else:
-            self.rect.y = int(self.y)
-            self.hitbox.y = self.rect.y + int(self.height * 0.1)
+            y += math.sin(self.fly_time) * 30
+        self.rect.y = int(y)
+        
+        # Actualizar hitbox (la entera solo se usa para depurar)
+        self.box = self._hit_box(y)
+        self.bounds = self._sprite_box(y)
+        self.hitbox.x = int(self.box[0])
+        self.hitbox.y = int(self.box[1])
         
         self.update_visual()
         
@@ -264,6 +326,12 @@ class PowerUp(pygame.sprite.Sprite):
         # Hitbox más generosa
         self.hitbox = self.rect.inflate(-10, -10)
         
+        # Cajas en float para la colisión continua (actual y del frame anterior)
+        self.box = self._hit_box()
+        self.prev_box = self.box
+        self.bounds = self._sprite_box()
+        self.prev_bounds = self.bounds
+        
         self.rotation = 0
         self.pulse = 0
         
@@ -277,11 +345,36 @@ class PowerUp(pygame.sprite.Sprite):
             self.color = (255, 100, 255)
             self.symbol = 'star'
     
+    def _hit_box(self):
+        """Hitbox (left, top, right, bottom) en float"""
+        left = self.rect.left + (self.x - int(self.x)) + 5
+        top = self.hitbox.top
+        return (left, top, left + self.hitbox.width, top + self.hitbox.height)
+    
+    def _sprite_box(self):
+        """Caja completa del sprite en float (para la colisión por píxeles)"""
+        left = self.rect.left + (self.x - int(self.x))
+        return (left, self.rect.top, left + self.rect.width, self.rect.bottom)
+    
+    def collision_mask(self):
+        """Máscara del cuerpo sin pulso ni resplandor (compartida por tamaño)"""
+        mask = _powerup_masks.get(self.size)
+        if mask is None:
+            surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, WHITE, (self.size, self.size), self.size)
+            mask = mask_from_surface(surface)
+            _powerup_masks[self.size] = mask
+        return mask
+    
     def update(self, dt):
         """Actualiza power-up"""
+        self.prev_box = self.box
+        self.prev_bounds = self.bounds
         self.x -= self.speed * dt * 60
         self.rect.x = int(self.x)
         self.hitbox.x = self.rect.x + 5
+        self.box = self._hit_box()
+        self.bounds = self._sprite_box()
         
         self.rotation += dt * 180
         self.pulse += dt * 5
@@ -397,51 +490,49 @@ class ObstacleManager:
         """
         Pre-genera obstáculos basados en los beats de la música
         """
-        if not self.audio_analyzer or not self.audio_analyzer.beat_times:
+        chart = self.audio_analyzer.chart if self.audio_analyzer else None
+        if chart is None or len(chart) == 0:
             return
         
         # Rango de tiempo a procesar
         start_time = self.last_processed_time
         end_time = current_time + self.spawn_window
         
-        # Obtener beats en este rango
-        beats_in_range = [
-            b for b in self.audio_analyzer.beat_times 
-            if start_time <= b <= end_time
-        ]
-        
-        for beat_time in beats_in_range:
-            # Decidir si spawner obstáculo en este beat
-            intensity = self.audio_analyzer.get_intensity_at_time(beat_time)
+        # Beats del chart en este rango (intensidad, probabilidad, acento y
+        # tipo ya calculados en el análisis)
+        for index in chart.indices_between(start_time, end_time):
+            beat_time = float(chart.beat_times[index])
+            intensity = float(chart.intensity[index])
+            phrase_accent = bool(chart.accent[index])
             
-            # Probabilidad basada en intensidad
-            spawn_chance = 0.3 + (intensity * 0.5)  # 30% - 80%
-            
-            if random.random() < spawn_chance:
+            if phrase_accent or random.random() < chart.spawn_chance[index]:
                 # Calcular cuándo debe aparecer en pantalla
                 # (considerando que los obstáculos se mueven hacia el jugador)
                 travel_distance = WIDTH + 100  # Desde fuera de pantalla hasta el jugador
                 speed = self.base_speed * (0.8 + intensity * 0.4)
                 travel_time = travel_distance / (speed * 60)  # 60 = fps
-                
-                spawn_time = beat_time - travel_time
+
+                # Redondear el viaje a beats enteros del tempo local: el
+                # obstáculo aparece en un beat y llega en otro aunque el
+                # tempo cambie por el camino
+                travel_beats = max(1, round(travel_time / self.audio_analyzer.get_beat_period_at(beat_time)))
+                target_beat = self.audio_analyzer.time_to_beat(beat_time)
+                spawn_time = self.audio_analyzer.beat_to_time(target_beat - travel_beats)
+                speed = travel_distance / ((beat_time - spawn_time) * 60)
                 
                 # Solo agregar si aún no ha pasado
                 if spawn_time > current_time - 0.1:
-                    # Tipo de obstáculo basado en intensidad
-                    obstacle_type = self._choose_obstacle_type_by_intensity(intensity)
-                    
-                    # Verificar si es un beat fuerte (para sincronización visual)
-                    nearest_beat = self.audio_analyzer.get_nearest_beat(beat_time)
-                    is_strong_beat = abs(nearest_beat - beat_time) < 0.05 if nearest_beat else False
+                    # Sin banda dominante se elige por intensidad
+                    obstacle_type = chart.obstacle_at(index) or self._choose_obstacle_type_by_intensity(intensity)
                     
+                    # Todos los candidatos del chart caen en un beat
                     self.upcoming_obstacles.append({
                         'spawn_time': spawn_time,
                         'type': obstacle_type,
                         'speed': speed,
                         'sync_beat': True,
-                        'beat_strength': intensity,
-                        'is_strong_beat': is_strong_beat
+                        'beat_strength': 1.0 if phrase_accent else intensity,
+                        'is_strong_beat': True
                     })
         
         self.last_processed_time = end_time
@@ -537,24 +628,71 @@ class ObstacleManager:
         powerup = PowerUp(x, y, powerup_type, speed)
         self.powerups.add(powerup)
     
-    def check_collision(self, player_rect):
-        """Verifica colisión con obstáculos usando hitbox mejorada"""
+    def check_collision(self, player_rect, prev_player_rect=None, player_mask=None):
+        """
+        Verifica colisión con obstáculos usando hitbox mejorada
+        
+        Con prev_player_rect la prueba es continua: cuenta cualquier contacto
+        entre la posición anterior y la actual de jugador y obstáculo, así a
+        velocidades altas o en un tirón de frames no se atraviesan.
+        Con player_mask (modo preciso) se usan los sprites completos y cada
+        choque de cajas se confirma píxel a píxel.
+        """
+        obstacles = self.obstacles.sprites()
+        if not obstacles:
+            return None
+        
+        if player_mask is not None:
+            curr = rect_box(player_rect)
+            candidates = hits_in_order(rect_box(prev_player_rect or player_rect), curr,
+                                       [obstacle.prev_bounds for obstacle in obstacles],
+                                       [obstacle.bounds for obstacle in obstacles])
+            for index in candidates:
+                obstacle = obstacles[index]
+                if masks_touch(player_mask, curr, obstacle.collision_mask(), obstacle.bounds):
+                    return obstacle
+            return None
+        
         # Hitbox del jugador más pequeña (más generosa)
         player_hitbox = player_rect.inflate(-15, -20)
+        prev_hitbox = (prev_player_rect or player_rect).inflate(-15, -20)
         
-        for obstacle in self.obstacles:
-            if player_hitbox.colliderect(obstacle.hitbox):
-                return obstacle
-        return None
+        index = first_swept_hit(rect_box(prev_hitbox), rect_box(player_hitbox),
+                                [obstacle.prev_box for obstacle in obstacles],
+                                [obstacle.box for obstacle in obstacles])
+        return obstacles[index] if index is not None else None
     
-    def check_powerup_collision(self, player_rect):
-        """Verifica colisión con power-ups"""
-        for powerup in self.powerups:
-            if player_rect.colliderect(powerup.hitbox):
-                powerup_type = powerup.type
-                powerup.kill()
-                return powerup_type
-        return None
+    def check_powerup_collision(self, player_rect, prev_player_rect=None, player_mask=None):
+        """
+        Verifica colisión con power-ups (retorna el tipo recogido)
+        
+        Igual que check_collision: barrida desde prev_player_rect y, con
+        player_mask, confirmada con la máscara del cuerpo del power-up.
+        """
+        powerups = self.powerups.sprites()
+        if not powerups:
+            return None
+        
+        prev = rect_box(prev_player_rect or player_rect)
+        curr = rect_box(player_rect)
+        powerup = None
+        if player_mask is not None:
+            for index in hits_in_order(prev, curr, [p.prev_bounds for p in powerups],
+                                       [p.bounds for p in powerups]):
+                if masks_touch(player_mask, curr, powerups[index].collision_mask(),
+                               powerups[index].bounds):
+                    powerup = powerups[index]
+                    break
+        else:
+            index = first_swept_hit(prev, curr, [p.prev_box for p in powerups],
+                                    [p.box for p in powerups])
+            if index is not None:
+                powerup = powerups[index]
+        
+        if powerup is None:
+            return None
+        powerup.kill()
+        return powerup.type
     
     def draw(self, screen, debug=False):
         """Dibuja obstáculos"""
@@ -568,4 +706,12 @@ class ObstacleManager:
         self.obstacles.empty()
         self.powerups.empty()
         self.upcoming_obstacles.clear()
-        self.last_processed_time = 0
\ No newline at end of file
+        self.last_processed_time = 0
+    
+    def reset(self):
+        """Vuelve al inicio de la pista (reintento) sin rehacer el análisis"""
+        self.clear()
+        self.difficulty_mult = 1.0
+        self.obstacles_spawned = 0
+        self.beat_sync_count = 0
+        self._prepare_obstacles_ahead(0)
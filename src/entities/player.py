@@ -3,6 +3,9 @@ import math
 import os
 from src.settings import (GRAVITY, PLAYER_SPEED, PLAYER_JUMP, PLAYER_DOUBLE_JUMP,
                           RED, WHITE, BLUE, YELLOW, PURPLE, BASE_DIR)
+from src.core.timers import TimerHeap
+from src.core.collision import mask_from_surface
+from src.core.assets import get_assets
 
 # ¡¡¡CONTEO REAL DE FRAMES BASADO EN LAS IMÁGENES!!!
 FRAME_COUNTS = {
@@ -14,13 +17,42 @@ FRAME_COUNTS = {
     'Run.png': 9,
 }
 
+# Tiras de sprites: archivo -> animación
+SPRITE_SHEETS = {
+    'Idle.png': 'idle',
+    'Run.png': 'run',
+    'Jump.png': 'jump',
+    'Attack_3.png': 'attack',
+    'Hurt.png': 'hurt',
+    'Dead.png': 'dead',
+}
+
+
+def sprite_sheet_paths():
+    """Rutas existentes de las tiras de sprites: {archivo: ruta}"""
+    player_dir = os.path.join(BASE_DIR, 'assets', 'player')
+    paths = {}
+    for file_name in SPRITE_SHEETS:
+        folder_name = file_name.split('.')[0] # Ej: 'Idle'
+        path = os.path.join(player_dir, folder_name, file_name)
+        if not os.path.exists(path):
+            path = os.path.join(player_dir, file_name)
+        if os.path.exists(path):
+            paths[file_name] = path
+    return paths
+
 
 class Player(pygame.sprite.Sprite):
     """Jugador con sprites animados de Rayman"""
     
-    def __init__(self, pos):
+    def __init__(self, pos, timers=None):
         super().__init__()
         
+        # Temporizadores de invulnerabilidad y power-ups. Si no se comparte
+        # el del juego, el jugador avanza el suyo propio en update()
+        self.owns_timers = timers is None
+        self.timers = TimerHeap() if timers is None else timers
+        
         # Dimensiones
         self.width = 60
         self.height = 70
@@ -52,6 +84,10 @@ class Player(pygame.sprite.Sprite):
         
         self.rect = self.image.get_rect(topleft=pos)
         
+        # Máscaras de colisión por fotograma de sprite (modo preciso)
+        self.frame_key = None
+        self._mask_cache = {}
+        
         # Física
         self.vel = pygame.math.Vector2(0, 0)
         self.speed = PLAYER_SPEED
@@ -60,17 +96,17 @@ class Player(pygame.sprite.Sprite):
         
         # Estado y control de animación
         self.invulnerable = False
-        self.invuln_timer = 0
+        self.invuln_handle = None
         self.invuln_duration = 1.5
         self.is_animation_overriding = False 
         
         # Power-ups
         self.shield_active = False
-        self.shield_timer = 0
+        self.shield_handle = None
         self.shield_duration = 5.0
         
         self.invincible_active = False
-        self.invincible_timer = 0
+        self.invincible_handle = None
         self.invincible_duration = 5.0
         
         # Animación
@@ -82,18 +118,20 @@ class Player(pygame.sprite.Sprite):
         self.use_procedural = len(self.animations['idle']) == 0
     
     def load_sprites(self): 
-        """Carga los sprites desde las carpetas (tiras de sprites)"""
+        """
+        Carga los sprites desde las carpetas (tiras de sprites)
         
-        if self._load_from_folders():
+        Los fotogramas recortados y escalados se guardan en el gestor de
+        assets: el siguiente jugador (reintento, otra partida) los reutiliza.
+        """
+        self.animations = get_assets().acquire(self.sprites_key(), self._load_from_folders)
+        
+        if any(len(v) > 0 for v in self.animations.values()):
             print("✅ Sprites cargados desde carpetas individuales (como sprite sheets)")
-            # Asignar fall si jump se cargó
-            if self.animations['jump'] and not self.animations['fall']:
-                self.animations['fall'] = self.animations['jump'].copy()
             return
         
-        if not any(len(v) > 0 for v in self.animations.values()):
-            print("⚠️ No se encontraron sprites de Rayman. Usando sprites procedurales.")
-            self.use_procedural = True
+        print("⚠️ No se encontraron sprites de Rayman. Usando sprites procedurales.")
+        self.use_procedural = True
     
     # --- FUNCIONES DE CARGA Y ESCALADO (Mantenidas) ---
     def _extract_frames_from_sheet(self, sheet, frame_count):
@@ -120,53 +158,39 @@ class Player(pygame.sprite.Sprite):
             
         return frames
 
+    def sprites_key(self):
+        """Clave de los fotogramas en el gestor de assets (dependen del tamaño)"""
+        return ('player_frames', self.width, self.height)
+    
+    def release_sprites(self):
+        """Devuelve los fotogramas al gestor de assets"""
+        get_assets().release(self.sprites_key())
+    
     def _load_from_folders(self):
         """Carga sprites desde carpetas individuales, tratando cada PNG como un sprite sheet."""
-        player_dir = os.path.join(BASE_DIR, 'assets', 'player')
-        # ... (Resto de la lógica de carga, no modificada)
-        if not os.path.exists(player_dir):
-            return False
-        
-        file_to_animation = {
-    'Idle.png': ('idle', FRAME_COUNTS['Idle.png']),
-    'Run.png': ('run', FRAME_COUNTS['Run.png']),
-    'Jump.png': ('jump', FRAME_COUNTS['Jump.png']),
-    'Attack_3.png': ('attack', FRAME_COUNTS['Attack_3.png']),
-    'Hurt.png': ('hurt', FRAME_COUNTS['Hurt.png']),
-    'Dead.png': ('dead', FRAME_COUNTS['Dead.png']),  
-}
-
-        
-        loaded_any = False
-        
-        for file_name, (animation_key, frame_count) in file_to_animation.items():
-            folder_name = file_name.split('.')[0] # Ej: 'Idle'
-            folder_path = os.path.join(player_dir, folder_name, file_name)
-            
-            if not os.path.exists(folder_path):
-                folder_path = os.path.join(player_dir, file_name)
-            
-            if os.path.exists(folder_path):
-                try:
-                    sheet = pygame.image.load(folder_path).convert_alpha()
-                    frames = self._extract_frames_from_sheet(sheet, frame_count)
-                    
-                    if frames:
-                        self.animations[animation_key] = frames
-                        loaded_any = True
-                        # print(f"✅ Cargado: {file_name} -> {animation_key} ({len(frames)} frames)")
-                    else:
-                        print(f"⚠️ No se pudieron extraer frames de {file_name}")
+        animations = {key: [] for key in self.animations}
+        assets = get_assets()
+        
+        for file_name, folder_path in sprite_sheet_paths().items():
+            animation_key = SPRITE_SHEETS[file_name]
+            try:
+                # La tira solo hace falta para recortar: se suelta enseguida
+                sheet = assets.image(folder_path)
+                assets.release_image(folder_path)
+                frames = self._extract_frames_from_sheet(sheet, FRAME_COUNTS[file_name])
+                
+                if frames:
+                    animations[animation_key] = frames
+                else:
+                    print(f"⚠️ No se pudieron extraer frames de {file_name}")
 
-                except Exception as e:
-                    print(f"⚠️ Error cargando {file_name}: {e}")
-            else:
-                pass
+            except Exception as e:
+                print(f"⚠️ Error cargando {file_name}: {e}")
         
-        if not self.animations['fall'] and self.animations['jump']:
-            self.animations['fall'] = self.animations['jump'].copy()
+        if not animations['fall'] and animations['jump']:
+            animations['fall'] = animations['jump'].copy()
         
-        return loaded_any
+        return animations
     
     def _scale_sprite_to_size(self, sprite, target_width, target_height):
         """
@@ -428,32 +452,19 @@ class Player(pygame.sprite.Sprite):
              self.animation_frame_float = 0.0
              self.animation_timer = 0 # No es estrictamente necesario, pero se mantiene por seguridad
 
-        # Actualizar invulnerabilidad y power-ups (no modificados)
+        # Invulnerabilidad y power-ups vencen por temporizador
+        if self.owns_timers:
+            self.timers.advance(dt)
         if self.invulnerable:
-            self.invuln_timer += dt
-            if self.invuln_timer >= self.invuln_duration:
-                self.invulnerable = False
-                self.invuln_timer = 0
             self.flash_timer += 0.1
         
-        if self.shield_active:
-            self.shield_timer += dt
-            if self.shield_timer >= self.shield_duration:
-                self.shield_active = False
-                self.shield_timer = 0
-        
-        if self.invincible_active:
-            self.invincible_timer += dt
-            if self.invincible_timer >= self.invincible_duration:
-                self.invincible_active = False
-                self.invincible_timer = 0
-        
         # Actualizar sprite
         self._update_sprite()
     
     def _update_sprite(self):
         """Actualiza el sprite actual"""
         # ... (código no modificado)
+        self.frame_key = None
         if self.use_procedural:
             self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
             if not self.on_ground:
@@ -483,11 +494,56 @@ class Player(pygame.sprite.Sprite):
                     sprite = pygame.transform.flip(sprite, True, False)
                 
                 self.image.blit(sprite, sprite_rect)
+                self.frame_key = (self.current_animation, frame_index, self.facing_right)
             else:
                 # Fallback si no hay frames
                 self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
                 self._draw_procedural_fallback()
     
+    def reset(self, pos):
+        """
+        Vuelve al estado inicial en pos para reintentar la partida
+        
+        Conserva los sprites ya cargados y escalados (y sus máscaras).
+        """
+        for handle in (self.invuln_handle, self.shield_handle, self.invincible_handle):
+            self.timers.cancel(handle)
+        
+        self.vel.update(0, 0)
+        self.on_ground = False
+        self.can_double_jump = True
+        
+        self.invulnerable = False
+        self.shield_active = False
+        self.invincible_active = False
+        self.is_animation_overriding = False
+        
+        self.current_animation = 'idle'
+        self.animation_frame_float = 0.0
+        self.animation_timer = 0
+        self.flash_timer = 0
+        self.animation_time = 0
+        self.facing_right = True
+        
+        self.rect.topleft = pos
+        self._update_sprite()
+    
+    def get_mask(self):
+        """
+        Máscara de píxeles del fotograma actual (colisión precisa)
+        
+        Los fotogramas de sprite comparten máscara por (animación, índice,
+        orientación); el dibujo procedural cambia cada frame y se calcula
+        al momento.
+        """
+        if self.frame_key is None:
+            return mask_from_surface(self.image)
+        mask = self._mask_cache.get(self.frame_key)
+        if mask is None:
+            mask = mask_from_surface(self.image)
+            self._mask_cache[self.frame_key] = mask
+        return mask
+    
     def take_damage(self):
         """
         Recibe daño y activa invulnerabilidad
@@ -496,7 +552,8 @@ class Player(pygame.sprite.Sprite):
             return False
         
         self.invulnerable = True
-        self.invuln_timer = 0
+        self.invuln_handle = self._restart_timer(self.invuln_handle, self.invuln_duration,
+                                                 self._end_invulnerability)
         
         # Pequeño impulso hacia arriba
         if self.on_ground:
@@ -517,12 +574,30 @@ class Player(pygame.sprite.Sprite):
         """Activa un power-up (no modificado)"""
         if powerup_type == 'shield':
             self.shield_active = True
-            self.shield_timer = 0
+            self.shield_handle = self._restart_timer(self.shield_handle, self.shield_duration,
+                                                     self._end_shield)
         elif powerup_type == 'invincible':
             self.invincible_active = True
-            self.invincible_timer = 0
+            self.invincible_handle = self._restart_timer(self.invincible_handle, self.invincible_duration,
+                                                         self._end_invincible)
         elif powerup_type == 'slow':
             pass 
+    
+    def _restart_timer(self, handle, duration, callback):
+        """Programa (o reinicia si sigue activo) un temporizador del jugador"""
+        if handle is None:
+            return self.timers.schedule(duration, callback)
+        self.timers.restart(handle, duration)
+        return handle
+    
+    def _end_invulnerability(self):
+        self.invulnerable = False
+    
+    def _end_shield(self):
+        self.shield_active = False
+    
+    def _end_invincible(self):
+        self.invincible_active = False
 
     def draw(self, screen):
         """Dibuja el jugador con efectos"""
@@ -0,0 +1,361 @@
+# src/entities/projectiles.py - Motor de proyectiles en arrays (struct of arrays)
+
+import math
+import random
+import numpy as np
+import pygame
+from src.settings import WIDTH, HEIGHT, PROJECTILE_TYPES, PROJECTILE_CONFIG
+from src.core.collision import rect_box, swept_aabb, hits_in_order, mask_from_surface, masks_touch
+
+# Orden de los tipos en el array kind
+PROJECTILE_KINDS = tuple(PROJECTILE_TYPES)
+
+# Direcciones pre-rotadas para las flechas
+ARROW_DIRECTIONS = 32
+ROCK_VARIANTS = 4
+
+# Fotogramas pre-renderizados por tipo: {tipo: (lista de superficies, fps)}
+_frame_cache = {}
+
+# Máscaras de colisión con los mismos índices que los fotogramas: {tipo: [máscaras]}
+_mask_cache = {}
+
+
+# ============================================
+# FOTOGRAMAS
+# ============================================
+
+def _render_fireball(size, t):
+    """Bola de fuego en el instante t de su animación"""
+    image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    center = size
+
+    # Núcleo amarillo y anillo naranja
+    pygame.draw.circle(image, (255, 255, 100), (center, center), size // 2)
+    pygame.draw.circle(image, (255, 150, 0), (center, center), size - 2, 3)
+
+    # Llamas exteriores
+    for i in range(8):
+        rad = math.radians((t * 10 + i * 45) % 360)
+        offset = int(math.sin(t * 15) * 3)
+        fx = center + int((size - 3 + offset) * math.cos(rad))
+        fy = center + int((size - 3 + offset) * math.sin(rad))
+        pygame.draw.circle(image, (255, 50, 0), (fx, fy), 3)
+    return image
+
+
+def _render_arrow(size, angle):
+    """Flecha orientada según angle (radianes)"""
+    image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    center = size
+
+    tip_x = center + int(size * 0.8 * math.cos(angle))
+    tip_y = center + int(size * 0.8 * math.sin(angle))
+    tail_x = center - int(size * 0.8 * math.cos(angle))
+    tail_y = center - int(size * 0.8 * math.sin(angle))
+
+    # Cuerpo y punta metálica
+    pygame.draw.line(image, (120, 80, 40), (tail_x, tail_y), (tip_x, tip_y), 4)
+    pygame.draw.circle(image, (180, 180, 180), (tip_x, tip_y), 5)
+    pygame.draw.circle(image, (220, 220, 220), (tip_x, tip_y), 3)
+
+    # Plumas
+    perp_angle = angle + math.pi / 2
+    feather_x = int(5 * math.cos(perp_angle))
+    feather_y = int(5 * math.sin(perp_angle))
+    pygame.draw.line(image, (200, 50, 50),
+                     (tail_x + feather_x, tail_y + feather_y),
+                     (tail_x - feather_x, tail_y - feather_y), 3)
+    return image
+
+
+def _render_rock(size, variant):
+    """Roca con grietas fijas por variante (antes se sorteaban cada frame)"""
+    image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    center = size
+    rng = random.Random(variant)
+
+    pygame.draw.circle(image, (80, 80, 80), (center, center), size - 2)
+    for _ in range(5):
+        angle = rng.uniform(0, math.pi * 2)
+        length = rng.randint(5, size - 4)
+        x1 = center + int((size // 2) * math.cos(angle))
+        y1 = center + int((size // 2) * math.sin(angle))
+        x2 = x1 + int(length * math.cos(angle + rng.uniform(-0.5, 0.5)))
+        y2 = y1 + int(length * math.sin(angle + rng.uniform(-0.5, 0.5)))
+        pygame.draw.line(image, (60, 60, 60), (x1, y1), (x2, y2), 2)
+
+    pygame.draw.circle(image, (120, 120, 120), (center - 3, center - 3), size // 3)
+    return image
+
+
+def _render_magic(size, color, rotation):
+    """Estrella mágica girada rotation grados"""
+    image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    center = size
+
+    points = []
+    for i in range(10):
+        angle = math.radians(i * 36 + rotation)
+        radius = size if i % 2 == 0 else size // 2
+        points.append((center + int(radius * math.cos(angle)),
+                       center + int(radius * math.sin(angle))))
+
+    # Resplandor
+    glow_surf = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
+    pygame.draw.circle(glow_surf, (*color, 50), (size * 1.5, size * 1.5), size * 1.5)
+    image.blit(glow_surf, (-size // 2, -size // 2))
+
+    pygame.draw.polygon(image, color, points)
+    pygame.draw.polygon(image, (255, 255, 255), points, 2)
+    return image
+
+
+def get_projectile_frames(kind_name):
+    """
+    Fotogramas de un tipo de proyectil, renderizados una sola vez
+
+    Returns:
+        (lista de superficies, fotogramas por segundo; 0 = estático)
+    """
+    frames = _frame_cache.get(kind_name)
+    if frames is None:
+        config = PROJECTILE_TYPES[kind_name]
+        size = config['size']
+        if kind_name == 'fireball':
+            # Un ciclo del pulso de las llamas (sin(15 t))
+            count = 16
+            period = 2 * math.pi / 15
+            frames = ([_render_fireball(size, i * period / count) for i in range(count)],
+                      count / period)
+        elif kind_name == 'arrow':
+            # Fijo por dirección: el índice base elige la rotación
+            frames = ([_render_arrow(size, 2 * math.pi * i / ARROW_DIRECTIONS)
+                       for i in range(ARROW_DIRECTIONS)], 0)
+        elif kind_name == 'rock':
+            frames = ([_render_rock(size, i) for i in range(ROCK_VARIANTS)], 0)
+        else:
+            # 360 grados/s con simetría de 72 grados
+            count = 12
+            frames = ([_render_magic(size, config['color'], i * 72 / count) for i in range(count)],
+                      count / 0.2)
+        _frame_cache[kind_name] = frames
+    return frames
+
+
+def get_projectile_masks(kind_name):
+    """Máscaras de píxeles de cada fotograma de un tipo (mismo índice)"""
+    masks = _mask_cache.get(kind_name)
+    if masks is None:
+        frames, _ = get_projectile_frames(kind_name)
+        masks = [mask_from_surface(frame) for frame in frames]
+        _mask_cache[kind_name] = masks
+    return masks
+
+
+def clear_frame_cache():
+    """Libera los fotogramas pre-renderizados y sus máscaras"""
+    _frame_cache.clear()
+    _mask_cache.clear()
+
+
+# ============================================
+# MOTOR
+# ============================================
+
+class ProjectileEngine:
+    """
+    Todos los proyectiles enemigos como arrays de NumPy
+
+    Posición, velocidad, tipo, edad y fotograma base viven en arrays
+    paralelos; los activos ocupan [0, count). Mover, descartar los que salen
+    de pantalla y probar el solapamiento con el jugador son unas pocas
+    operaciones vectorizadas, y el dibujo es un solo blits() con fotogramas
+    pre-renderizados, así que miles de proyectiles simultáneos son viables.
+    """
+
+    def __init__(self, capacity=None):
+        capacity = capacity or PROJECTILE_CONFIG['initial_capacity']
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)  # Píxeles por segundo
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.frame_base = np.zeros(capacity, dtype=np.int16)
+
+        # Tablas por tipo indexadas por kind
+        self.half_size = np.array([PROJECTILE_TYPES[k]['size'] for k in PROJECTILE_KINDS],
+                                  dtype=np.float32)
+        self.damage = np.array([PROJECTILE_TYPES[k]['damage'] for k in PROJECTILE_KINDS],
+                               dtype=np.int16)
+        self._arrays = ('x', 'y', 'vx', 'vy', 'age', 'kind', 'frame_base')
+        self.last_dt = 0.0  # Paso del último update (posición anterior = pos - v·dt)
+
+    def __len__(self):
+        return self.count
+
+    def _ensure_capacity(self, extra):
+        """Duplica los arrays si no caben extra proyectiles más"""
+        needed = self.count + extra
+        capacity = len(self.x)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in self._arrays:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, x, y, direction, speed, projectile_type='fireball'):
+        """Lanza un proyectil (speed en píxeles por frame a 60 FPS, como los enemigos)"""
+        self.spawn_many([x], [y], [direction[0]], [direction[1]], speed, projectile_type)
+
+    def spawn_many(self, xs, ys, dir_x, dir_y, speed, projectile_type='fireball'):
+        """Lanza varios proyectiles del mismo tipo de una vez (patrones de jefe)"""
+        xs = np.asarray(xs, dtype=np.float32)
+        n = len(xs)
+        if n == 0:
+            return
+        self._ensure_capacity(n)
+        if projectile_type not in PROJECTILE_TYPES:
+            projectile_type = 'fireball'
+        kind = PROJECTILE_KINDS.index(projectile_type)
+        dir_x = np.asarray(dir_x, dtype=np.float32)
+        dir_y = np.asarray(dir_y, dtype=np.float32)
+
+        lo, hi = self.count, self.count + n
+        self.x[lo:hi] = xs
+        self.y[lo:hi] = ys
+        self.vx[lo:hi] = dir_x * speed * 60
+        self.vy[lo:hi] = dir_y * speed * 60
+        self.age[lo:hi] = 0.0
+        self.kind[lo:hi] = kind
+
+        # Fotograma base: dirección de la flecha, variante de roca o fase
+        # de la animación (para que no pulsen todos a la vez)
+        frames, _ = get_projectile_frames(projectile_type)
+        if projectile_type == 'arrow':
+            angle = np.arctan2(dir_y, dir_x)
+            base = np.round(angle / (2 * np.pi) * ARROW_DIRECTIONS).astype(np.int64) % ARROW_DIRECTIONS
+        else:
+            base = np.random.randint(0, len(frames), n)
+        self.frame_base[lo:hi] = base
+        self.count = hi
+
+    def _keep(self, mask):
+        """Compacta los arrays conservando solo los proyectiles de mask"""
+        kept = int(mask.sum())
+        if kept == self.count:
+            return
+        for name in self._arrays:
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][mask]
+        self.count = kept
+
+    def update(self, dt):
+        """Mueve todos los proyectiles y descarta los perdidos"""
+        n = self.count
+        self.last_dt = dt
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.age[:n] += dt
+
+        margin = PROJECTILE_CONFIG['cull_margin']
+        half = self.half_size[self.kind[:n]]
+        x, y = self.x[:n], self.y[:n]
+        alive = ((x + half >= -margin) & (x - half <= WIDTH + margin) &
+                 (y + half >= -margin) & (y - half <= HEIGHT + margin) &
+                 (self.age[:n] < PROJECTILE_CONFIG['max_lifetime']))
+        self._keep(alive)
+
+    def boxes(self):
+        """Cajas (N, 4) de los proyectiles al inicio y al final del último update"""
+        n = self.count
+        half = self.half_size[self.kind[:n]].astype(np.float64)
+        x, y = self.x[:n].astype(np.float64), self.y[:n].astype(np.float64)
+        curr = np.stack((x - half, y - half, x + half, y + half), axis=1)
+        shift = np.stack((self.vx[:n], self.vy[:n]), axis=1) * self.last_dt
+        prev = curr - np.tile(shift, 2)
+        return prev, curr
+
+    def remove(self, indices):
+        """Elimina los proyectiles indicados"""
+        if len(indices) == 0:
+            return
+        mask = np.ones(self.count, dtype=bool)
+        mask[indices] = False
+        self._keep(mask)
+
+    def check_collision(self, rect, prev_rect=None, mask=None):
+        """
+        Primer proyectil que toca rect durante el frame: se elimina y se
+        devuelve su daño (0 si ninguno)
+
+        La prueba es continua (swept): usa la posición anterior de cada
+        proyectil y prev_rect como la del jugador (rect si no se indica).
+        Con mask (máscara del jugador colocada en rect) los choques de cajas
+        se confirman píxel a píxel con el fotograma visible del proyectil.
+        """
+        if self.count == 0:
+            return 0
+        prev, curr = self.boxes()
+        a_prev, a_curr = rect_box(prev_rect or rect), rect_box(rect)
+        if mask is None:
+            hit, t_hit = swept_aabb(a_prev, a_curr, prev, curr)
+            if not hit.any():
+                return 0
+            first = int(np.flatnonzero(hit)[np.argmin(t_hit[hit])])
+        else:
+            first = None
+            candidates = hits_in_order(a_prev, a_curr, prev, curr)
+            frames = self.frame_indices() if candidates else None
+            for index in candidates:
+                kind_masks = get_projectile_masks(PROJECTILE_KINDS[self.kind[index]])
+                if masks_touch(mask, a_curr, kind_masks[frames[index]], curr[index]):
+                    first = index
+                    break
+            if first is None:
+                return 0
+        damage = int(self.damage[self.kind[first]])
+        self.remove([first])
+        return damage
+
+    def frame_indices(self):
+        """Fotograma visible de cada proyectil según su edad (o fijo si el tipo es estático)"""
+        n = self.count
+        kinds = self.kind[:n]
+        frame_index = self.frame_base[:n].astype(np.int64)
+        for k, name in enumerate(PROJECTILE_KINDS):
+            frames, fps = get_projectile_frames(name)
+            if fps:
+                of_kind = kinds == k
+                frame_index[of_kind] += (self.age[:n][of_kind] * fps).astype(np.int64)
+                frame_index[of_kind] %= len(frames)
+        return frame_index
+
+    def draw(self, screen):
+        """Dibuja todos los proyectiles con una sola llamada a blits()"""
+        n = self.count
+        if n == 0:
+            return
+        kinds = self.kind[:n]
+        half = self.half_size[kinds]
+        left = (self.x[:n] - half).astype(np.int32).tolist()
+        top = (self.y[:n] - half).astype(np.int32).tolist()
+
+        tables = [get_projectile_frames(name)[0] for name in PROJECTILE_KINDS]
+        frame_index = self.frame_indices()
+
+        screen.blits([(tables[k][f], (lx, ty)) for k, f, lx, ty in
+                      zip(kinds.tolist(), frame_index.tolist(), left, top)],
+                     doreturn=False)
+
+    def clear(self):
+        """Elimina todos los proyectiles"""
+        self.count = 0
@@ -4,13 +4,30 @@ import pygame
 import os
 import math
 from src.settings import (WIDTH, HEIGHT, FPS, BLACK, WHITE, GREEN, RED, YELLOW,
-                          UI_CONFIG, PURPLE, BLUE)
-from src.entities.player import Player
+                          UI_CONFIG, PURPLE, BLUE, JUDGEMENT_CONFIG, LOUDNESS_CONFIG,
+                          COLLISION_CONFIG, PARALLAX_LAYERS, SCENE_CONFIG)
+from src.entities.player import Player, sprite_sheet_paths
 from src.entities.obstacle_manager import ObstacleManager
 from src.entities.enemies import EnemyManager  # NUEVO
-from src.world.parallax import Parallax
+from src.world.parallax import Parallax, layer_path
 from src.core.audio_analyzer import AudioAnalyzer
+from src.core.beat_grid import TimingJudge
+from src.core.frame_pacer import FramePacer
+from src.core.scenes import Scene, SceneRuntime
+from src.core.timers import TimerHeap
+from src.core.assets import get_assets
+from src.core.loudness import playback_volume
 from src.effects.particles import ParticleSystem, BeatPulse
+from src.effects.transient import EffectPool
+from src.ui.waveform_view import get_waveform_surface
+
+def preload_game_assets():
+    """Decodifica en segundo plano las imágenes de la partida (capas y sprites)"""
+    base = os.path.dirname(os.path.dirname(__file__))
+    paths = [layer_path(base, folder, filename) for folder, filename, _ in PARALLAX_LAYERS]
+    paths.extend(sprite_sheet_paths().values())
+    return get_assets().preload(paths)
+
 
 class Game:
     """Juego mejorado con enemigos y mejor jugabilidad"""
@@ -18,7 +35,6 @@ class Game:
     def __init__(self, screen, clock, music_path=None, difficulty='normal'):
         self.screen = screen
         self.clock = clock
-        self.running = True
         self.difficulty = difficulty
         
         # Sistema de música y análisis
@@ -36,7 +52,8 @@ class Game:
                 
                 # Cargar y reproducir música
                 pygame.mixer.music.load(music_path)
-                pygame.mixer.music.set_volume(0.7)
+                self.applied_loudness = None
+                self._apply_music_gain()
                 
                 print(f"{'='*60}\n")
             except Exception as e:
@@ -48,26 +65,21 @@ class Game:
         
         # Capas de parallax
         diff_mult = self._get_difficulty_multiplier()
-        layers = [
-            ('sky', 'sky.png', 0.01 * diff_mult),
-            ('mountains', 'mountains.png', 0.03 * diff_mult),
-            ('mid', 'mid1.png', 0.05 * diff_mult),
-            ('mid', 'mid2.png', 0.07 * diff_mult),
-            ('foreground', 'fg1.png', 0.1 * diff_mult),
-            ('foreground', 'fg2.png', 0.13 * diff_mult)
-        ]
-        
         self.layers = []
-        for folder, filename, speed in layers:
+        for folder, filename, speed in PARALLAX_LAYERS:
             try:
-                parallax = Parallax(base, folder, filename, speed)
+                parallax = Parallax(base, folder, filename, speed * diff_mult)
                 self.layers.append(parallax)
             except Exception as e:
                 print(f"⚠️ No se pudo cargar capa {filename}: {e}")
         
+        # Temporizadores del juego (combo, power-ups, efectos): avanzan con el
+        # tiempo de juego y solo cuestan algo cuando vencen
+        self.timers = TimerHeap()
+        
         # Jugador
         self.ground_y = HEIGHT - 80
-        self.player = Player((200, self.ground_y - 50))
+        self.player = Player((200, self.ground_y - 50), timers=self.timers)
         
         # Sistema de obstáculos
         self.obstacle_manager = ObstacleManager(
@@ -87,13 +99,13 @@ class Game:
         # Efectos visuales
         self.particle_system = ParticleSystem()
         self.beat_pulse = BeatPulse(WIDTH // 2, HEIGHT // 2)
-        self.beat_indicators = []
+        self.beat_indicators = EffectPool(self.timers, UI_CONFIG['beat_indicator_slots'])
         
         # Estado del juego
         self.game_time = 0
         self.score = 0
         self.combo = 0
-        self.combo_timer = 0
+        self.combo_handle = None  # Vence y reinicia el combo
         self.combo_duration = 3.0  # NUEVO: Sistema de combo temporal
         self.max_combo = 0
         self.perfect_dodges = 0
@@ -101,17 +113,35 @@ class Game:
         self.health = 3
         self.max_health = 3
         self.game_over = False
+        self.run_result = None  # Resultado de la partida al terminar
         self.paused = False
         self.music_started = False
+        self.countdown_left = 0.0  # Segundos de cuenta atrás pendientes
+        
+        # Juicio de timing de las entradas contra el beat grid
+        self.timing_judge = TimingJudge(difficulty)
+        self.pending_judgements = {}  # Acción -> último juicio aún sin usar
         
         # Slow motion
         self.slow_motion_active = False
-        self.slow_motion_timer = 0
-        self.slow_motion_duration = 3.0
+        self.slow_motion_handle = None
+        self.slow_motion_duration = 3.0  # Segundos reales
+        self.slow_motion_scale = 0.5
+        
+        # Colisión precisa por máscaras de píxeles (tras el choque de cajas)
+        self.precise_collisions = COLLISION_CONFIG['pixel_masks']
         
         # UI
         self.setup_ui()
         
+        # Superficie de cámara reutilizada entre frames
+        self.camera_surface = pygame.Surface((WIDTH, HEIGHT))
+        
+        # Ritmo de frames: FPS completos jugando; en pausa/game over se
+        # reutiliza una instantánea congelada del último frame
+        self.pacer = FramePacer(self.clock, idle_after=False)
+        self.frozen_frame = None
+        
         # Sistema de cámara shake
         self.camera_shake = 0
         self.camera_offset_x = 0
@@ -122,10 +152,10 @@ class Game:
         self.beat_cooldown = 0.1
         
         # Sistema de feedback visual
-        self.feedback_messages = []
+        self.feedback_messages = EffectPool(self.timers, UI_CONFIG['feedback_slots'])
         
         # NUEVO: Mensajes flotantes de puntos
-        self.floating_scores = []
+        self.floating_scores = EffectPool(self.timers, UI_CONFIG['floating_score_slots'])
     
     def _get_difficulty_multiplier(self):
         """Obtiene multiplicador basado en dificultad"""
@@ -143,6 +173,7 @@ class Game:
         # Ajustar velocidad base
         self.obstacle_manager.base_speed *= speed_mult
         self.obstacle_manager.spawn_freq_mult = 1.0 / spawn_mult
+        self.enemy_manager.spawn_mult = spawn_mult
     
     def setup_ui(self):
         """Configura elementos de UI"""
@@ -163,6 +194,14 @@ class Game:
             UI_CONFIG['font_name'],
             14
         )
+        self.font_countdown = pygame.font.SysFont('arial', 120, bold=True)
+        self.countdown_label = None  # (texto, superficie, sombra) del número actual
+    
+    def _apply_music_gain(self):
+        """Ajusta el volumen a la sonoridad medida de la pista (si ya se conoce)"""
+        loudness = self.audio_analyzer.loudness
+        pygame.mixer.music.set_volume(playback_volume(loudness, LOUDNESS_CONFIG['game_volume']))
+        self.applied_loudness = loudness
     
     def start_music(self):
         """Inicia la reproducción de música"""
@@ -175,77 +214,225 @@ class Game:
                 print(f"Error iniciando música: {e}")
     
     def run(self):
-        """Loop principal del juego"""
-        # Pantalla de countdown
-        self.countdown()
-        
-        # Iniciar música
-        self.start_music()
-        
-        while self.running:
-            # Calcular delta time
-            dt = self.clock.tick(FPS) / 1000.0
+        """Juega la partida en su propio loop de escenas; retorna el resultado, 'menu' o 'quit'"""
+        return SceneRuntime(self.screen, self.clock).run(GameScene(self))
+    
+    def begin(self):
+        """Arranca la cuenta atrás; la música empieza al terminar"""
+        self.countdown_left = (SCENE_CONFIG['countdown_from'] * SCENE_CONFIG['countdown_step'] +
+                               SCENE_CONFIG['countdown_go'])
+    
+    def handle_events(self, events):
+        """
+        Procesa la entrada de un frame
+
+        Retorna 'menu' si se abandona durante la cuenta atrás y el dict de
+        resultados si se sale tras el game over.
+        """
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
             
-            # Aplicar slow motion
-            if self.slow_motion_active:
-                dt *= 0.5
+            # Durante la cuenta atrás solo se puede volver al menú
+            if self.countdown_left > 0:
+                if event.key == pygame.K_ESCAPE:
+                    return 'menu'
+                continue
             
-            # Eventos
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    return 'quit'
-                
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        if self.game_over:
-                            return 'menu'
-                        else:
-                            self.paused = not self.paused
-                    
-                    if event.key == pygame.K_r and self.game_over:
-                        return 'restart'
-                    
-                    if event.key == pygame.K_LSHIFT and not self.slow_motion_active:
-                        self.activate_slow_motion()
+            if event.key == pygame.K_ESCAPE:
+                if self.game_over:
+                    return self.run_result or 'menu'
+                else:
+                    self.paused = not self.paused
             
-            # Actualizar solo si no está pausado
-            if not self.paused and not self.game_over:
-                self.update(dt)
+            if event.key == pygame.K_r and self.game_over:
+                self.reset()
+                self.start_music()
+                return None
             
-            # Dibujar siempre
-            self.draw()
+            if event.key == pygame.K_LSHIFT and not self.slow_motion_active:
+                self.activate_slow_motion()
             
-            pygame.display.flip()
+            if event.key in (pygame.K_SPACE, pygame.K_UP, pygame.K_w):
+                self.register_input('jump')
+            elif event.key in (pygame.K_z, pygame.K_k):
+                self.register_input('attack')
+        return None
+    
+    def step(self, dt):
+        """Avanza un frame: cuenta atrás, partida o instantánea congelada"""
+        if self.countdown_left > 0:
+            self.countdown_left -= dt
+            if self.countdown_left <= 0:
+                self.start_music()
+            return
+        
+        # Aplicar slow motion
+        if self.slow_motion_active:
+            dt *= self.slow_motion_scale
         
-        return 'menu'
+        if self.paused or self.game_over:
+            # Congelado: la instantánea se presenta solo si se invalidó
+            if self.frozen_frame is None:
+                self._freeze_frame()
+        else:
+            if self.frozen_frame is not None:
+                self.frozen_frame = None
+                self.pacer.set_animated(True)
+            
+            self.update(dt)
+    
+    def render(self):
+        """Dibuja el frame actual en pantalla (sin flip)"""
+        if self.countdown_left > 0:
+            self.draw_countdown()
+        elif self.frozen_frame is not None:
+            self.screen.blit(self.frozen_frame, (0, 0))
+        else:
+            self.draw()
+    
+    def reset(self):
+        """
+        Reinicia la partida en el sitio para reintentar
+        
+        Conserva capas, sprites, fuentes y el análisis de audio: solo se
+        vacían las entidades y efectos y se vuelve al estado inicial.
+        """
+        # Los pools primero: liberan sus slots cancelando sus temporizadores
+        self.beat_indicators.clear()
+        self.feedback_messages.clear()
+        self.floating_scores.clear()
+        self.timers.clear()
+        
+        pygame.mixer.music.stop()
+        self.music_started = False
+        
+        self.player.reset((200, self.ground_y - 50))
+        self.obstacle_manager.reset()
+        self.enemy_manager.reset()
+        self.particle_system.clear()
+        self.beat_pulse = BeatPulse(WIDTH // 2, HEIGHT // 2)
+        for layer in self.layers:
+            layer.x = 0
+        
+        # Estado del juego
+        self.game_time = 0
+        self.score = 0
+        self.combo = 0
+        self.max_combo = 0
+        self.perfect_dodges = 0
+        self.enemies_killed = 0
+        self.health = self.max_health
+        self.game_over = False
+        self.run_result = None
+        self.paused = False
+        self.timing_judge.reset()
+        self.pending_judgements.clear()
+        self.slow_motion_active = False
+        self.camera_shake = 0
+        self.camera_offset_x = 0
+        self.camera_offset_y = 0
+        self.last_beat_time = 0
+        
+        # Volver a renderizar a FPS completos
+        self.frozen_frame = None
+        self.pacer.set_animated(True)
+        
+        print("🔄 Partida reiniciada")
+    
+    def close(self):
+        """Devuelve capas y sprites al gestor de assets (quedan en caché)"""
+        for layer in self.layers:
+            layer.release()
+        self.player.release_sprites()
+    
+    def _freeze_frame(self):
+        """Compone el último frame de juego con el overlay de pausa/game over"""
+        # La pantalla todavía contiene el último frame de juego presentado
+        if self.game_over:
+            self.draw_game_over_screen()
+        elif self.paused:
+            self.draw_pause_screen()
+        
+        self.frozen_frame = self.screen.copy()
+        self.pacer.set_animated(False)
+    
+    def get_audio_time(self):
+        """Posición de la canción según el reloj del mixer (segundos)"""
+        if self.music_started:
+            pos = pygame.mixer.music.get_pos()
+            if pos >= 0:
+                return pos / 1000.0
+        return self.game_time
+    
+    def register_input(self, action):
+        """Juzga una acción del jugador contra el beat más cercano"""
+        if self.paused or self.game_over or not self.audio_analyzer:
+            return None
+        
+        judgement = self.timing_judge.judge(
+            self.audio_analyzer.beat_grid,
+            self.get_audio_time()
+        )
+        if judgement is None:
+            return None
+        
+        judgement['action'] = action
+        judgement['game_time'] = self.game_time
+        self.pending_judgements[action] = judgement
+        
+        return judgement
+    
+    def _take_judgement(self, action):
+        """
+        Último juicio de action si aún cuenta; se consume al usarlo
+
+        Solo los juicios usados (un esquive o un golpe) entran en las
+        estadísticas: pulsar sin nada delante no suma fallos ni aciertos, y
+        un salto puntúa un único esquive.
+        """
+        judgement = self.pending_judgements.pop(action, None)
+        if judgement is None or self.game_time - judgement['game_time'] > JUDGEMENT_CONFIG['memory']:
+            return None
+        self.timing_judge.record(judgement)
+        return judgement
     
     def activate_slow_motion(self):
         """Activa cámara lenta temporal"""
         self.slow_motion_active = True
-        self.slow_motion_timer = 0
+        # El reloj de juego va más lento: la duración real se escala
+        self.timers.cancel(self.slow_motion_handle)
+        self.slow_motion_handle = self.timers.schedule(
+            self.slow_motion_duration * self.slow_motion_scale, self._end_slow_motion)
         self.show_feedback("SLOW MOTION!", (100, 200, 255), 1.5)
     
+    def _end_slow_motion(self):
+        self.slow_motion_active = False
+    
+    def _extend_combo(self):
+        """Suma uno al combo y reinicia su temporizador"""
+        self.combo += 1
+        self.max_combo = max(self.max_combo, self.combo)
+        if self.combo_handle is None:
+            self.combo_handle = self.timers.schedule(self.combo_duration, self._break_combo)
+        else:
+            self.timers.restart(self.combo_handle)
+    
+    def _break_combo(self):
+        self.combo = 0
+    
     def update(self, dt):
         """Actualiza la lógica del juego"""
         self.game_time += dt
         
-        # Actualizar combo timer
-        if self.combo > 0:
-            self.combo_timer -= dt
-            if self.combo_timer <= 0:
-                self.combo = 0
-        
-        # Actualizar slow motion
-        if self.slow_motion_active:
-            self.slow_motion_timer += dt / 0.5
-            if self.slow_motion_timer >= self.slow_motion_duration:
-                self.slow_motion_active = False
-                self.slow_motion_timer = 0
+        # Temporizadores vencidos (combo, cámara lenta, power-ups, efectos)
+        self.timers.advance(dt)
         
         # Detectar beats
         if self.audio_analyzer:
+            # La sonoridad llega al terminar el análisis en background
+            if self.audio_analyzer.loudness != self.applied_loudness:
+                self._apply_music_gain()
             if self.audio_analyzer.is_beat(self.game_time, 0.05):
                 if self.game_time - self.last_beat_time > self.beat_cooldown:
                     self.beat_pulse.trigger()
@@ -268,6 +455,8 @@ class Game:
         
         # Actualizar jugador
         keys = pygame.key.get_pressed()
+        # Posición anterior para la colisión continua (swept)
+        prev_player_rect = self.player.rect.copy()
         self.player.update(keys, self.ground_y, dt)
         
         # Actualizar obstáculos
@@ -285,16 +474,21 @@ class Game:
         attack_hitbox = self.player.get_attack_hitbox() if hasattr(self.player, 'get_attack_hitbox') else None
         if attack_hitbox:
             hit_enemies = self.enemy_manager.check_player_attack(attack_hitbox)
+            if hit_enemies:
+                self._take_judgement('attack')
             for enemy in hit_enemies:
                 self.on_enemy_killed(enemy)
         
         # Verificar colisión con power-ups
-        powerup_type = self.obstacle_manager.check_powerup_collision(self.player.rect)
+        player_mask = self.player.get_mask() if self.precise_collisions else None
+        powerup_type = self.obstacle_manager.check_powerup_collision(self.player.rect, prev_player_rect,
+                                                                     player_mask)
         if powerup_type:
             self.activate_powerup(powerup_type)
         
         # Verificar colisiones con obstáculos
-        collision = self.obstacle_manager.check_collision(self.player.rect)
+        collision = self.obstacle_manager.check_collision(self.player.rect, prev_player_rect,
+                                                          player_mask)
         if collision:
             if self.player.shield_active or self.player.invincible_active:
                 collision.kill()
@@ -310,7 +504,8 @@ class Game:
                 self.handle_collision(collision)
         
         # NUEVO: Verificar colisiones con proyectiles enemigos
-        projectile_damage = self.enemy_manager.check_collision(self.player.rect)
+        projectile_damage = self.enemy_manager.check_collision(self.player.rect, prev_player_rect,
+                                                               player_mask)
         if projectile_damage > 0 and not self.player.invulnerable:
             self.handle_collision(None)
         
@@ -320,9 +515,6 @@ class Game:
         # Actualizar efectos
         self.particle_system.update(dt)
         self.beat_pulse.update(dt)
-        self.update_beat_indicators(dt)
-        self.update_feedback_messages(dt)
-        self.update_floating_scores(dt)  # NUEVO
         
         # Generar estela de partículas
         if int(self.game_time * 60) % 3 == 0 and not self.player.on_ground:
@@ -334,10 +526,23 @@ class Game:
         
         # Verificar fin de música
         if self.music_path and not pygame.mixer.music.get_busy() and self.game_time > 1:
-            self.game_over = True
+            self.end_run(completed=True)
             self.show_feedback("¡COMPLETADO!", GREEN, 3.0)
             print(f"\n🎉 ¡Juego completado! Score: {self.score}")
     
+    def end_run(self, completed):
+        """Termina la partida y congela su resultado"""
+        self.game_over = True
+        self.run_result = {
+            'score': self.score,
+            'max_combo': self.max_combo,
+            'perfect_dodges': self.perfect_dodges,
+            'enemies_killed': self.enemies_killed,
+            'time': self.game_time,
+            'difficulty': self.difficulty,
+            'completed': completed,
+        }
+    
     def on_enemy_killed(self, enemy):
         """Maneja la muerte de un enemigo"""
         self.enemies_killed += 1
@@ -350,9 +555,7 @@ class Game:
         final_score = int(base_score * multiplier)
         
         self.score += final_score
-        self.combo += 1
-        self.combo_timer = self.combo_duration
-        self.max_combo = max(self.max_combo, self.combo)
+        self._extend_combo()
         
         # Efectos visuales
         self.particle_system.emit_explosion(
@@ -377,61 +580,15 @@ class Game:
     
     def add_floating_score(self, x, y, points):
         """Agrega número flotante de puntos"""
-        self.floating_scores.append({
-            'x': x,
-            'y': y,
-            'points': points,
-            'time': 0,
-            'duration': 1.5,
-            'velocity_y': -100
-        })
-    
-    def update_floating_scores(self, dt):
-        """Actualiza números flotantes"""
-        for score_msg in self.floating_scores[:]:
-            score_msg['time'] += dt
-            score_msg['y'] += score_msg['velocity_y'] * dt
-            score_msg['velocity_y'] += 50 * dt  # Gravedad
-            
-            if score_msg['time'] >= score_msg['duration']:
-                self.floating_scores.remove(score_msg)
+        self.floating_scores.spawn(1.5, x=x, y=y, points=points)
     
     def create_beat_indicator(self):
-        """Crea indicador visual de beat"""
-        self.beat_indicators.append({
-            'x': WIDTH,
-            'alpha': 255,
-            'size': 20
-        })
-    
-    def update_beat_indicators(self, dt):
-        """Actualiza indicadores de beat"""
-        for indicator in self.beat_indicators[:]:
-            indicator['x'] -= 300 * dt
-            indicator['alpha'] -= 500 * dt
-            indicator['size'] += 50 * dt
-            
-            if indicator['alpha'] <= 0:
-                self.beat_indicators.remove(indicator)
+        """Crea indicador visual de beat (se desvanece en 0.5 s)"""
+        self.beat_indicators.spawn(255 / 500)
     
     def show_feedback(self, message, color, duration=1.0):
         """Muestra mensaje de feedback"""
-        self.feedback_messages.append({
-            'text': message,
-            'color': color,
-            'time': 0,
-            'duration': duration,
-            'y': HEIGHT // 2 - 100
-        })
-    
-    def update_feedback_messages(self, dt):
-        """Actualiza mensajes de feedback"""
-        for msg in self.feedback_messages[:]:
-            msg['time'] += dt
-            msg['y'] -= 30 * dt
-            
-            if msg['time'] >= msg['duration']:
-                self.feedback_messages.remove(msg)
+        self.feedback_messages.spawn(duration, text=message, color=color, y=HEIGHT // 2 - 100)
     
     def activate_powerup(self, powerup_type):
         """Activa un power-up"""
@@ -473,7 +630,7 @@ class Game:
             print(f"💥 Colisión! HP: {self.health}")
             
             if self.health <= 0:
-                self.game_over = True
+                self.end_run(completed=False)
                 pygame.mixer.music.stop()
                 self.show_feedback("GAME OVER", RED, 3.0)
                 print(f"\n💀 Game Over! Score final: {self.score}")
@@ -484,13 +641,29 @@ class Game:
             if obstacle.rect.right < self.player.rect.left and not hasattr(obstacle, 'counted'):
                 points = obstacle.get_score()
                 
-                distance = abs(obstacle.rect.right - self.player.rect.left)
-                perfect_dodge = distance < 50
+                judgement = self._take_judgement('jump')
+                if judgement:
+                    # Esquive juzgado por el timing del salto respecto al beat
+                    grade = judgement['grade']
+                    points *= JUDGEMENT_CONFIG['score_mult'][grade]
+                    perfect_dodge = grade == 'perfect'
+                    
+                    if grade in ('great', 'good'):
+                        self.show_feedback(JUDGEMENT_CONFIG['labels'][grade],
+                                           JUDGEMENT_CONFIG['colors'][grade], 0.6)
+                elif not self.audio_analyzer:
+                    # Sin análisis musical: criterio por distancia
+                    distance = abs(obstacle.rect.right - self.player.rect.left)
+                    perfect_dodge = distance < UI_CONFIG['perfect_dodge_distance']
+                    if perfect_dodge:
+                        points *= 2
+                else:
+                    perfect_dodge = False
                 
                 if perfect_dodge:
                     self.perfect_dodges += 1
-                    points *= 2
-                    self.show_feedback("¡PERFECTO!", YELLOW, 0.8)
+                    self.show_feedback(JUDGEMENT_CONFIG['labels']['perfect'],
+                                       JUDGEMENT_CONFIG['colors']['perfect'], 0.8)
                     self.particle_system.emit_sparkle(
                         self.player.rect.centerx,
                         self.player.rect.centery
@@ -500,49 +673,39 @@ class Game:
                 final_points = int(points * combo_mult)
                 
                 self.score += final_points
-                self.combo += 1
-                self.combo_timer = self.combo_duration
-                self.max_combo = max(self.max_combo, self.combo)
+                self._extend_combo()
                 obstacle.counted = True
                 
                 if self.combo > 3:
                     self.show_feedback(f"COMBO x{self.combo}!", GREEN, 0.6)
     
-    def countdown(self):
-        """Cuenta regresiva antes de comenzar"""
-        countdown_font = pygame.font.SysFont('arial', 120, bold=True)
-        
-        for i in range(3, 0, -1):
-            self.screen.fill(BLACK)
-            
-            for layer in self.layers:
-                layer.draw(self.screen)
-            
-            text = countdown_font.render(str(i), True, YELLOW)
-            text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-            
-            shadow = countdown_font.render(str(i), True, BLACK)
-            shadow_rect = shadow.get_rect(center=(WIDTH // 2 + 5, HEIGHT // 2 + 5))
-            self.screen.blit(shadow, shadow_rect)
-            self.screen.blit(text, text_rect)
-            
-            pygame.display.flip()
-            pygame.time.wait(1000)
+    def draw_countdown(self):
+        """Cuenta regresiva sobre el fondo antes de comenzar"""
+        go_time = SCENE_CONFIG['countdown_go']
+        number = math.ceil((self.countdown_left - go_time) / SCENE_CONFIG['countdown_step'])
+        label = str(number) if number > 0 else "GO!"
+        
+        # El texto se renderiza solo al cambiar de número
+        if self.countdown_label is None or self.countdown_label[0] != label:
+            color = YELLOW if number > 0 else GREEN
+            text = self.font_countdown.render(label, True, color)
+            shadow = self.font_countdown.render(label, True, BLACK) if number > 0 else None
+            self.countdown_label = (label, text, shadow)
+        _, text, shadow = self.countdown_label
         
         self.screen.fill(BLACK)
         for layer in self.layers:
             layer.draw(self.screen)
         
-        text = countdown_font.render("GO!", True, GREEN)
+        if shadow is not None:
+            shadow_rect = shadow.get_rect(center=(WIDTH // 2 + 5, HEIGHT // 2 + 5))
+            self.screen.blit(shadow, shadow_rect)
         text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
         self.screen.blit(text, text_rect)
-        
-        pygame.display.flip()
-        pygame.time.wait(500)
     
     def draw(self):
         """Dibuja todo en pantalla"""
-        camera_surface = pygame.Surface((WIDTH, HEIGHT))
+        camera_surface = self.camera_surface
         camera_surface.fill(BLACK)
         
         # Fondo
@@ -554,12 +717,14 @@ class Game:
         
         # Indicadores de beat
         for indicator in self.beat_indicators:
-            alpha = int(indicator['alpha'])
-            size = int(indicator['size'])
+            age = self.beat_indicators.age(indicator)
+            alpha = max(0, int(255 - 500 * age))
+            size = int(20 + 50 * age)
+            x = WIDTH - 300 * age
             surf = pygame.Surface((size * 2, 10), pygame.SRCALPHA)
             color = (100, 200, 255, alpha)
             pygame.draw.rect(surf, color, (0, 0, size * 2, 10), border_radius=5)
-            camera_surface.blit(surf, (indicator['x'] - size, self.ground_y - 5))
+            camera_surface.blit(surf, (x - size, self.ground_y - 5))
         
         # Suelo
         pygame.draw.rect(camera_surface, (80, 60, 40),
@@ -581,11 +746,14 @@ class Game:
         
         # Números flotantes
         for score_msg in self.floating_scores:
-            alpha = int(255 * (1 - score_msg['time'] / score_msg['duration']))
+            # Sube a 100 px/s frenado por una gravedad de 50 px/s²
+            age = self.floating_scores.age(score_msg)
+            y = score_msg.y - 100 * age + 25 * age * age
+            alpha = int(255 * (1 - self.floating_scores.progress(score_msg)))
             font = pygame.font.SysFont('arial', 24, bold=True)
-            text = font.render(f"+{score_msg['points']}", True, YELLOW)
+            text = font.render(f"+{score_msg.points}", True, YELLOW)
             text.set_alpha(alpha)
-            text_rect = text.get_rect(center=(int(score_msg['x']), int(score_msg['y'])))
+            text_rect = text.get_rect(center=(int(score_msg.x), int(y)))
             camera_surface.blit(text, text_rect)
         
         # UI
@@ -596,13 +764,6 @@ class Game:
         
         # Aplicar camera shake
         self.screen.blit(camera_surface, (self.camera_offset_x, self.camera_offset_y))
-        
-        # Pantallas superpuestas
-        if self.paused:
-            self.draw_pause_screen()
-        
-        if self.game_over:
-            self.draw_game_over_screen()
     
     def draw_ui(self, surface):
         """Dibuja la UI"""
@@ -628,7 +789,7 @@ class Game:
             
             # Barra de tiempo de combo
             combo_bar_width = 100
-            combo_progress = self.combo_timer / self.combo_duration
+            combo_progress = self.timers.remaining(self.combo_handle) / self.combo_duration
             pygame.draw.rect(surface, (50, 50, 50),
                            (WIDTH // 2 - combo_bar_width // 2, 70, combo_bar_width, 6),
                            border_radius=3)
@@ -660,36 +821,45 @@ class Game:
         if self.audio_analyzer:
             progress = min(1.0, self.game_time / self.audio_analyzer.duration)
             bar_width = 300
-            bar_height = 8
             bar_x = WIDTH // 2 - bar_width // 2
-            bar_y = HEIGHT - 30
-            
-            pygame.draw.rect(surface, (50, 50, 50),
-                           (bar_x, bar_y, bar_width, bar_height),
-                           border_radius=4)
-            
             progress_width = int(bar_width * progress)
-            if progress_width > 0:
-                pygame.draw.rect(surface, (100, 200, 255),
-                               (bar_x, bar_y, progress_width, bar_height),
-                               border_radius=4)
+            waveform = self.audio_analyzer.waveform
             
-            for beat_time in self.audio_analyzer.beat_times:
-                if beat_time < self.audio_analyzer.duration:
-                    beat_x = bar_x + int((beat_time / self.audio_analyzer.duration) * bar_width)
-                    pygame.draw.line(surface, (255, 255, 255),
-                                   (beat_x, bar_y), (beat_x, bar_y + bar_height), 1)
+            if waveform is not None:
+                # Forma de onda renderizada una vez; el progreso solo recorta el blit
+                bar_height = 20
+                bar_y = HEIGHT - 40
+                key = self.audio_analyzer.content_hash
+                size = (bar_width, bar_height)
+                pending = get_waveform_surface(key, waveform, size, (80, 80, 80, 255), (120, 120, 120, 255))
+                played = get_waveform_surface(key, waveform, size, (100, 200, 255, 255), (200, 235, 255, 255))
+                surface.blit(pending, (bar_x, bar_y))
+                if progress_width > 0:
+                    surface.blit(played, (bar_x, bar_y), (0, 0, progress_width, bar_height))
+                pygame.draw.line(surface, (255, 255, 255),
+                               (bar_x + progress_width, bar_y), (bar_x + progress_width, bar_y + bar_height - 1), 1)
+            else:
+                bar_height = 8
+                bar_y = HEIGHT - 30
+                pygame.draw.rect(surface, (50, 50, 50),
+                               (bar_x, bar_y, bar_width, bar_height),
+                               border_radius=4)
+                if progress_width > 0:
+                    pygame.draw.rect(surface, (100, 200, 255),
+                                   (bar_x, bar_y, progress_width, bar_height),
+                                   border_radius=4)
     
     def draw_feedback_messages(self, surface):
         """Dibuja mensajes de feedback"""
         for msg in self.feedback_messages:
-            alpha = int(255 * (1 - msg['time'] / msg['duration']))
+            alpha = int(255 * (1 - self.feedback_messages.progress(msg)))
+            y = msg.y - 30 * self.feedback_messages.age(msg)
             font = pygame.font.SysFont('arial', 48, bold=True)
             
-            text = font.render(msg['text'], True, msg['color'])
+            text = font.render(msg.text, True, msg.color)
             text.set_alpha(alpha)
             
-            text_rect = text.get_rect(center=(WIDTH // 2, int(msg['y'])))
+            text_rect = text.get_rect(center=(WIDTH // 2, int(y)))
             surface.blit(text, text_rect)
     
     def draw_pause_screen(self):
@@ -742,6 +912,13 @@ class Game:
             f"Dificultad: {self.difficulty.title()}",
         ]
         
+        counts = self.timing_judge.counts
+        if any(counts.values()):
+            stats.append(
+                f"Timing: {counts['perfect']} P / {counts['great']} G / "
+                f"{counts['good']} B / {counts['miss']} M"
+            )
+        
         y_offset = HEIGHT // 2 - 50
         for stat    in stats:
             text = self.font_medium.render(stat, True, WHITE)
@@ -756,4 +933,43 @@ class Game:
         idx = int((time / self.duration) * len(self.rms_norm))
         idx = max(0, min(idx, len(self.rms_norm) - 1))
         
-        return self.rms_norm[idx]
\ No newline at end of file
+        return self.rms_norm[idx]
+
+
+class GameScene(Scene):
+    """
+    Escena de la partida: cuenta atrás, juego y pausa/game over
+
+    on_run recibe el resultado de cada partida terminada, también las que
+    se reintentan con R sin salir de la escena.
+    """
+    
+    def __init__(self, game, on_run=None):
+        super().__init__()
+        self.game = game
+        self.pacer = game.pacer
+        self.on_run = on_run
+        self.reported_run = None
+    
+    def enter(self, runtime):
+        super().enter(runtime)
+        self.game.begin()
+    
+    def exit(self):
+        self.game.close()
+    
+    def update(self, dt, events):
+        result = self.game.handle_events(events)
+        if result is not None:
+            self.finish(result)
+            return
+        self.game.step(dt)
+        
+        run = self.game.run_result
+        if run is not None and run is not self.reported_run:
+            self.reported_run = run
+            if self.on_run is not None:
+                self.on_run(run)
+    
+    def draw(self, screen):
+        self.game.render()
@@ -1,14 +1,21 @@
 # src/main.py - Sistema principal mejorado con todas las integraciones
 
+# Primero: marca el inicio del arranque. Los módulos pesados (juego,
+# análisis de audio, selectores, leaderboard) se importan al usarse
+from src.core.startup import lazy_import, mark, on_first_frame
+
 import pygame
 import sys
 import os
-from src.settings import WIDTH, HEIGHT, TITLE, FPS
-from src.ui.menu import run_menu
-from src.ui.music_selector import MusicSelector
-from src.ui.difficulty_selector import DifficultySelector
-from src.ui.leaderboard import LeaderboardScreen
-from src.game import Game
+from src.settings import (WIDTH, HEIGHT, TITLE, FPS, LOUDNESS_CONFIG, ASSET_CONFIG,
+                          STARTUP_CONFIG)
+from src.ui.menu import MainMenu
+from src.core.scenes import SceneRuntime
+from src.core.music_library import get_library
+from src.core.loudness import playback_volume
+from src.core.assets import get_assets
+
+mark('imports')
 
 class GameApplication:
     """Aplicación principal del juego con sistema completo de features"""
@@ -24,21 +31,27 @@ class GameApplication:
         
         # Cargar icono
         self._load_icon()
+        mark('ventana')
         
-        # Clock para FPS
+        # Con el menú ya visible: importar el juego y decodificar sus capas
+        # y sprites en segundo plano
+        on_first_frame(self._start_warm_up)
+        
+        # Clock para FPS y loop único de escenas
         self.clock = pygame.time.Clock()
+        self.runtime = SceneRuntime(self.screen, self.clock)
         
         # Estado
-        self.running = True
         self.current_music = None
         self.current_difficulty = 'normal'
         
-        # Sistema de leaderboard
-        self.leaderboard = LeaderboardScreen(self.screen, self.clock)
+        # Sistema de leaderboard (se construye al usarlo por primera vez)
+        self._leaderboard = None
         
         # Música de fondo del menú
         self.menu_music_playing = False
         self._setup_menu_music()
+        mark('música de menú')
         
         # Estadísticas de sesión
         self.session_stats = {
@@ -50,12 +63,43 @@ class GameApplication:
         
         self._print_welcome()
     
+    @property
+    def leaderboard(self):
+        """Pantalla de leaderboard (carga puntuaciones y fuentes en el primer uso)"""
+        if self._leaderboard is None:
+            LeaderboardScreen = lazy_import('src.ui.leaderboard').LeaderboardScreen
+            self._leaderboard = LeaderboardScreen(self.screen, self.clock)
+        return self._leaderboard
+    
+    def _start_warm_up(self):
+        """Importa en segundo plano lo que usará la partida y precarga sus assets"""
+        self.runtime.tasks.spawn(self._warm_up(), name='warm_up')
+    
+    def _warm_up(self):
+        """Tarea: imports en un thread, luego decodificar y convertir los assets de la partida"""
+        tasks = self.runtime.tasks
+        if STARTUP_CONFIG['warm_imports']:
+            yield tasks.run_in_thread(self._warm_imports, name='warm_imports')
+        if ASSET_CONFIG['preload']:
+            yield tasks.run_in_thread(self._preload_game_assets, name='preload')
+            # La conversión al formato de pantalla va en el thread principal, por frames
+            yield from get_assets().convert_pending()
+    
+    @staticmethod
+    def _warm_imports():
+        for name in ('src.game', 'src.ui.music_selector', 'src.ui.difficulty_selector'):
+            lazy_import(name)
+    
+    @staticmethod
+    def _preload_game_assets():
+        lazy_import('src.game').preload_game_assets()
+    
     def _load_icon(self):
         """Carga el icono de la aplicación"""
         icon_path = os.path.join('assets', 'ui', 'icon.png')
         if os.path.exists(icon_path):
             try:
-                icon = pygame.image.load(icon_path)
+                icon = get_assets().image(icon_path)
                 pygame.display.set_icon(icon)
             except:
                 pass
@@ -76,7 +120,7 @@ class GameApplication:
         if os.path.exists(menu_music_path):
             try:
                 pygame.mixer.music.load(menu_music_path)
-                pygame.mixer.music.set_volume(0.3)
+                pygame.mixer.music.set_volume(self._menu_volume(menu_music_path))
                 self.menu_music_path = menu_music_path
             except Exception as e:
                 print(f"⚠️ No se pudo cargar música de menú: {e}")
@@ -84,13 +128,19 @@ class GameApplication:
         else:
             self.menu_music_path = None
     
+    def _menu_volume(self, path):
+        """Volumen de menú normalizado con la sonoridad guardada en la biblioteca"""
+        track = get_library().get_track(path)
+        loudness = track['loudness'] if track else None
+        return playback_volume(loudness, LOUDNESS_CONFIG['menu_volume'])
+    
     def _play_menu_music(self):
         """Inicia música de fondo del menú"""
         if self.menu_music_path and not self.menu_music_playing:
             try:
                 pygame.mixer.music.load(self.menu_music_path)
                 pygame.mixer.music.play(-1, fade_ms=1000)
-                pygame.mixer.music.set_volume(0.3)
+                pygame.mixer.music.set_volume(self._menu_volume(self.menu_music_path))
                 self.menu_music_playing = True
             except:
                 pass
@@ -144,129 +194,130 @@ class GameApplication:
 """)
     
     def run(self):
-        """Loop principal de la aplicación"""
-        while self.running:
-            # Reproducir música de menú
-            self._play_menu_music()
-            
-            # Mostrar menú principal
-            action = run_menu(self.screen, self.clock)
-            
-            if action == 'quit':
-                self.running = False
-                break
-            
-            elif action == 'play':
-                self._stop_menu_music()
-                self._start_game_flow()
-            
-            elif action == 'leaderboard':
-                self._show_leaderboard()
-            
-            elif action == 'options':
-                self._show_options()
-        
+        """Loop principal de la aplicación (todas las pantallas en un solo loop)"""
+        self._play_menu_music()
+        self.runtime.run(MainMenu(on_action=self._on_menu_action))
         self._print_session_stats()
     
+    def _on_menu_action(self, action):
+        """Acción elegida en el menú principal"""
+        if action == 'quit':
+            self.runtime.quit()
+        
+        elif action == 'play':
+            self._stop_menu_music()
+            self._start_game_flow()
+        
+        elif action == 'leaderboard':
+            self._show_leaderboard()
+        
+        elif action == 'options':
+            self._show_options()
+    
+    def _back_to_menu(self):
+        """Retoma la música del menú si vuelve a estar arriba"""
+        if isinstance(self.runtime.top, MainMenu):
+            self._play_menu_music()
+    
     def _start_game_flow(self):
-        """Flujo completo de inicio de juego"""
-        # Mostrar selector de música
-        music_selector = MusicSelector(self.screen, self.clock)
-        selected_music, next_action = music_selector.run()
+        """Flujo completo de inicio de juego: música -> dificultad -> partida"""
+        MusicSelector = lazy_import('src.ui.music_selector').MusicSelector
+        self.runtime.push(MusicSelector(self.screen, self.clock),
+                          on_result=self._on_music_selected)
+    
+    def _on_music_selected(self, result):
+        selected_music, next_action = result
         
-        if next_action == 'quit':
-            self.running = False
+        if next_action == 'play' and selected_music:
+            # Mostrar selector de dificultad
+            DifficultySelector = lazy_import('src.ui.difficulty_selector').DifficultySelector
+            self.runtime.push(
+                DifficultySelector(self.screen, self.clock),
+                on_result=lambda difficulty: self._on_difficulty_selected(selected_music, difficulty)
+            )
+        else:
+            self._back_to_menu()
+    
+    def _on_difficulty_selected(self, selected_music, selected_difficulty):
+        if not selected_difficulty:
+            self._back_to_menu()
             return
         
-        elif next_action == 'menu':
-            return
+        self.current_music = selected_music
+        self.current_difficulty = selected_difficulty
         
-        elif next_action == 'play' and selected_music:
-            # Mostrar selector de dificultad
-            difficulty_selector = DifficultySelector(self.screen, self.clock)
-            selected_difficulty = difficulty_selector.run()
-            
-            if selected_difficulty:
-                self.current_music = selected_music
-                self.current_difficulty = selected_difficulty
-                
-                # Iniciar juego
-                game_result = self.play_game()
-                
-                # Procesar resultado
-                if game_result and game_result != 'quit':
-                    self._process_game_result(game_result)
+        # Iniciar juego
+        if not self.play_game():
+            self._back_to_menu()
     
     def play_game(self):
-        """Inicia una sesión de juego"""
+        """Abre una sesión de juego; retorna False si no se pudo iniciar"""
         if not self.current_music:
             print("❌ No hay música seleccionada")
-            return None
+            return False
         
-        # Crear y ejecutar el juego
-        game = Game(
+        # Crear el juego; la escena devuelve sus assets al cerrarse
+        game_module = lazy_import('src.game')
+        game = game_module.Game(
             self.screen, 
             self.clock, 
             self.current_music, 
             self.current_difficulty
         )
-        
-        result = game.run()
-        
-        # Actualizar estadísticas de sesión
-        if result and isinstance(result, dict):
-            self.session_stats['games_played'] += 1
-            self.session_stats['total_score'] += result.get('score', 0)
-            self.session_stats['best_score'] = max(
-                self.session_stats['best_score'],
-                result.get('score', 0)
-            )
-            self.session_stats['total_time'] += result.get('time', 0)
-        
-        # Procesar comandos especiales
-        if result == 'restart':
-            return self.play_game()
-        elif result == 'quit':
-            self.running = False
-            return 'quit'
-        
-        return result
+        self.runtime.push(game_module.GameScene(game, on_run=self._record_run),
+                          on_result=self._on_game_finished)
+        return True
     
-    def _process_game_result(self, result):
-        """Procesa resultados del juego y actualiza leaderboard"""
-        if not isinstance(result, dict):
+    def _on_game_finished(self, result):
+        """Cierre de la partida: tras un game over muestra la tabla de la canción"""
+        if isinstance(result, dict) and 'song_hash' in result:
+            self._show_leaderboard(
+                new_score=result,
+                player_name=result['player_name'],
+                song_hash=result['song_hash'],
+                difficulty=self.current_difficulty
+            )
             return
         
+        self._back_to_menu()
+    
+    def _record_run(self, result):
+        """Guarda cada partida terminada (también las que se reintentan con R)"""
+        # Actualizar estadísticas de sesión
         score = result.get('score', 0)
-        combo = result.get('max_combo', 0)
-        perfect_dodges = result.get('perfect_dodges', 0)
+        self.session_stats['games_played'] += 1
+        self.session_stats['total_score'] += score
+        self.session_stats['best_score'] = max(self.session_stats['best_score'], score)
+        self.session_stats['total_time'] += result.get('time', 0)
         
-        # Verificar si es high score
-        if self.leaderboard.leaderboard.is_high_score(score):
+        song_name = os.path.basename(self.current_music)
+        song_hash = self._song_hash(song_name)
+        player_name = self._get_player_name()
+        leaderboard = self.leaderboard.leaderboard
+        
+        # Toda partida queda en el historial; la posición sale del ranking
+        position = leaderboard.add_score(
+            player_name,
+            score,
+            self.current_difficulty,
+            result.get('max_combo', 0),
+            result.get('perfect_dodges', 0),
+            song_name,
+            song_hash
+        )
+        result.update(run_id=leaderboard.last_run_id, rank=position,
+                      song_hash=song_hash, player_name=player_name)
+        
+        if position <= leaderboard.max_entries:
             print(f"\n🎉 ¡NUEVO HIGH SCORE! {score} puntos")
-            
-            # Obtener nombre del jugador
-            player_name = self._get_player_name()
-            
-            # Agregar a leaderboard
-            song_name = os.path.basename(self.current_music)
-            position = self.leaderboard.leaderboard.add_score(
-                player_name,
-                score,
-                self.current_difficulty,
-                combo,
-                perfect_dodges,
-                song_name
-            )
-            
-            if position:
-                print(f"🏆 Posición en el ranking: #{position}")
-            
-            # Mostrar leaderboard
-            self._show_leaderboard(
-                new_score=result,
-                player_name=player_name
-            )
+        print(f"🏆 Posición en el ranking: #{position}")
+    
+    def _song_hash(self, song_name):
+        """Hash de contenido de la pista ya guardado en la biblioteca"""
+        track = get_library().get_track(self.current_music)
+        if track and track.get('content_hash'):
+            return track['content_hash']
+        return f"name:{song_name}"
     
     def _get_player_name(self):
         """Obtiene nombre del jugador mediante input visual"""
@@ -274,9 +325,11 @@ class GameApplication:
         # En una versión completa, implementar input de texto en pantalla
         return "Player"
     
-    def _show_leaderboard(self, new_score=None, player_name="Player"):
-        """Muestra la tabla de puntuaciones"""
-        self.leaderboard.show(new_score, player_name)
+    def _show_leaderboard(self, new_score=None, player_name="Player",
+                          song_hash=None, difficulty=None):
+        """Muestra la tabla de puntuaciones encima de la pantalla actual"""
+        self.runtime.push(self.leaderboard.open(new_score, player_name, song_hash, difficulty),
+                          on_result=lambda result: self._back_to_menu())
     
     def _show_options(self):
         """Muestra pantalla de opciones (placeholder)"""
@@ -299,6 +352,9 @@ class GameApplication:
 ║  Tiempo total: {self.session_stats['total_time']:.1f}s
 ╚════════════════════════════════════════════════════════════╝
 """)
+        
+        if ASSET_CONFIG['report']:
+            get_assets().print_report()
     
     def cleanup(self):
         """Limpia recursos antes de salir"""
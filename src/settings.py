@@ -10,6 +10,14 @@ HEIGHT = 720
 FPS = 60
 TITLE = 'Rayman Full Shinobi - Music Runner'
 
+# Ritmo de frames adaptativo (menús, pausa y game over)
+FRAME_PACING = {
+    'idle_fps': 15,  # Pantallas animadas sin interacción reciente
+    'static_fps': 10,  # Pantallas sin animación (solo se sondean eventos)
+    'idle_after': 2.0,  # Segundos sin entrada para considerar reposo
+    'input_boost': 0.25,  # Segundos a FPS completos tras una entrada
+}
+
 # ============================================
 # FÍSICA MEJORADA
 # ============================================
@@ -51,6 +59,40 @@ MUSIC_DIR = os.path.join(ASSETS_DIR, 'music')
 PLAYER_DIR = os.path.join(ASSETS_DIR, 'player')
 WORLD_DIR = os.path.join(ASSETS_DIR, 'world')
 
+# Arranque: los módulos pesados se importan al usarse por primera vez
+STARTUP_CONFIG = {
+    'first_frame_budget_ms': 500,  # Tiempo máximo hasta ver el menú
+    'warm_imports': True,  # Importar el juego en segundo plano tras el primer frame
+    'report': False,  # Informe de fases e imports (también con --startup-report)
+}
+
+# Escenas: un único loop de frames para menús, selectores y partida
+SCENE_CONFIG = {
+    'task_budget_ms': 4,  # Tiempo por frame para tareas de fondo
+    'countdown_from': 3,  # Cuenta atrás antes de empezar la partida
+    'countdown_step': 1.0,  # Segundos por número
+    'countdown_go': 0.5,  # Segundos que se muestra "GO!"
+}
+
+# Gestor de assets: superficies convertidas compartidas entre partidas y
+# pantallas. Las que nadie usa se liberan (las menos recientes primero)
+# cuando se supera el presupuesto
+ASSET_CONFIG = {
+    'budget_mb': 192,
+    'preload': True,  # Decodificar en un thread mientras se está en los menús
+    'report': False,  # Imprimir tiempo de carga y tamaño por asset al salir
+}
+
+# Capas de parallax del juego: (carpeta, archivo, velocidad base)
+PARALLAX_LAYERS = [
+    ('sky', 'sky.png', 0.01),
+    ('mountains', 'mountains.png', 0.03),
+    ('mid', 'mid1.png', 0.05),
+    ('mid', 'mid2.png', 0.07),
+    ('foreground', 'fg1.png', 0.1),
+    ('foreground', 'fg2.png', 0.13),
+]
+
 # ============================================
 # CONFIGURACIÓN DE MÚSICA
 # ============================================
@@ -93,18 +135,144 @@ OBSTACLE_TYPES = {
     },
 }
 
+# Proyectiles enemigos (size = radio del sprite en píxeles)
+PROJECTILE_TYPES = {
+    'fireball': {'size': 16, 'color': (255, 100, 0), 'damage': 1},
+    'arrow': {'size': 20, 'color': (150, 150, 150), 'damage': 1},
+    'rock': {'size': 18, 'color': (100, 100, 100), 'damage': 1},
+    'magic': {'size': 14, 'color': (200, 0, 255), 'damage': 1},
+}
+
+PROJECTILE_CONFIG = {
+    'max_lifetime': 12.0,  # Segundos antes de descartar un proyectil perdido
+    'cull_margin': 50,  # Píxeles fuera de pantalla antes de eliminarlo
+    'initial_capacity': 256,  # Tamaño inicial de los arrays (crecen al doble)
+}
+
+# Enemigos (fire_beats = beats entre disparos, projectile_speed en px/frame a 60 FPS)
+ENEMY_TYPES = {
+    'turret': {'width': 50, 'height': 50, 'color': (100, 100, 100), 'max_health': 2,
+               'fire_beats': 2, 'projectile_type': 'fireball', 'projectile_speed': 8},
+    'archer': {'width': 40, 'height': 60, 'color': (50, 150, 50), 'max_health': 1,
+               'fire_beats': 4, 'projectile_type': 'arrow', 'projectile_speed': 10,
+               'move_pattern': 'patrol'},
+    'mage': {'width': 45, 'height': 65, 'color': (150, 50, 200), 'max_health': 1,
+             'fire_beats': 3, 'projectile_type': 'magic', 'projectile_speed': 7,
+             'move_pattern': 'float'},
+    'bomber': {'width': 55, 'height': 55, 'color': (200, 50, 50), 'max_health': 3,
+               'fire_beats': 4, 'projectile_type': 'rock', 'projectile_speed': 6,
+               'shoots_arc': True},
+}
+
+ENEMY_CONFIG = {
+    'speed': 3,  # Scroll en px/frame a 60 FPS
+    'detection_range': 400,
+    'despawn_x': -200,
+    'shooting_pose': 0.3,  # Segundos que se mantiene la pose de disparo
+    'initial_capacity': 16,  # Por tipo (crece al doble)
+}
+
+# Oleadas de enemigos programadas sobre la rejilla de compases
+ENEMY_WAVES = {
+    'warmup_bars': 1,  # Compases iniciales sin enemigos
+    'base_chance': 0.15,  # Probabilidad de oleada en cada compás...
+    'intensity_chance': 0.4,  # ...más esto por la intensidad del downbeat
+    'max_wave': 3,  # Enemigos por oleada como máximo (uno por beat)
+    'type_weights': {'turret': 3, 'archer': 2, 'mage': 2, 'bomber': 1},
+    'fallback_bpm': 120,  # Rejilla sin análisis de audio
+    'fallback_duration': 300.0,
+}
+
+# Colisiones precisas: tras el choque de cajas se comparan las máscaras de
+# píxeles de los sprites (precalculadas por fotograma)
+COLLISION_CONFIG = {
+    'pixel_masks': False,
+    'mask_threshold': 127,  # Alfa mínimo que cuenta como sólido (ignora resplandores)
+    'flying_mask_phases': 8,  # Máscaras del flotar de los voladores
+}
+
 # ============================================
 # CONFIGURACIÓN DE ANÁLISIS DE AUDIO
 # ============================================
 AUDIO_ANALYSIS = {
-    'beat_threshold': 0.3,
-    'energy_threshold': 0.5,
+    'sample_rate': 22050,
+    'n_fft': 2048,
     'hop_length': 512,
+    'timbre_bands': 16,  # Bandas logarítmicas para el análisis de estructura
     'tempo_range': (60, 200),
-    # Configuración de sincronización
-    'sync_tolerance': 0.1,  # 100ms de tolerancia para beats
-    'beat_spawn_probability': 0.7,  # 70% de beats spawn obstáculos
-    'intensity_spawn_boost': 0.3,  # Boost basado en intensidad
+}
+
+# Caché de audio decodificado (PCM mono float32 a sample_rate)
+PCM_CACHE = {
+    'dir': 'data/pcm',
+    'max_mb': 1024,  # Límite en disco; se borran primero las pistas menos usadas
+}
+
+# Sonoridad y normalización de volumen (ITU-R BS.1770)
+LOUDNESS_CONFIG = {
+    'target_lufs': -14.0,  # Sonoridad de referencia a la que se normaliza cada pista
+    'game_volume': 0.7,  # Volumen del juego para una pista ya en la referencia
+    'menu_volume': 0.3,  # Volumen de la música de menú en la referencia
+    'momentary_window': 0.4,  # Ventana de la sonoridad momentánea (segundos)
+    'intensity_headroom': 3.0,  # LU sobre la integrada que equivalen a intensidad 1
+}
+
+# Caché del análisis por etapas (features -> tempo -> estructura -> chart)
+ANALYSIS_CACHE = {
+    'dir': 'data/cache/analysis',
+}
+
+# Formas de onda (pirámide de picos min/max/RMS por pista)
+WAVEFORM_CONFIG = {
+    'dir': 'data/waveforms',
+    'block_size': 512,   # Muestras por columna del nivel más fino
+    'min_columns': 64,   # Se dejan de crear niveles por debajo de este ancho
+}
+
+# Bandas para detección de onsets (Hz) y obstáculo que genera cada una
+ONSET_BANDS = {
+    'low': {'range': (20, 150), 'obstacle': 'spike'},        # Bombo
+    'mid': {'range': (150, 4000), 'obstacle': 'box'},        # Caja / voces
+    'high': {'range': (4000, 11025), 'obstacle': 'flying'},  # Hi-hats
+}
+
+ONSET_CONFIG = {
+    'threshold_window': 0.5,  # Ventana de la media móvil (segundos)
+    'threshold_delta': 0.05,  # Margen sobre la media (envolvente normalizada)
+    'min_gap': 0.1,  # Separación mínima entre onsets de una banda
+    'match_window': 0.07,  # Distancia máxima onset-beat para elegir banda
+}
+
+# Seguimiento de beats y mapa de tempo
+TEMPO_CONFIG = {
+    'window': 8.0,  # Ventana para estimar el tempo local (segundos)
+    'hop': 1.0,  # Salto entre estimaciones de tempo local (segundos)
+    'prior_bpm': 120,  # Centro del prior para resolver octavas de tempo
+    'prior_width': 1.0,  # Ancho del prior (octavas)
+    'change_penalty': 3.0,  # Coste por octava de cambiar de tempo entre ventanas
+    'tightness': 100,  # Penalización de la programación dinámica a desviarse del periodo
+    'smoothing_beats': 8,  # Mediana móvil del tempo por beat
+    'change_tolerance': 0.04,  # Cambio relativo de BPM que abre un nuevo segmento
+}
+
+# Compases y frases
+BAR_CONFIG = {
+    'beats_per_bar': 4,
+    'phrase_lengths': (4, 8, 16),  # Agrupaciones de compases disponibles
+    'spawn_phrase_bars': 8,  # Frase usada por el generador de obstáculos
+    'phrase_pattern_beats': (0, 2),  # Beats de cada frase con obstáculo garantizado
+    'downbeat_spawn_boost': 0.15,  # Probabilidad extra de spawn en el "uno"
+}
+
+# Segmentación estructural (unidades en beats salvo que se indique)
+STRUCTURE_CONFIG = {
+    'novelty_half_width': 8,  # Mitad del kernel de novedad
+    'novelty_delta': 0.1,  # Margen sobre la media para aceptar un límite
+    'min_segment_beats': 16,  # Longitud mínima de un segmento
+    'drop_window': 4,  # Beats antes/después comparados para un drop
+    'drop_threshold': 0.2,  # Salto mínimo de energía (0-1)
+    'build_window': 8,  # Duración de la subida de un build
+    'build_threshold': 0.15,  # Subida mínima de energía/brillo (0-1)
 }
 
 # ============================================
@@ -137,6 +305,31 @@ DIFFICULTY_LEVELS = {
     },
 }
 
+# ============================================
+# JUICIO DE TIMING (BEAT GRID)
+# ============================================
+# Ventanas en segundos (distancia absoluta al beat más cercano).
+# Fuera de la ventana 'good' la acción se considera 'miss'.
+TIMING_WINDOWS = {
+    'easy': {'perfect': 0.060, 'great': 0.110, 'good': 0.170},
+    'normal': {'perfect': 0.045, 'great': 0.090, 'good': 0.140},
+    'hard': {'perfect': 0.035, 'great': 0.070, 'good': 0.110},
+    'insane': {'perfect': 0.025, 'great': 0.050, 'good': 0.085},
+}
+
+JUDGEMENT_CONFIG = {
+    'input_offset': 0.0,  # Latencia de audio/entrada a compensar (segundos)
+    'memory': 0.8,  # Segundos que un salto cuenta para el siguiente esquive
+    'score_mult': {'perfect': 2.0, 'great': 1.5, 'good': 1.0, 'miss': 1.0},
+    'labels': {'perfect': '¡PERFECTO!', 'great': '¡GENIAL!', 'good': 'BIEN', 'miss': 'FUERA DE RITMO'},
+    'colors': {
+        'perfect': YELLOW,
+        'great': CYAN,
+        'good': GREEN,
+        'miss': (150, 150, 150),
+    },
+}
+
 # ============================================
 # UI
 # ============================================
@@ -151,6 +344,11 @@ UI_CONFIG = {
     'damage_flash_duration': 0.2,
     'combo_fade_time': 2.0,
     'perfect_dodge_distance': 50,  # Píxeles para esquiva perfecta
+    
+    # Slots reutilizables para efectos de vida corta (se recicla el más antiguo)
+    'feedback_slots': 8,
+    'floating_score_slots': 32,
+    'beat_indicator_slots': 16,
 }
 
 # ============================================
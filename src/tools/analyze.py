@@ -0,0 +1,171 @@
+# src/tools/analyze.py - Análisis por lotes desde la línea de comandos
+
+"""
+Analiza archivos o carpetas sin abrir el juego (no necesita pantalla ni mixer)
+y deja calientes los cachés de PCM, formas de onda y la biblioteca.
+
+Uso:
+    python -m src.tools.analyze [rutas ...] [--jobs N] [--force] [--output informe.json]
+
+Sin rutas se analiza la carpeta de música del juego. El informe JSON (por
+stdout o en --output) incluye los tiempos de cada archivo y el rendimiento
+total en segundos de audio analizados por segundo real. Solo se recalculan
+las etapas cuyos parámetros cambiaron (ver src/core/analysis_cache.py), así
+que re-ajustar umbrales sobre toda la biblioteca no repite la STFT.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.settings import MUSIC_DIR, SUPPORTED_AUDIO_FORMATS
+from src.core.audio_analyzer import AudioAnalyzer
+from src.core.audio_cache import compute_file_hash
+from src.core.music_library import get_library, STATUS_ANALYZED
+from src.core.analysis_cache import get_analysis_cache
+from src.core.waveform import peaks_path
+
+
+def collect_audio_files(paths):
+    """Expande carpetas (recursivamente) a la lista de archivos soportados"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in names
+                             if os.path.splitext(name)[1].lower() in SUPPORTED_AUDIO_FORMATS)
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"⚠️ No existe: {path}", file=sys.stderr)
+
+    # Sin duplicados y en orden estable
+    return sorted({os.path.abspath(path) for path in files})
+
+
+def is_cached(path, track):
+    """Si la pista ya tiene todas las etapas (con los parámetros actuales) y forma de onda"""
+    if track is not None and track['analysis_status'] != STATUS_ANALYZED:
+        return False
+    content_hash = track['content_hash'] if track else compute_file_hash(path)
+    cache = get_analysis_cache()
+    chart_key = cache.stage_keys(content_hash)['chart']
+    return cache.has('chart', chart_key) and peaks_path(content_hash).exists()
+
+
+def analyze_file(path):
+    """Analiza un archivo (se ejecuta en un proceso del pool)"""
+    start = time.perf_counter()
+    analyzer = AudioAnalyzer(path, verbose=False, background=False)
+    failed = analyzer.error is not None
+    return {
+        'path': path,
+        'status': 'failed' if failed else 'analyzed',
+        'error': analyzer.error,
+        'duration': None if failed else round(analyzer.duration, 3),
+        'tempo': None if failed else analyzer.tempo,
+        'seconds': round(time.perf_counter() - start, 4),
+        'stages': {stage: round(seconds, 4) for stage, seconds in analyzer.timings.items()},
+    }
+
+
+def run_batch(paths, jobs=1, force=False, progress=None):
+    """
+    Analiza una lista de archivos con un pool de procesos
+
+    Returns:
+        dict con 'files' (un resultado por archivo) y 'summary'
+    """
+    wall_start = time.perf_counter()
+
+    # Hashes de la biblioteca al día antes de decidir qué está en caché
+    library = get_library()
+    library.scan()
+
+    results = []
+    pending = []
+    for path in paths:
+        if not force and is_cached(path, library.get_track(path)):
+            results.append({'path': path, 'status': 'skipped'})
+        else:
+            pending.append(path)
+
+    def report(result):
+        results.append(result)
+        if progress:
+            progress(result)
+
+    if jobs <= 1 or len(pending) <= 1:
+        for path in pending:
+            report(analyze_file(path))
+    else:
+        # 'spawn': los procesos no heredan la conexión SQLite del padre
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+            futures = {pool.submit(analyze_file, path): path for path in pending}
+            for future in as_completed(futures):
+                try:
+                    report(future.result())
+                except Exception as e:
+                    report({'path': futures[future], 'status': 'failed', 'error': str(e)})
+
+    wall_seconds = time.perf_counter() - wall_start
+    analyzed = [result for result in results if result['status'] == 'analyzed']
+    audio_seconds = sum(result['duration'] for result in analyzed)
+
+    results.sort(key=lambda result: result['path'])
+    return {
+        'jobs': jobs,
+        'files': results,
+        'summary': {
+            'analyzed': len(analyzed),
+            'skipped': sum(1 for result in results if result['status'] == 'skipped'),
+            'failed': sum(1 for result in results if result['status'] == 'failed'),
+            'audio_seconds': round(audio_seconds, 3),
+            'wall_seconds': round(wall_seconds, 3),
+            'throughput': round(audio_seconds / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        },
+    }
+
+
+def _print_progress(result):
+    """Una línea por archivo terminado (por stderr, stdout queda para el JSON)"""
+    name = os.path.basename(result['path'])
+    if result['status'] == 'analyzed':
+        print(f"✅ {name}: {result['duration']:.0f}s de audio en {result['seconds']:.2f}s",
+              file=sys.stderr)
+    else:
+        print(f"⚠️ {name}: {result.get('error')}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analiza canciones por lotes y calienta los cachés")
+    parser.add_argument('paths', nargs='*', default=[MUSIC_DIR],
+                        help="archivos o carpetas (por defecto la carpeta de música)")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="procesos en paralelo (0 = uno por CPU)")
+    parser.add_argument('--force', action='store_true',
+                        help="re-analizar aunque ya esté en caché")
+    parser.add_argument('--output', '-o', help="escribir el informe JSON en un archivo")
+    parser.add_argument('--quiet', '-q', action='store_true', help="sin progreso por stderr")
+    args = parser.parse_args(argv)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    paths = collect_audio_files(args.paths)
+    report = run_batch(paths, jobs, args.force, None if args.quiet else _print_progress)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    return 1 if report['summary']['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,375 @@
+# src/tools/benchmark.py - Corpus sintético con verdad conocida y benchmark del análisis
+
+"""
+Genera audio sintético con NumPy (clicks, baterías con cambios de tempo,
+estructura intro/build/drop y casos límite de silencio y ruido), lo pasa por
+el pipeline de análisis y compara con la verdad conocida.
+
+Uso:
+    python -m src.tools.benchmark [--output informe.txt] [--json] [--repeat N]
+
+El informe de texto tiene una línea por caso con columnas fijas y valores
+redondeados, para poder comparar con diff entre commits: una regresión de
+precisión y una de velocidad aparecen juntas.
+"""
+
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from src.settings import AUDIO_ANALYSIS
+from src.core.audio_features import extract_features
+from src.core.tempo_map import build_tempo_map
+from src.core.structure import analyze_structure
+from src.core.audio_analyzer import normalized_curves
+
+SR = AUDIO_ANALYSIS['sample_rate']
+
+# Tolerancias de evaluación
+BEAT_TOLERANCE = 0.07  # Segundos (criterio habitual de F-measure de beats)
+TEMPO_TOLERANCE = 0.04  # Error relativo para contar el tempo como correcto
+EVENT_TOLERANCE = 2.0  # Segundos para aceptar un drop/build detectado
+
+
+# ============================================
+# SÍNTESIS
+# ============================================
+
+def beats_from_tempo(segments, start=0.0):
+    """
+    Tiempos de beat para tramos de tempo
+
+    Args:
+        segments: lista de (duración en segundos, bpm inicial, bpm final);
+            el tempo varía linealmente dentro del tramo
+    """
+    beats = []
+    t = start
+    offset = start
+    for duration, bpm_start, bpm_end in segments:
+        end = offset + duration
+        while t < end:
+            beats.append(t)
+            progress = (t - offset) / duration
+            t += 60.0 / (bpm_start + (bpm_end - bpm_start) * progress)
+        offset = end
+    return np.asarray(beats)
+
+
+def _place(y, times, sound, gain=1.0):
+    """Suma sound en cada tiempo de times"""
+    for t in times:
+        i = int(t * SR)
+        if i >= len(y):
+            break
+        n = min(len(sound), len(y) - i)
+        y[i:i + n] += gain * sound[:n]
+
+
+def _click():
+    n = int(0.015 * SR)
+    t = np.arange(n) / SR
+    return (np.exp(-t * 300) * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+
+
+def _kick():
+    n = int(0.2 * SR)
+    t = np.arange(n) / SR
+    freq = 50 + 100 * np.exp(-t * 30)  # Caída de tono típica del bombo
+    phase = 2 * np.pi * np.cumsum(freq) / SR
+    return (np.exp(-t * 18) * np.sin(phase)).astype(np.float32)
+
+
+def _snare(rng):
+    n = int(0.15 * SR)
+    t = np.arange(n) / SR
+    body = 0.4 * np.sin(2 * np.pi * 190 * t)
+    return (np.exp(-t * 25) * (body + rng.standard_normal(n))).astype(np.float32) * 0.5
+
+
+def _hat(rng):
+    n = int(0.04 * SR)
+    noise = np.diff(rng.standard_normal(n + 1))  # Diferencia = ruido agudo
+    return (np.exp(-np.arange(n) / SR * 120) * noise).astype(np.float32) * 0.2
+
+
+def _drum_loop(beats, duration, rng, kick=True, snare=True, hats=True, gain=1.0):
+    """Bombo en cada beat, caja en 2 y 4, hi-hats en corcheas"""
+    y = np.zeros(int(duration * SR), dtype=np.float32)
+    if kick:
+        _place(y, beats, _kick(), 0.8 * gain)
+    if snare:
+        _place(y, beats[1::2], _snare(rng), 0.6 * gain)
+    if hats:
+        eighths = np.sort(np.concatenate((beats, beats[:-1] + np.diff(beats) / 2)))
+        _place(y, eighths, _hat(rng), 0.5 * gain)
+    return y
+
+
+def _tone(duration, freq, gain):
+    t = np.arange(int(duration * SR)) / SR
+    return (gain * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def build_corpus(seed=0):
+    """
+    Casos del benchmark con su verdad
+
+    Returns:
+        lista de dicts con name, audio, beats (o None si no hay pulso),
+        drops y builds esperados
+    """
+    rng = np.random.default_rng(seed)
+    cases = []
+
+    # Clicks a tempo fijo
+    beats = beats_from_tempo([(60, 120, 120)], start=0.5)
+    y = np.zeros(int(61 * SR), dtype=np.float32)
+    _place(y, beats, _click())
+    cases.append({'name': 'click_120', 'audio': y, 'beats': beats})
+
+    # Clicks con cambio brusco de tempo
+    beats = beats_from_tempo([(30, 100, 100), (30, 140, 140)], start=1.0)
+    y = np.zeros(int(62 * SR), dtype=np.float32)
+    _place(y, beats, _click())
+    cases.append({'name': 'click_100_140', 'audio': y, 'beats': beats})
+
+    # Batería con tempo que acelera gradualmente
+    beats = beats_from_tempo([(60, 110, 130)], start=0.5)
+    y = _drum_loop(beats, 62, rng)
+    cases.append({'name': 'drums_ramp_110_130', 'audio': y, 'beats': beats})
+
+    # Batería con dos cambios de tempo
+    beats = beats_from_tempo([(25, 90, 90), (25, 120, 120), (25, 105, 105)], start=0.5)
+    y = _drum_loop(beats, 77, rng)
+    cases.append({'name': 'drums_steps_90_120_105', 'audio': y, 'beats': beats})
+
+    # Silencio al principio y al final (no debe haber beats ahí)
+    beats = beats_from_tempo([(30, 128, 128)], start=10.0)
+    y = np.zeros(int(50 * SR), dtype=np.float32)
+    _place(y, beats, _kick(), 0.8)
+    cases.append({'name': 'kicks_silence_pad', 'audio': y, 'beats': beats})
+
+    # Estructura: intro suave, build que sube, drop con todo, outro
+    bpm = 128
+    beats = beats_from_tempo([(120, bpm, bpm)])
+    duration = 120.0
+    y = np.zeros(int(duration * SR), dtype=np.float32)
+    t = np.arange(len(y)) / SR
+    y += _tone(duration, 220, 0.05) * (t < 32)
+    y += _drum_loop(beats, duration, rng, kick=False, snare=False, gain=0.6) * (t < 32)
+    ramp = np.clip((t - 32) / 16, 0, 1) * ((t >= 32) & (t < 48))
+    y += _drum_loop(beats, duration, rng, kick=False, gain=0.6) * ramp
+    y += (ramp * 0.04 * rng.standard_normal(len(y))).astype(np.float32)
+    drop = (t >= 48) & (t < 96)
+    y += _drum_loop(beats, duration, rng, gain=1.0) * drop
+    y += _tone(duration, 55, 0.3) * drop
+    y += _drum_loop(beats, duration, rng, kick=False, snare=False, gain=0.6) * (t >= 96)
+    y += _tone(duration, 440, 0.05) * (t >= 96)
+    cases.append({'name': 'structure_intro_build_drop', 'audio': y, 'beats': beats,
+                  'drops': [48.0], 'builds': [32.0]})
+
+    # Casos límite: sin pulso
+    cases.append({'name': 'silence', 'audio': np.zeros(int(30 * SR), dtype=np.float32),
+                  'beats': None})
+    cases.append({'name': 'white_noise', 'beats': None,
+                  'audio': (0.1 * rng.standard_normal(int(30 * SR))).astype(np.float32)})
+
+    for case in cases:
+        case.setdefault('drops', [])
+        case.setdefault('builds', [])
+        case['audio'] = np.clip(case['audio'], -1.0, 1.0).astype(np.float32)
+    return cases
+
+
+# ============================================
+# MÉTRICAS
+# ============================================
+
+def match_events(reference, estimated, tolerance):
+    """Número de parejas referencia-estimado a menos de tolerance (cada una se usa una vez)"""
+    reference = np.sort(np.asarray(reference, dtype=np.float64))
+    estimated = np.sort(np.asarray(estimated, dtype=np.float64))
+    hits = 0
+    j = 0
+    for ref in reference:
+        while j < len(estimated) and estimated[j] < ref - tolerance:
+            j += 1
+        if j < len(estimated) and abs(estimated[j] - ref) <= tolerance:
+            hits += 1
+            j += 1
+    return hits
+
+
+def f_measure(reference, estimated, tolerance):
+    """F-measure de eventos con tolerancia (1.0 si ambos están vacíos)"""
+    if len(reference) == 0 and len(estimated) == 0:
+        return 1.0
+    if len(reference) == 0 or len(estimated) == 0:
+        return 0.0
+    hits = match_events(reference, estimated, tolerance)
+    precision = hits / len(estimated)
+    recall = hits / len(reference)
+    return 0.0 if hits == 0 else 2 * precision * recall / (precision + recall)
+
+
+def tempo_errors(reference_beats, tempo_map):
+    """Error relativo del tempo local estimado en cada beat de referencia"""
+    if len(tempo_map) < 2 or len(reference_beats) < 2:
+        return np.ones(1)
+    intervals = np.diff(reference_beats)
+    centers = reference_beats[:-1] + intervals / 2
+    true_bpm = 60.0 / intervals
+    estimated = np.array([tempo_map.tempo_at(t) for t in centers])
+    return np.abs(estimated - true_bpm) / true_bpm
+
+
+# ============================================
+# EJECUCIÓN
+# ============================================
+
+def run_pipeline(y, sr):
+    """Mismas etapas que AudioAnalyzer, cronometradas"""
+    duration = len(y) / sr
+    timings = {}
+
+    start = time.perf_counter()
+    features = extract_features(y, sr)
+    timings['features'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tempo_map = build_tempo_map(features)
+    timings['tempo'] = time.perf_counter() - start
+
+    # Sin beats suficientes el analizador conserva la rejilla de 120 BPM
+    beat_times = tempo_map.beat_times if len(tempo_map) >= 8 else np.arange(0, duration, 0.5)
+
+    start = time.perf_counter()
+    rms_norm, centroid_norm = normalized_curves(features)
+    structure = analyze_structure(features, beat_times, duration, rms_norm, centroid_norm)
+    timings['structure'] = time.perf_counter() - start
+
+    return tempo_map, structure, timings
+
+
+def evaluate_case(case, repeat=1):
+    """Analiza un caso (repeat veces, se toma el tiempo mínimo) y calcula sus métricas"""
+    best = None
+    for _ in range(max(1, repeat)):
+        tempo_map, structure, timings = run_pipeline(case['audio'], SR)
+        if best is None or sum(timings.values()) < sum(best.values()):
+            best = timings
+
+    duration = len(case['audio']) / SR
+    estimated = tempo_map.beat_times
+    reference = case['beats']
+    seconds = sum(best.values())
+
+    result = {
+        'name': case['name'],
+        'duration': round(duration, 1),
+        'ref_beats': 0 if reference is None else len(reference),
+        'est_beats': len(estimated),
+        'beat_f': round(f_measure([] if reference is None else reference, estimated,
+                                  BEAT_TOLERANCE), 3),
+        'tempo_err': None,
+        'tempo_acc': None,
+        'drops': _event_score(case['drops'], structure['drops']),
+        'builds': _event_score(case['builds'], structure['builds']),
+        'seconds': round(seconds, 4),
+        'stages': {stage: round(value, 4) for stage, value in best.items()},
+        'speed': round(duration / seconds, 1) if seconds > 0 else 0.0,
+    }
+    if reference is not None:
+        errors = tempo_errors(reference, tempo_map)
+        result['tempo_err'] = round(float(np.median(errors)) * 100, 2)
+        result['tempo_acc'] = round(float(np.mean(errors <= TEMPO_TOLERANCE)), 3)
+    return result
+
+
+def _event_score(reference, estimated):
+    """Aciertos, esperados y falsos positivos de drops/builds"""
+    hits = match_events(reference, estimated, EVENT_TOLERANCE)
+    return {'hit': hits, 'expected': len(reference), 'false': len(estimated) - hits}
+
+
+def run_benchmark(seed=0, repeat=1):
+    """Ejecuta todo el corpus y resume"""
+    results = [evaluate_case(case, repeat) for case in build_corpus(seed)]
+
+    with_beats = [r for r in results if r['ref_beats']]
+    audio = sum(r['duration'] for r in results)
+    seconds = sum(r['seconds'] for r in results)
+    events = [r[kind] for r in results for kind in ('drops', 'builds')]
+    summary = {
+        'mean_beat_f': round(float(np.mean([r['beat_f'] for r in with_beats])), 3),
+        'mean_tempo_acc': round(float(np.mean([r['tempo_acc'] for r in with_beats])), 3),
+        'events_hit': sum(e['hit'] for e in events),
+        'events_expected': sum(e['expected'] for e in events),
+        'events_false': sum(e['false'] for e in events),
+        'audio_seconds': round(audio, 1),
+        'seconds': round(seconds, 3),
+        'speed': round(audio / seconds, 1) if seconds > 0 else 0.0,
+    }
+    return {'seed': seed, 'sample_rate': SR, 'hop_length': AUDIO_ANALYSIS['hop_length'],
+            'cases': results, 'summary': summary}
+
+
+def format_report(report):
+    """Informe de texto con columnas fijas (apto para diff)"""
+    def events(score):
+        return f"{score['hit']}/{score['expected']} +{score['false']}"
+
+    def optional(value, fmt):
+        return format(value, fmt) if value is not None else '-'
+
+    lines = [
+        f"Benchmark de análisis (seed={report['seed']}, sr={report['sample_rate']}, "
+        f"hop={report['hop_length']})",
+        "",
+        f"{'caso':<28}{'dur':>7}{'beats':>11}{'F-beat':>8}{'tempo%':>8}{'acc':>7}"
+        f"{'drops':>9}{'builds':>9}{'x real':>9}",
+    ]
+    for r in report['cases']:
+        lines.append(
+            f"{r['name']:<28}{r['duration']:>7.1f}"
+            f"{str(r['ref_beats']) + '/' + str(r['est_beats']):>11}"
+            f"{r['beat_f']:>8.3f}{optional(r['tempo_err'], '.2f'):>8}"
+            f"{optional(r['tempo_acc'], '.3f'):>7}"
+            f"{events(r['drops']):>9}{events(r['builds']):>9}{r['speed']:>9.1f}"
+        )
+
+    s = report['summary']
+    lines += [
+        "",
+        f"F-beat medio: {s['mean_beat_f']:.3f}   tempo correcto: {s['mean_tempo_acc']:.3f}   "
+        f"drops/builds: {s['events_hit']}/{s['events_expected']} +{s['events_false']}",
+        f"Rendimiento: {s['audio_seconds']:.1f}s de audio en {s['seconds']:.3f}s "
+        f"({s['speed']:.1f}x tiempo real)",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de precisión y velocidad del análisis")
+    parser.add_argument('--output', '-o', help="escribir el informe en un archivo")
+    parser.add_argument('--json', action='store_true', help="informe en JSON")
+    parser.add_argument('--seed', type=int, default=0, help="semilla del corpus")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="repeticiones por caso (se usa el tiempo mínimo)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.seed, args.repeat)
+    text = json.dumps(report, indent=2) if args.json else format_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
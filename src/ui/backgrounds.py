@@ -0,0 +1,83 @@
+# src/ui/backgrounds.py - Caché de fondos degradados y elementos estáticos de pantalla
+
+import pygame
+
+# Degradados usados por las pantallas (color superior, color inferior)
+MENU_GRADIENT = ((30, 40, 80), (50, 70, 140))
+PANEL_GRADIENT = ((20, 30, 70), (50, 70, 120))
+
+# Superficies ya renderizadas por (tamaño, colores)
+_gradient_cache = {}
+
+
+def _prepare(surface):
+    """Convierte al formato de la pantalla si ya hay una ventana"""
+    if pygame.display.get_surface() is not None:
+        return surface.convert()
+    return surface
+
+
+def get_gradient(size, colors):
+    """
+    Obtiene un degradado vertical renderizado una sola vez por resolución
+
+    Args:
+        size: (ancho, alto) de la superficie
+        colors: tupla (color_superior, color_inferior)
+    """
+    key = (tuple(size), colors)
+    surface = _gradient_cache.get(key)
+
+    if surface is None:
+        width, height = size
+        top, bottom = colors
+        surface = pygame.Surface((width, height))
+
+        for y in range(height):
+            ratio = y / height
+            color = tuple(int(t + ratio * (b - t)) for t, b in zip(top, bottom))
+            pygame.draw.line(surface, color, (0, y), (width, y))
+
+        surface = _prepare(surface)
+        _gradient_cache[key] = surface
+
+    return surface
+
+
+def clear_cache():
+    """Libera los degradados cacheados (p. ej. tras cambiar de resolución)"""
+    _gradient_cache.clear()
+
+
+class StaticLayer:
+    """
+    Fondo más elementos estáticos (títulos, textos, paneles) pre-renderados
+
+    El builder recibe la superficie ya rellena con el degradado y dibuja
+    encima todo lo que no cambia entre frames. La capa solo se reconstruye
+    al cambiar la resolución o al llamar a invalidate().
+    """
+
+    def __init__(self, colors, builder=None):
+        self.colors = colors
+        self.builder = builder
+        self.surface = None
+        self.size = None
+
+    def invalidate(self):
+        """Fuerza a reconstruir la capa en el próximo dibujado"""
+        self.surface = None
+
+    def get(self, size):
+        """Obtiene la capa para la resolución dada"""
+        size = tuple(size)
+        if self.surface is None or self.size != size:
+            self.surface = get_gradient(size, self.colors).copy()
+            if self.builder:
+                self.builder(self.surface)
+            self.size = size
+        return self.surface
+
+    def draw(self, screen):
+        """Dibuja la capa ocupando toda la pantalla"""
+        screen.blit(self.get(screen.get_size()), (0, 0))
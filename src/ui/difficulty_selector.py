@@ -3,6 +3,8 @@
 import pygame
 import math
 from src.settings import WIDTH, HEIGHT
+from src.ui.backgrounds import StaticLayer, MENU_GRADIENT
+from src.core.scenes import Scene, SceneRuntime
 
 class DifficultyButton:
     """Botón de selección de dificultad"""
@@ -14,6 +16,10 @@ class DifficultyButton:
         self.description = description
         self.hovered = False
         self.scale = 1.0
+        
+        # Textos renderizados en el primer dibujado
+        self.title_surf = None
+        self.desc_surf = None
     
     def update(self, events):
         """Actualiza el botón"""
@@ -52,18 +58,20 @@ class DifficultyButton:
         border_width = 4 if self.hovered else 2
         pygame.draw.rect(screen, border_color, rect, border_width, border_radius=15)
         
+        if self.title_surf is None:
+            self.title_surf = font_title.render(self.difficulty.upper(), True, (255, 255, 255))
+            self.desc_surf = font_desc.render(self.description, True, (220, 220, 220))
+        
         # Título
-        title_text = font_title.render(self.difficulty.upper(), True, (255, 255, 255))
-        title_rect = title_text.get_rect(center=(rect.centerx, rect.centery - 20))
-        screen.blit(title_text, title_rect)
+        title_rect = self.title_surf.get_rect(center=(rect.centerx, rect.centery - 20))
+        screen.blit(self.title_surf, title_rect)
         
         # Descripción
-        desc_text = font_desc.render(self.description, True, (220, 220, 220))
-        desc_rect = desc_text.get_rect(center=(rect.centerx, rect.centery + 20))
-        screen.blit(desc_text, desc_rect)
+        desc_rect = self.desc_surf.get_rect(center=(rect.centerx, rect.centery + 20))
+        screen.blit(self.desc_surf, desc_rect)
 
-class DifficultySelector:
-    """Pantalla de selección de dificultad"""
+class DifficultySelector(Scene):
+    """Pantalla de selección de dificultad; su resultado es la dificultad o None"""
     
     # Configuración de dificultades
     DIFFICULTIES = {
@@ -94,9 +102,9 @@ class DifficultySelector:
     }
     
     def __init__(self, screen, clock):
+        super().__init__()
         self.screen = screen
         self.clock = clock
-        self.running = True
         self.selected_difficulty = None
         
         # Fuentes
@@ -122,71 +130,67 @@ class DifficultySelector:
             )
             self.buttons.append(button)
         
-        # Animación del título
+        # Animación del título (texto renderizado una vez, solo se escala)
         self.title_time = 0
+        self.title_text = "Selecciona Dificultad"
+        self.title_base = self.font_title.render(self.title_text, True, (255, 255, 255))
+        self.shadow_base = self.font_title.render(self.title_text, True, (0, 0, 0))
+        
+        # Fondo e instrucción pre-renderizados
+        self.static_layer = StaticLayer(MENU_GRADIENT, self._draw_static)
     
     def run(self):
-        """Loop principal del selector"""
-        while self.running:
-            dt = self.clock.tick(60) / 1000.0
-            self.title_time += dt
-            
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT:
-                    return None
-                
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        return None
-            
-            # Actualizar botones
-            for button in self.buttons:
-                if button.update(events):
-                    self.selected_difficulty = button.difficulty
-                    self.running = False
-            
-            # Dibujar
-            self._draw()
-            pygame.display.flip()
-        
-        return self.selected_difficulty
+        """Muestra solo el selector y retorna la dificultad elegida (None si se cancela)"""
+        result = SceneRuntime(self.screen, self.clock).run(self)
+        return None if result == 'quit' else result
+    
+    def update(self, dt, events):
+        self.title_time += dt
+        
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.finish(None)
+                    return
+        
+        # Actualizar botones
+        for button in self.buttons:
+            if button.update(events):
+                self.selected_difficulty = button.difficulty
+                self.finish(self.selected_difficulty)
+                return
+    
+    def draw(self, screen):
+        self._draw()
+    
+    def _draw_static(self, surface):
+        """Dibuja la instrucción fija sobre el fondo cacheado"""
+        instruction = self.font_small.render(
+            "Selecciona la dificultad que prefieras",
+            True, (200, 200, 200)
+        )
+        instruction_rect = instruction.get_rect(center=(WIDTH // 2, HEIGHT - 50))
+        surface.blit(instruction, instruction_rect)
     
     def _draw(self):
         """Dibuja la pantalla"""
-        # Fondo degradado
-        for y in range(HEIGHT):
-            ratio = y / HEIGHT
-            r = int(30 + ratio * 20)
-            g = int(40 + ratio * 30)
-            b = int(80 + ratio * 60)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WIDTH, y))
+        # Fondo degradado e instrucción (pre-renderizados)
+        self.static_layer.draw(self.screen)
         
         # Título con animación
         title_scale = 1.0 + math.sin(self.title_time * 2) * 0.03
-        title_text = "Selecciona Dificultad"
-        title_surf = self.font_title.render(title_text, True, (255, 255, 255))
         
-        scaled_width = int(title_surf.get_width() * title_scale)
-        scaled_height = int(title_surf.get_height() * title_scale)
-        title_surf = pygame.transform.scale(title_surf, (scaled_width, scaled_height))
+        scaled_width = int(self.title_base.get_width() * title_scale)
+        scaled_height = int(self.title_base.get_height() * title_scale)
+        title_surf = pygame.transform.scale(self.title_base, (scaled_width, scaled_height))
         title_rect = title_surf.get_rect(center=(WIDTH // 2, 150))
         
         # Sombra del título
-        shadow_surf = self.font_title.render(title_text, True, (0, 0, 0))
-        shadow_surf = pygame.transform.scale(shadow_surf, (scaled_width, scaled_height))
+        shadow_surf = pygame.transform.scale(self.shadow_base, (scaled_width, scaled_height))
         shadow_rect = shadow_surf.get_rect(center=(WIDTH // 2 + 3, 153))
         self.screen.blit(shadow_surf, shadow_rect)
         self.screen.blit(title_surf, title_rect)
         
         # Dibujar botones
         for button in self.buttons:
-            button.draw(self.screen, self.font_button_title, self.font_button_desc)
-        
-        # Instrucción
-        instruction = self.font_small.render(
-            "Selecciona la dificultad que prefieras",
-            True, (200, 200, 200)
-        )
-        instruction_rect = instruction.get_rect(center=(WIDTH // 2, HEIGHT - 50))
-        self.screen.blit(instruction, instruction_rect)
\ No newline at end of file
+            button.draw(self.screen, self.font_button_title, self.font_button_desc)
\ No newline at end of file
@@ -4,6 +4,11 @@ import pygame
 import math
 import random
 from src.settings import WIDTH, HEIGHT
+from src.ui.backgrounds import StaticLayer, MENU_GRADIENT
+from src.core.scenes import Scene, SceneRuntime
+
+# Superficies de partículas ya dibujadas por (tamaño, color)
+_particle_sprites = {}
 
 class MenuButton:
     """Botón animado del menú"""
@@ -19,6 +24,13 @@ class MenuButton:
         self.hovered = False
         self.animation_time = random.uniform(0, math.pi * 2)
         self.click_scale = 1.0
+        
+        # Textos pre-renderizados (no cambian entre frames)
+        self.text_surf = font.render(text, True, (255, 255, 255))
+        self.icon_surf = None
+        if icon:
+            icon_font = pygame.font.SysFont('arial', 48)
+            self.icon_surf = icon_font.render(icon, True, (255, 255, 255))
     
     def update(self, dt, events):
         """Actualiza el botón"""
@@ -70,14 +82,12 @@ class MenuButton:
             pygame.draw.rect(screen, (200, 200, 200), rect, 2, border_radius=15)
         
         # Icono
-        if self.icon:
-            icon_font = pygame.font.SysFont('arial', 48)
-            icon_surf = icon_font.render(self.icon, True, (255, 255, 255))
-            icon_rect = icon_surf.get_rect(midleft=(rect.left + 20, rect.centery))
-            screen.blit(icon_surf, icon_rect)
+        if self.icon_surf:
+            icon_rect = self.icon_surf.get_rect(midleft=(rect.left + 20, rect.centery))
+            screen.blit(self.icon_surf, icon_rect)
         
         # Texto
-        text_surf = self.font.render(self.text, True, (255, 255, 255))
+        text_surf = self.text_surf
         if self.icon:
             text_rect = text_surf.get_rect(center=(rect.centerx + 20, rect.centery))
         else:
@@ -122,155 +132,161 @@ class Particle:
     
     def draw(self, screen):
         """Dibuja la partícula"""
-        surf = pygame.Surface((self.size * 2, self.size * 2))
-        surf.set_colorkey((0, 0, 0))
-        pygame.draw.circle(surf, self.color, (self.size, self.size), self.size)
+        key = (self.size, self.color)
+        surf = _particle_sprites.get(key)
+        if surf is None:
+            surf = pygame.Surface((self.size * 2, self.size * 2))
+            surf.set_colorkey((0, 0, 0))
+            pygame.draw.circle(surf, self.color, (self.size, self.size), self.size)
+            _particle_sprites[key] = surf
         surf.set_alpha(self.alpha)
         screen.blit(surf, (self.x - self.size, self.y - self.size))
 
-def run_menu(screen, clock):
+class MainMenu(Scene):
     """Menú principal del juego"""
     
-    # Fuentes
-    font_title = pygame.font.SysFont('arial', 80, bold=True)
-    font_subtitle = pygame.font.SysFont('arial', 28, italic=True)
-    font_button = pygame.font.SysFont('arial', 36, bold=True)
-    font_small = pygame.font.SysFont('arial', 18)
-    
-    # Crear botones
-    button_width = 350
-    button_height = 70
-    button_spacing = 90
-    start_y = HEIGHT // 2 + 20
-    
-    btn_play = MenuButton(
-        (WIDTH // 2 - button_width // 2, start_y, button_width, button_height),
-        "JUGAR",
-        font_button,
-        (80, 150, 255),
-        (100, 180, 255),
-        "▶"
-    )
-    
-    btn_options = MenuButton(
-        (WIDTH // 2 - button_width // 2, start_y + button_spacing, button_width, button_height),
-        "OPCIONES",
-        font_button,
-        (150, 100, 255),
-        (180, 130, 255),
-        "⚙"
-    )
-    
-    btn_quit = MenuButton(
-        (WIDTH // 2 - button_width // 2, start_y + button_spacing * 2, button_width, button_height),
-        "SALIR",
-        font_button,
-        (255, 100, 100),
-        (255, 130, 130),
-        "✕"
-    )
-    
-    buttons = [btn_play, btn_options, btn_quit]
+    def __init__(self, on_action=None):
+        """
+        Args:
+            on_action: callback(acción) con 'play' / 'options' / 'quit'. Sin
+                callback el menú se cierra con la acción como resultado.
+        """
+        super().__init__()
+        self.on_action = on_action
+        
+        # Fuentes
+        font_title = pygame.font.SysFont('arial', 80, bold=True)
+        self.font_subtitle = pygame.font.SysFont('arial', 28, italic=True)
+        font_button = pygame.font.SysFont('arial', 36, bold=True)
+        self.font_small = pygame.font.SysFont('arial', 18)
+        
+        # Crear botones
+        button_width = 350
+        button_height = 70
+        button_spacing = 90
+        start_y = HEIGHT // 2 + 20
+        
+        self.btn_play = MenuButton(
+            (WIDTH // 2 - button_width // 2, start_y, button_width, button_height),
+            "JUGAR",
+            font_button,
+            (80, 150, 255),
+            (100, 180, 255),
+            "▶"
+        )
+        
+        self.btn_options = MenuButton(
+            (WIDTH // 2 - button_width // 2, start_y + button_spacing, button_width, button_height),
+            "OPCIONES",
+            font_button,
+            (150, 100, 255),
+            (180, 130, 255),
+            "⚙"
+        )
+        
+        self.btn_quit = MenuButton(
+            (WIDTH // 2 - button_width // 2, start_y + button_spacing * 2, button_width, button_height),
+            "SALIR",
+            font_button,
+            (255, 100, 100),
+            (255, 130, 130),
+            "✕"
+        )
+        
+        self.buttons = [self.btn_play, self.btn_options, self.btn_quit]
+        
+        # Sistema de partículas
+        self.particles = [Particle() for _ in range(100)]
+        
+        # Animación del título (el texto se renderiza una sola vez y solo se escala)
+        self.title_scale = 1.0
+        self.title_time = 0
+        title_text = "RAYMAN SHINOBI"
+        self.title_base = font_title.render(title_text, True, (255, 255, 255))
+        self.shadow_base = font_title.render(title_text, True, (0, 0, 0))
+        
+        self.static_layer = StaticLayer(MENU_GRADIENT, self._draw_static)
     
-    # Sistema de partículas
-    particles = [Particle() for _ in range(100)]
+    def _draw_static(self, surface):
+        """Subtítulo, instrucciones y versión (no cambian entre frames)"""
+        subtitle = self.font_subtitle.render("Music Rhythm Runner", True, (200, 220, 255))
+        subtitle_rect = subtitle.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
+        surface.blit(subtitle, subtitle_rect)
+        
+        instructions = [
+            "Controles: ESPACIO / ↑ / W - Saltar (doble salto disponible)",
+            "ESC - Pausar | R - Reiniciar (en Game Over)"
+        ]
+        
+        y_offset = HEIGHT - 60
+        for instruction in instructions:
+            text = self.font_small.render(instruction, True, (180, 180, 200))
+            text_rect = text.get_rect(center=(WIDTH // 2, y_offset))
+            surface.blit(text, text_rect)
+            y_offset += 25
+        
+        version_text = self.font_small.render("v1.0 | Made with ♥", True, (150, 150, 170))
+        version_rect = version_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 10))
+        surface.blit(version_text, version_rect)
     
-    # Animación del título
-    title_scale = 1.0
-    title_time = 0
+    def _choose(self, action):
+        if self.on_action is None:
+            self.finish(action)
+        else:
+            self.on_action(action)
     
-    running = True
-    while running:
-        dt = clock.tick(60) / 1000.0
-        
-        events = pygame.event.get()
+    def update(self, dt, events):
         for event in events:
-            if event.type == pygame.QUIT:
-                return 'quit'
-            
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return 'quit'
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self._choose('quit')
+                return
         
         # Actualizar animación del título
-        title_time += dt
-        title_scale = 1.0 + math.sin(title_time * 2) * 0.05
+        self.title_time += dt
+        self.title_scale = 1.0 + math.sin(self.title_time * 2) * 0.05
         
         # Actualizar partículas
-        for particle in particles:
+        for particle in self.particles:
             particle.update(dt)
         
         # Actualizar botones
-        for button in buttons:
+        for button in self.buttons:
             if button.update(dt, events):
-                if button == btn_play:
-                    return 'play'
-                elif button == btn_options:
-                    # Por ahora volver al menú
-                    pass
-                elif button == btn_quit:
-                    return 'quit'
-        
-        # Dibujar
-        # Fondo degradado
-        for y in range(HEIGHT):
-            ratio = y / HEIGHT
-            r = int(30 + ratio * 20)
-            g = int(40 + ratio * 30)
-            b = int(80 + ratio * 60)
-            pygame.draw.line(screen, (r, g, b), (0, y), (WIDTH, y))
+                if button == self.btn_play:
+                    self._choose('play')
+                elif button == self.btn_options:
+                    self._choose('options')
+                elif button == self.btn_quit:
+                    self._choose('quit')
+                return
+    
+    def draw(self, screen):
+        # Fondo degradado y textos estáticos (pre-renderizados)
+        self.static_layer.draw(screen)
         
         # Dibujar partículas
-        for particle in particles:
+        for particle in self.particles:
             particle.draw(screen)
         
         # Título con efecto de escala
-        title_text = "RAYMAN SHINOBI"
-        title_surf = font_title.render(title_text, True, (255, 255, 255))
-        
-        # Aplicar escala
-        scaled_width = int(title_surf.get_width() * title_scale)
-        scaled_height = int(title_surf.get_height() * title_scale)
-        title_surf = pygame.transform.scale(title_surf, (scaled_width, scaled_height))
+        scaled_width = int(self.title_base.get_width() * self.title_scale)
+        scaled_height = int(self.title_base.get_height() * self.title_scale)
+        title_surf = pygame.transform.scale(self.title_base, (scaled_width, scaled_height))
         
         title_rect = title_surf.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 180))
         
         # Sombra del título
-        shadow_surf = font_title.render(title_text, True, (0, 0, 0))
-        shadow_surf = pygame.transform.scale(shadow_surf, (scaled_width, scaled_height))
+        shadow_surf = pygame.transform.scale(self.shadow_base, (scaled_width, scaled_height))
         shadow_rect = shadow_surf.get_rect(center=(WIDTH // 2 + 4, HEIGHT // 2 - 176))
         screen.blit(shadow_surf, shadow_rect)
         
         # Título
         screen.blit(title_surf, title_rect)
         
-        # Subtítulo
-        subtitle = font_subtitle.render("Music Rhythm Runner", True, (200, 220, 255))
-        subtitle_rect = subtitle.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
-        screen.blit(subtitle, subtitle_rect)
-        
         # Dibujar botones
-        for button in buttons:
+        for button in self.buttons:
             button.draw(screen)
-        
-        # Instrucciones en la parte inferior
-        instructions = [
-            "Controles: ESPACIO / ↑ / W - Saltar (doble salto disponible)",
-            "ESC - Pausar | R - Reiniciar (en Game Over)"
-        ]
-        
-        y_offset = HEIGHT - 60
-        for instruction in instructions:
-            text = font_small.render(instruction, True, (180, 180, 200))
-            text_rect = text.get_rect(center=(WIDTH // 2, y_offset))
-            screen.blit(text, text_rect)
-            y_offset += 25
-        
-        # Versión
-        version_text = font_small.render("v1.0 | Made with ♥", True, (150, 150, 170))
-        version_rect = version_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 10))
-        screen.blit(version_text, version_rect)
-        
-        pygame.display.flip()
-    
-    return 'quit'
\ No newline at end of file
+
+def run_menu(screen, clock):
+    """Muestra solo el menú principal y retorna la acción elegida"""
+    return SceneRuntime(screen, clock).run(MainMenu())
@@ -3,9 +3,11 @@
 import pygame
 import os
 import random
-from tkinter import filedialog
-import tkinter as tk
-from src.settings import WIDTH, HEIGHT, MUSIC_DIR, SUPPORTED_AUDIO_FORMATS
+from src.settings import WIDTH, HEIGHT, SUPPORTED_AUDIO_FORMATS
+from src.core.music_library import get_library
+from src.ui.backgrounds import StaticLayer, PANEL_GRADIENT
+from src.core.scenes import Scene, SceneRuntime
+from src.ui.waveform_view import request_waveform_surface, retry_missing_peaks
 
 class Button:
     """Botón mejorado con efectos visuales"""
@@ -19,6 +21,7 @@ class Button:
         self.text_color = text_color
         self.hovered = False
         self.click_animation = 0
+        self.text_surf = font.render(text, True, text_color)
     
     def update(self, events):
         """Actualiza estado del botón"""
@@ -61,25 +64,60 @@ class Button:
             pygame.draw.rect(screen, (255, 255, 255), rect, 3, border_radius=12)
         
         # Texto
-        text_surf = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surf.get_rect(center=rect.center)
-        screen.blit(text_surf, text_rect)
+        text_rect = self.text_surf.get_rect(center=rect.center)
+        screen.blit(self.text_surf, text_rect)
 
 class MusicEntry:
-    """Entrada individual de música en el catálogo"""
+    """Fila reutilizable de la lista de música (se asocia a una pista del índice)"""
     
-    def __init__(self, rect, filename, font):
+    STATUS_ICONS = {
+        'pending': ("♪", (150, 200, 255)),
+        'analyzed': ("✓", (120, 255, 150)),
+        'failed': ("⚠", (255, 180, 100)),
+    }
+    WAVEFORM_COLORS = ((255, 255, 255, 35), (255, 255, 255, 60))  # Picos y RMS
+    
+    def __init__(self, rect, font):
         self.rect = pygame.Rect(rect)
-        self.filename = filename
-        self.display_name = os.path.splitext(filename)[0][:30]  # Truncar nombre
         self.font = font
         self.hovered = False
         self.selected = False
+        self.index = None
+        self.track_key = None
+        self.text_surf = None
+        self.info_surf = None
+        self.waveform_surf = None
+        self.content_hash = None
     
-    def update(self, events):
-        """Actualiza estado"""
+    def bind(self, index, track):
+        """Asocia la fila a una pista; solo re-renderiza si la pista cambió"""
+        self.index = index
+        key = (track['path'], track['content_hash'], track['duration'], track['analysis_status'])
+        if key == self.track_key:
+            return
+        self.track_key = key
+        
+        display_name = os.path.splitext(track['filename'])[0][:30]  # Truncar nombre
+        self.text_surf = self.font.render(display_name, True, (255, 255, 255))
+        
+        icon, color = self.STATUS_ICONS.get(track['analysis_status'], self.STATUS_ICONS['pending'])
+        info = icon
+        if track['duration']:
+            minutes, seconds = divmod(int(track['duration']), 60)
+            info = f"{minutes}:{seconds:02d}  {icon}"
+        self.info_surf = self.font.render(info, True, color)
+        
+        # Forma de onda tenue de fondo (solo si la pista ya se analizó alguna
+        # vez); los picos se leen en segundo plano y se pide en cada dibujado
+        self.content_hash = track['content_hash']
+        self.waveform_surf = None
+        if self.content_hash and track['analysis_status'] == 'analyzed':
+            retry_missing_peaks(self.content_hash)
+    
+    def update(self, events, clip_rect):
+        """Actualiza estado (solo responde dentro del área visible de la lista)"""
         mouse_pos = pygame.mouse.get_pos()
-        self.hovered = self.rect.collidepoint(mouse_pos)
+        self.hovered = self.rect.collidepoint(mouse_pos) and clip_rect.collidepoint(mouse_pos)
         
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -97,23 +135,33 @@ class MusicEntry:
         border_color = (255, 255, 255) if self.hovered or self.selected else (100, 120, 150)
         pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=8)
         
+        if self.waveform_surf is None and self.content_hash:
+            size = (self.rect.width - 16, self.rect.height - 12)
+            self.waveform_surf = request_waveform_surface(self.content_hash, size,
+                                                          *self.WAVEFORM_COLORS)
+        if self.waveform_surf:
+            screen.blit(self.waveform_surf, (self.rect.left + 8, self.rect.top + 6))
+        
         # Texto
-        text_surf = self.font.render(self.display_name, True, (255, 255, 255))
-        text_rect = text_surf.get_rect(midleft=(self.rect.left + 15, self.rect.centery))
-        screen.blit(text_surf, text_rect)
-        
-        # Indicador de archivo de audio
-        icon_text = self.font.render("♪", True, (150, 200, 255))
-        icon_rect = icon_text.get_rect(midright=(self.rect.right - 15, self.rect.centery))
-        screen.blit(icon_text, icon_rect)
+        text_rect = self.text_surf.get_rect(midleft=(self.rect.left + 15, self.rect.centery))
+        screen.blit(self.text_surf, text_rect)
+        
+        # Duración y estado de análisis
+        info_rect = self.info_surf.get_rect(midright=(self.rect.right - 15, self.rect.centery))
+        screen.blit(self.info_surf, info_rect)
 
-class MusicSelector:
-    """Pantalla de selección de música"""
+class MusicSelector(Scene):
+    """Pantalla de selección de música; su resultado es (ruta, 'play' / 'menu')"""
+    
+    LIST_TOP = 150
+    ENTRY_WIDTH = 600
+    ENTRY_HEIGHT = 50
+    ENTRY_SPACING = 60
     
     def __init__(self, screen, clock):
+        super().__init__()
         self.screen = screen
         self.clock = clock
-        self.running = True
         
         # Fuentes
         self.font_title = pygame.font.SysFont('arial', 56, bold=True)
@@ -121,17 +169,25 @@ class MusicSelector:
         self.font_medium = pygame.font.SysFont('arial', 24)
         self.font_small = pygame.font.SysFont('arial', 18)
         
-        # Cargar catálogo de música
-        self.music_files = self._load_music_catalog()
+        # Catálogo desde el índice persistente; el escaneo incremental corre
+        # en segundo plano y la lista se refresca cuando termina
+        self.library = get_library()
+        self.tracks = []
+        self.library_version = None
         self.selected_music = None
+        self.selected_index = None
         
         # Scroll
         self.scroll_offset = 0
         self.max_scroll = 0
         
-        # Crear entradas de música
+        # Lista virtualizada: solo existen las filas que caben en pantalla
+        self.list_rect = pygame.Rect(WIDTH // 2 - self.ENTRY_WIDTH // 2, self.LIST_TOP,
+                                     self.ENTRY_WIDTH, HEIGHT - 440)
         self.music_entries = []
         self._create_music_entries()
+        self._reload_tracks()
+        self.library.scan_async()
         
         # Botones
         button_width = 280
@@ -166,6 +222,11 @@ class MusicSelector:
             (255, 255, 255)
         )
         
+        # Fondo, título y avisos fijos pre-renderizados
+        self.static_layer = StaticLayer(PANEL_GRADIENT, self._draw_static)
+        self.selected_surf = None
+        self.selected_surf_path = None
+        
         # Partículas de fondo
         self.particles = []
         for _ in range(30):
@@ -176,93 +237,89 @@ class MusicSelector:
                 'size': random.randint(2, 5)
             })
     
-    def _load_music_catalog(self):
-        """Carga archivos de música del directorio"""
-        music_files = []
+    def _reload_tracks(self):
+        """Recarga las pistas del índice conservando la selección"""
+        self.library_version = self.library.version
+        self.tracks = self.library.tracks()
+        
+        self.selected_index = None
+        for i, track in enumerate(self.tracks):
+            if track['path'] == self.selected_music:
+                self.selected_index = i
+                break
         
-        if os.path.exists(MUSIC_DIR):
-            for file in os.listdir(MUSIC_DIR):
-                if any(file.lower().endswith(ext) for ext in SUPPORTED_AUDIO_FORMATS):
-                    music_files.append(file)
+        # Calcular scroll máximo
+        total_height = len(self.tracks) * self.ENTRY_SPACING
+        self.max_scroll = max(0, total_height - self.list_rect.height)
+        self.scroll_offset = min(self.scroll_offset, self.max_scroll)
         
-        music_files.sort()
-        return music_files
+        # Los avisos fijos dependen de si hay música y de si hay scroll
+        if hasattr(self, 'static_layer'):
+            self.static_layer.invalidate()
     
     def _create_music_entries(self):
-        """Crea las entradas visuales de música"""
-        self.music_entries = []
-        
-        entry_width = 600
-        entry_height = 50
-        entry_spacing = 60
-        start_x = WIDTH // 2 - entry_width // 2
-        start_y = 150
-        
-        for i, music_file in enumerate(self.music_files):
-            entry = MusicEntry(
-                (start_x, start_y + i * entry_spacing, entry_width, entry_height),
-                music_file,
-                self.font_medium
-            )
-            self.music_entries.append(entry)
-        
-        # Calcular scroll máximo
-        total_height = len(self.music_entries) * entry_spacing
-        visible_height = HEIGHT - 400
-        self.max_scroll = max(0, total_height - visible_height)
+        """Crea el conjunto fijo de filas reutilizables"""
+        visible_rows = self.list_rect.height // self.ENTRY_SPACING + 2
+        self.music_entries = [
+            MusicEntry((self.list_rect.x, 0, self.ENTRY_WIDTH, self.ENTRY_HEIGHT), self.font_medium)
+            for _ in range(visible_rows)
+        ]
+    
+    def _visible_entries(self):
+        """Asocia cada fila a la pista que le toca según el scroll"""
+        first = self.scroll_offset // self.ENTRY_SPACING
+        for slot, entry in enumerate(self.music_entries):
+            index = first + slot
+            if index >= len(self.tracks):
+                break
+            entry.bind(index, self.tracks[index])
+            entry.rect.y = self.LIST_TOP + index * self.ENTRY_SPACING - self.scroll_offset
+            entry.selected = index == self.selected_index
+            yield entry
     
     def run(self):
-        """Loop principal del selector"""
-        while self.running:
-            dt = self.clock.tick(60) / 1000.0
-            
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT:
-                    return None, 'quit'
-                
-                # Scroll con rueda del mouse
-                if event.type == pygame.MOUSEWHEEL:
-                    self.scroll_offset -= event.y * 30
-                    self.scroll_offset = max(0, min(self.scroll_offset, self.max_scroll))
-                
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        return None, 'menu'
-            
-            # Actualizar
-            self._update(events)
-            
-            # Dibujar
-            self._draw()
+        """Muestra solo el selector y retorna (música, acción)"""
+        result = SceneRuntime(self.screen, self.clock).run(self)
+        return (None, 'quit') if result == 'quit' else result
+    
+    def update(self, dt, events):
+        for event in events:
+            # Scroll con rueda del mouse
+            if event.type == pygame.MOUSEWHEEL:
+                self.scroll_offset -= event.y * 30
+                self.scroll_offset = max(0, min(self.scroll_offset, self.max_scroll))
             
-            pygame.display.flip()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.finish((None, 'menu'))
+                    return
         
-        return self.selected_music, 'play' if self.selected_music else 'menu'
+        self._update(events, dt)
+    
+    def draw(self, screen):
+        self._draw()
     
-    def _update(self, events):
+    def _update(self, events, dt):
         """Actualiza lógica"""
-        # Actualizar partículas
+        # Actualizar partículas (velocidad en píxeles por frame a 60 FPS)
         for particle in self.particles:
-            particle['y'] += particle['speed']
+            particle['y'] += particle['speed'] * dt * 60
             if particle['y'] > HEIGHT:
                 particle['y'] = 0
                 particle['x'] = random.randint(0, WIDTH)
         
-        # Actualizar entradas de música
-        for entry in self.music_entries:
-            # Ajustar posición por scroll
-            entry.rect.y = 150 + self.music_entries.index(entry) * 60 - self.scroll_offset
-            
-            # Solo actualizar si es visible
-            if -60 < entry.rect.y < HEIGHT:
-                if entry.update(events):
-                    # Seleccionar música
-                    for e in self.music_entries:
-                        e.selected = False
-                    entry.selected = True
-                    self.selected_music = os.path.join(MUSIC_DIR, entry.filename)
-                    print(f"🎵 Seleccionada: {entry.filename}")
+        # Refrescar la lista si el escaneo de fondo cambió el índice
+        if self.library.version != self.library_version:
+            self._reload_tracks()
+        
+        # Actualizar solo las filas visibles
+        for entry in self._visible_entries():
+            if entry.update(events, self.list_rect):
+                # Seleccionar música
+                track = self.tracks[entry.index]
+                self.selected_index = entry.index
+                self.selected_music = track['path']
+                print(f"🎵 Seleccionada: {track['filename']}")
         
         # Actualizar botones
         if self.btn_load_file.update(events):
@@ -270,14 +327,19 @@ class MusicSelector:
         
         if self.btn_play.update(events):
             if self.selected_music:
-                self.running = False
+                self.finish((self.selected_music, 'play'))
+                return
         
         if self.btn_back.update(events):
             self.selected_music = None
-            self.running = False
+            self.finish((None, 'menu'))
     
     def _load_custom_file(self):
         """Abre diálogo para cargar archivo personalizado"""
+        # tkinter solo hace falta para el diálogo: se importa al abrirlo
+        import tkinter as tk
+        from tkinter import filedialog
+        
         root = tk.Tk()
         root.withdraw()
         root.wm_attributes('-topmost', 1)
@@ -299,28 +361,10 @@ class MusicSelector:
             print(f"🎵 Archivo cargado: {os.path.basename(filepath)}")
             
             # Marcar como seleccionado visualmente
-            for entry in self.music_entries:
-                entry.selected = False
+            self.selected_index = None
     
-    def _draw(self):
-        """Dibuja la pantalla"""
-        # Fondo degradado
-        for y in range(HEIGHT):
-            ratio = y / HEIGHT
-            r = int(20 + ratio * 30)
-            g = int(30 + ratio * 40)
-            b = int(70 + ratio * 50)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WIDTH, y))
-        
-        # Partículas de fondo
-        for particle in self.particles:
-            pygame.draw.circle(
-                self.screen,
-                (100, 150, 200),
-                (int(particle['x']), int(particle['y'])),
-                particle['size']
-            )
-        
+    def _draw_static(self, surface):
+        """Dibuja título y avisos fijos sobre el fondo cacheado"""
         # Título
         title_text = self.font_title.render("Selecciona tu Música", True, (255, 255, 255))
         title_rect = title_text.get_rect(center=(WIDTH // 2, 80))
@@ -328,44 +372,57 @@ class MusicSelector:
         # Sombra del título
         shadow_text = self.font_title.render("Selecciona tu Música", True, (0, 0, 0))
         shadow_rect = shadow_text.get_rect(center=(WIDTH // 2 + 3, 83))
-        self.screen.blit(shadow_text, shadow_rect)
-        self.screen.blit(title_text, title_rect)
-        
-        # Área de scroll (crear máscara de recorte)
-        scroll_area = pygame.Surface((WIDTH, HEIGHT - 400))
-        scroll_area.set_colorkey((0, 0, 0))
-        
-        # Dibujar entradas en el área de scroll
-        for entry in self.music_entries:
-            if -60 < entry.rect.y < HEIGHT:
-                entry.draw(self.screen)
+        surface.blit(shadow_text, shadow_rect)
+        surface.blit(title_text, title_rect)
         
         # Indicador de scroll si hay más contenido
         if self.max_scroll > 0:
             scroll_text = self.font_small.render("⇅ Usa la rueda del mouse para desplazar", True, (180, 180, 180))
             scroll_rect = scroll_text.get_rect(center=(WIDTH // 2, HEIGHT - 250))
-            self.screen.blit(scroll_text, scroll_rect)
+            surface.blit(scroll_text, scroll_rect)
         
         # Mensaje si no hay música
-        if not self.music_files:
+        if not self.tracks:
             no_music_text = self.font_medium.render(
                 "No hay archivos de música. Usa 'Cargar Archivo' para seleccionar uno.",
                 True, (255, 200, 100)
             )
             no_music_rect = no_music_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-            self.screen.blit(no_music_text, no_music_rect)
+            surface.blit(no_music_text, no_music_rect)
+    
+    def _draw(self):
+        """Dibuja la pantalla"""
+        # Fondo degradado, título y avisos (pre-renderizados)
+        self.static_layer.draw(self.screen)
+        
+        # Partículas de fondo
+        for particle in self.particles:
+            pygame.draw.circle(
+                self.screen,
+                (100, 150, 200),
+                (int(particle['x']), int(particle['y'])),
+                particle['size']
+            )
+        
+        # Dibujar entradas visibles recortadas al área de la lista
+        self.screen.set_clip(self.list_rect)
+        for entry in self._visible_entries():
+            entry.draw(self.screen)
+        self.screen.set_clip(None)
         
         # Dibujar botones
         self.btn_load_file.draw(self.screen)
         self.btn_play.draw(self.screen)
         self.btn_back.draw(self.screen)
         
-        # Indicador de selección
+        # Indicador de selección (se re-renderiza solo al cambiar la selección)
         if self.selected_music:
-            selected_name = os.path.basename(self.selected_music)
-            selected_text = self.font_small.render(
-                f"Seleccionado: {selected_name[:40]}",
-                True, (100, 255, 100)
-            )
-            selected_rect = selected_text.get_rect(center=(WIDTH // 2, HEIGHT - 280))
-            self.screen.blit(selected_text, selected_rect)
\ No newline at end of file
+            if self.selected_surf_path != self.selected_music:
+                selected_name = os.path.basename(self.selected_music)
+                self.selected_surf = self.font_small.render(
+                    f"Seleccionado: {selected_name[:40]}",
+                    True, (100, 255, 100)
+                )
+                self.selected_surf_path = self.selected_music
+            selected_rect = self.selected_surf.get_rect(center=(WIDTH // 2, HEIGHT - 280))
+            self.screen.blit(self.selected_surf, selected_rect)
\ No newline at end of file
@@ -0,0 +1,126 @@
+# src/ui/waveform_view.py - Superficies de forma de onda cacheadas por tamaño
+
+import queue
+import threading
+from collections import OrderedDict
+import pygame
+from src.core.waveform import load_peaks, build_cached_peaks
+
+# Superficies ya renderizadas por (pista, tamaño, colores)
+_surface_cache = {}
+MAX_CACHED_SURFACES = 64
+
+# Picos leídos de disco por hash de contenido (None = la pista aún no tiene)
+_peaks_cache = OrderedDict()
+MAX_CACHED_PEAKS = 128
+_pending = set()
+_requests = queue.SimpleQueue()
+_lock = threading.Lock()
+_worker = None
+
+
+def get_waveform_surface(key, peaks, size, peak_color, rms_color):
+    """
+    Obtiene la forma de onda renderizada una sola vez por tamaño
+
+    Args:
+        key: identificador de la pista (p. ej. hash de contenido)
+        peaks: WaveformPeaks de la pista
+        size: (ancho, alto) en píxeles
+        peak_color, rms_color: colores RGBA de min/max y del RMS
+    """
+    cache_key = (key, tuple(size), peak_color, rms_color)
+    surface = _surface_cache.get(cache_key)
+
+    if surface is None:
+        width, height = size
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        mins, maxs, rms = peaks.columns(width)
+
+        center = height / 2
+        half = height / 2 - 1
+        scale = len(mins) / width if len(mins) else 1
+        for x in range(width):
+            col = min(int(x * scale), len(mins) - 1)
+            if col < 0:
+                break
+            top = int(center - maxs[col] * half)
+            bottom = int(center - mins[col] * half)
+            pygame.draw.line(surface, peak_color, (x, top), (x, bottom))
+            level = int(rms[col] * half)
+            pygame.draw.line(surface, rms_color,
+                             (x, int(center - level)), (x, int(center + level)))
+
+        # Las vistas visibles cambian poco: se descarta la más antigua
+        if len(_surface_cache) >= MAX_CACHED_SURFACES:
+            _surface_cache.pop(next(iter(_surface_cache)))
+        _surface_cache[cache_key] = surface
+
+    return surface
+
+
+def _load_worker():
+    """
+    Thread de fondo: lee de disco los picos pedidos, uno a uno
+
+    Si faltan pero el PCM de la pista está en caché, se generan a partir de
+    él sin decodificar el audio.
+    """
+    while True:
+        content_hash = _requests.get()
+        peaks = load_peaks(content_hash)
+        if peaks is None:
+            try:
+                peaks = build_cached_peaks(content_hash)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ No se pudo generar la forma de onda: {e}")
+        with _lock:
+            _peaks_cache[content_hash] = peaks
+            _peaks_cache.move_to_end(content_hash)
+            while len(_peaks_cache) > MAX_CACHED_PEAKS:
+                _peaks_cache.popitem(last=False)
+            _pending.discard(content_hash)
+
+
+def request_waveform_surface(content_hash, size, peak_color, rms_color):
+    """
+    Forma de onda de una pista sin bloquear el thread principal
+
+    Retorna None mientras los picos se leen de disco en segundo plano (o
+    si la pista aún no tiene picos); la superficie está lista en un frame
+    posterior. Pensado para listas que re-asocian filas al hacer scroll.
+    """
+    global _worker
+    surface = _surface_cache.get((content_hash, tuple(size), peak_color, rms_color))
+    if surface is not None:
+        return surface
+
+    with _lock:
+        if content_hash not in _peaks_cache:
+            if content_hash not in _pending:
+                _pending.add(content_hash)
+                _requests.put(content_hash)
+                if _worker is None:
+                    _worker = threading.Thread(target=_load_worker, daemon=True)
+                    _worker.start()
+            return None
+        peaks = _peaks_cache[content_hash]
+        _peaks_cache.move_to_end(content_hash)
+
+    if peaks is None:
+        return None
+    return get_waveform_surface(content_hash, peaks, size, peak_color, rms_color)
+
+
+def retry_missing_peaks(content_hash):
+    """Vuelve a buscar en disco los picos de una pista que no los tenía"""
+    with _lock:
+        if content_hash in _peaks_cache and _peaks_cache[content_hash] is None:
+            del _peaks_cache[content_hash]
+
+
+def clear_cache():
+    """Libera las formas de onda renderizadas y los picos leídos"""
+    _surface_cache.clear()
+    with _lock:
+        _peaks_cache.clear()
@@ -2,6 +2,12 @@
 
 import pygame
 import os
+from src.core.assets import get_assets
+
+def layer_path(base, folder, file):
+    """Ruta de la imagen de una capa"""
+    return os.path.join(base, 'assets', 'world', 'layers', folder, file)
+
 
 class Parallax:
     """Capa de parallax para fondos con efecto de profundidad"""
@@ -16,19 +22,27 @@ class Parallax:
             file: Nombre del archivo de imagen
             speed: Velocidad de desplazamiento (menor = más lento)
         """
-        # Cargar imagen
-        image_path = os.path.join(base, 'assets', 'world', 'layers', folder, file)
+        # Cargar imagen (compartida por el gestor de assets entre partidas)
+        self.image_path = layer_path(base, folder, file)
+        self.owns_image = True
         
         try:
-            self.img = pygame.image.load(image_path).convert_alpha()
+            self.img = get_assets().image(self.image_path)
         except FileNotFoundError:
             # Crear imagen placeholder si no existe
-            print(f"⚠️ Imagen no encontrada: {image_path}")
+            print(f"⚠️ Imagen no encontrada: {self.image_path}")
             self.img = self._create_placeholder(folder)
+            self.owns_image = False
         
         self.speed = speed
         self.x = 0
     
+    def release(self):
+        """Devuelve la imagen al gestor de assets"""
+        if self.owns_image:
+            get_assets().release_image(self.image_path)
+            self.owns_image = False
+    
     def _create_placeholder(self, folder):
         """Crea una imagen placeholder según el tipo de capa"""
         width = 1280
@@ -0,0 +1,9 @@
+# tests/conftest.py - Configuración común: sin ventana ni audio, raíz del repo importable
+
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,32 @@
+# tests/test_analysis_cache.py - Claves por etapa: un ajuste solo invalida su etapa y las siguientes
+
+import pytest
+from src.settings import AUDIO_ANALYSIS, STRUCTURE_CONFIG, ONSET_CONFIG
+from src.core.analysis_cache import AnalysisCache, STAGES
+
+
+def keys_with(monkeypatch, config, name, value):
+    monkeypatch.setitem(config, name, value)
+    return AnalysisCache('unused').stage_keys('track-hash')
+
+
+@pytest.mark.parametrize('config, name, value, first_changed', [
+    (AUDIO_ANALYSIS, 'hop_length', 256, 'features'),
+    (AUDIO_ANALYSIS, 'tempo_range', (70, 180), 'tempo'),
+    (STRUCTURE_CONFIG, 'novelty_delta', 0.2, 'structure'),
+    (ONSET_CONFIG, 'match_window', 0.05, 'chart'),
+])
+def test_setting_invalidates_only_downstream(monkeypatch, config, name, value, first_changed):
+    before = AnalysisCache('unused').stage_keys('track-hash')
+    after = keys_with(monkeypatch, config, name, value)
+
+    split = STAGES.index(first_changed)
+    for stage in STAGES[:split]:
+        assert after[stage] == before[stage]
+    for stage in STAGES[split:]:
+        assert after[stage] != before[stage]
+
+
+def test_keys_depend_on_track():
+    cache = AnalysisCache('unused')
+    assert cache.stage_keys('a')['features'] != cache.stage_keys('b')['features']
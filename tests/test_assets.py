@@ -0,0 +1,45 @@
+# tests/test_assets.py - AssetManager: precarga de imágenes que ya estaban en caché
+
+import pygame
+from src.core.assets import AssetManager
+
+
+def cache_image(assets, path):
+    """Deja en caché una imagen como si la hubiera cargado el thread principal"""
+    key = assets.image_key(path)
+    assets.acquire(key, lambda: pygame.Surface((8, 8)))
+    assets.release(key)
+    return key
+
+
+def test_convert_pending_drops_already_cached_images(tmp_path):
+    assets = AssetManager(budget_mb=1)
+    path = str(tmp_path / 'sheet.png')
+    cache_image(assets, path)
+    assets._decoded[path] = pygame.Surface((8, 8))
+
+    task = assets.convert_pending()
+    steps = sum(1 for _ in zip(range(100), task))
+    assert steps < 100
+    assert assets._decoded == {}
+
+
+def test_image_discards_decoded_copy_when_cached(tmp_path):
+    assets = AssetManager(budget_mb=1)
+    path = str(tmp_path / 'sheet.png')
+    key = cache_image(assets, path)
+    cached = assets.entries[key].value
+    assets._decoded[path] = pygame.Surface((8, 8))
+
+    assert assets.image(path) is cached
+    assert path not in assets._decoded
+
+
+def test_preload_skips_cached_images(tmp_path):
+    assets = AssetManager(budget_mb=1)
+    path = str(tmp_path / 'sheet.png')
+    pygame.image.save(pygame.Surface((8, 8)), path)
+    cache_image(assets, path)
+
+    assert assets.preload([path]) is None
+    assert assets._decoded == {}
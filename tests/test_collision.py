@@ -0,0 +1,45 @@
+# tests/test_collision.py - Swept AABB: túneles, orden de contacto y bordes
+
+import numpy as np
+from src.core.collision import swept_aabb, first_swept_hit, hits_in_order
+
+
+def box(left, top, width, height):
+    return np.array([left, top, left + width, top + height], dtype=np.float64)
+
+
+def test_fast_box_tunnelling_through_thin_wall_hits():
+    wall = box(100, 0, 4, 100)[None, :]
+    # Antes y después del frame no hay solape, pero la caja atraviesa el muro
+    hit, t_hit = swept_aabb(box(50, 40, 10, 10), box(150, 40, 10, 10), wall, wall)
+    assert hit.tolist() == [True]
+    assert 0.3 < t_hit[0] < 0.5
+
+
+def test_touching_edges_do_not_count():
+    other = box(10, 0, 10, 10)[None, :]
+    still = box(0, 0, 10, 10)
+    hit, _ = swept_aabb(still, still, other, other)
+    assert not hit.any()
+
+
+def test_both_boxes_moving_are_relative():
+    # Se mueven juntas: nunca se tocan aunque sus barridos se crucen
+    hit, _ = swept_aabb(box(0, 0, 10, 10), box(100, 0, 10, 10),
+                        box(20, 0, 10, 10)[None, :], box(120, 0, 10, 10)[None, :])
+    assert not hit.any()
+
+
+def test_hits_in_order_sorts_by_contact_time():
+    targets = np.stack([box(140, 0, 10, 10), box(60, 0, 10, 10), box(100, 0, 10, 10),
+                        box(100, 50, 10, 10)])
+    a_prev, a_curr = box(0, 0, 10, 10), box(200, 0, 10, 10)
+    assert hits_in_order(a_prev, a_curr, targets, targets) == [1, 2, 0]
+    assert first_swept_hit(a_prev, a_curr, targets, targets) == 1
+
+
+def test_no_targets():
+    empty = np.zeros((0, 4))
+    hit, t_hit = swept_aabb(box(0, 0, 1, 1), box(1, 1, 1, 1), empty, empty)
+    assert len(hit) == 0 and len(t_hit) == 0
+    assert hits_in_order(box(0, 0, 1, 1), box(1, 1, 1, 1), empty, empty) == []
@@ -0,0 +1,55 @@
+# tests/test_enemy_schedule.py - Cola de eventos de enemigos: cursor, seek y fusión
+
+import numpy as np
+from src.entities.enemy_waves import EnemySchedule, EVENT_SPAWN, EVENT_FIRE
+
+
+def make_schedule():
+    times = [2.0, 1.0, 1.0, 3.0, 2.0]
+    action = [EVENT_FIRE, EVENT_FIRE, EVENT_SPAWN, EVENT_FIRE, EVENT_SPAWN]
+    uid = [1, 1, 1, 1, 2]
+    return EnemySchedule(times, action, [0] * 5, uid, [100.0] * 5)
+
+
+def test_events_sorted_with_spawns_first():
+    schedule = make_schedule()
+    assert schedule.times.tolist() == [1.0, 1.0, 2.0, 2.0, 3.0]
+    assert schedule.action.tolist() == [EVENT_SPAWN, EVENT_FIRE, EVENT_SPAWN, EVENT_FIRE, EVENT_FIRE]
+    assert schedule.spawn_count() == 2
+
+
+def test_pop_due_consumes_each_event_once():
+    schedule = make_schedule()
+    assert schedule.pop_due(0.5) == slice(0, 0)
+    due = schedule.pop_due(1.0)
+    assert schedule.times[due].tolist() == [1.0, 1.0]
+    assert schedule.pop_due(1.5) == slice(2, 2)
+    due = schedule.pop_due(10.0)
+    assert schedule.times[due].tolist() == [2.0, 2.0, 3.0]
+    assert schedule.pop_due(20.0) == slice(5, 5)
+
+
+def test_seek_rewinds_and_skips():
+    schedule = make_schedule()
+    schedule.pop_due(10.0)
+    schedule.seek(2.0)
+    assert schedule.times[schedule.pop_due(2.0)].tolist() == [2.0, 2.0]
+
+    # Al volver atrás los eventos se repiten; al saltar adelante se omiten
+    schedule.seek(0.0)
+    assert schedule.times[schedule.pop_due(1.0)].tolist() == [1.0, 1.0]
+    schedule.seek(2.5)
+    assert schedule.times[schedule.pop_due(10.0)].tolist() == [3.0]
+
+
+def test_pending_for_and_merged():
+    schedule = make_schedule()
+    schedule.pop_due(1.0)
+    pending = schedule.pending_for([1])
+    assert pending[0].tolist() == [2.0, 3.0]
+    assert np.all(pending[3] == 1)
+
+    merged = EnemySchedule([], [], [], [], []).merged(pending)
+    assert len(merged) == 2
+    assert merged.cursor == 0
+    assert merged.times[merged.pop_due(2.5)].tolist() == [2.0]
@@ -0,0 +1,39 @@
+# tests/test_pcm_cache.py - PCMCache: fragmentos leídos del memmap y picos desde el caché
+
+import numpy as np
+import pytest
+from src.settings import WAVEFORM_CONFIG
+from src.core import waveform
+from src.core.pcm_cache import PCMCache
+
+
+@pytest.fixture
+def pcm_cache(tmp_path):
+    cache = PCMCache(tmp_path / 'pcm', max_mb=16, sample_rate=1000)
+    cache.put('track', np.arange(5000, dtype=np.float32) / 5000)
+    return cache
+
+
+def test_read_slice_comes_from_memmap(pcm_cache):
+    samples = pcm_cache.read('track', 0.5, 0.75)
+    assert isinstance(samples, np.memmap)
+    assert len(samples) == 250
+    assert samples[0] == pytest.approx(500 / 5000)
+    assert samples[-1] == pytest.approx(749 / 5000)
+
+
+def test_read_clamps_to_track(pcm_cache):
+    assert len(pcm_cache.read('track', 4.5, 10.0)) == 500
+    assert len(pcm_cache.read('track', 6.0, 7.0)) == 0
+    assert len(pcm_cache.read('track')) == 5000
+    assert pcm_cache.read('missing') is None
+
+
+def test_peaks_built_from_cached_pcm(pcm_cache, tmp_path, monkeypatch):
+    monkeypatch.setitem(WAVEFORM_CONFIG, 'dir', str(tmp_path / 'waveforms'))
+    monkeypatch.setattr(waveform, 'get_pcm_cache', lambda: pcm_cache)
+
+    assert waveform.build_cached_peaks('missing') is None
+    peaks = waveform.build_cached_peaks('track')
+    assert peaks.duration == pytest.approx(5.0)
+    assert waveform.load_peaks('track') is not None
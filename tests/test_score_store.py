@@ -0,0 +1,100 @@
+# tests/test_score_store.py - ScoreStore: posiciones, tablas agregadas y récords personales
+
+import pytest
+from src.core.score_store import ScoreStore, SCORE_BUCKET
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScoreStore(tmp_path / 'scores.db', legacy_json=None)
+    yield store
+    store.close()
+
+
+def add(store, name, score, difficulty='normal', song_hash='song-a'):
+    return store.add_run(name, score, difficulty, 0, 0, 'song.mp3', song_hash)
+
+
+def test_rank_places_new_run_after_equal_scores(store):
+    for score in (500, 1500, 1500, 2500, SCORE_BUCKET * 7):
+        add(store, 'ana', score)
+    assert store.rank(SCORE_BUCKET * 8) == 1
+    assert store.rank(2500, 'song-a', 'normal') == 3
+    assert store.rank(1500, 'song-a', 'normal') == 5
+    assert store.rank(1499, 'song-a', 'normal') == 5
+    assert store.rank(0, 'song-a', 'normal') == 6
+
+
+def test_rank_per_board_and_aggregates(store):
+    add(store, 'ana', 900, 'easy', 'song-a')
+    add(store, 'ana', 800, 'hard', 'song-a')
+    add(store, 'bo', 1200, 'hard', 'song-b')
+
+    assert store.rank(850, 'song-a', 'easy') == 2
+    assert store.rank(850, 'song-a', 'hard') == 1
+    assert store.rank(850, 'song-a') == 2
+    assert store.rank(850, difficulty='hard') == 2
+    assert store.rank(850) == 3
+
+
+def test_tied_run_rank_matches_its_board_position(store):
+    for score in (3000, 1000, 2000, 2000, 999):
+        add(store, 'ana', score)
+
+    position = store.rank(2000, 'song-a', 'normal')
+    run_id = add(store, 'bo', 2000)
+    board = [entry['id'] for entry in store.top('song-a', 'normal', limit=10)]
+    assert board.index(run_id) + 1 == position == 4
+
+
+def test_rank_matches_naive_count(store):
+    scores = [37, 999, 1000, 1001, 4200, 4200, 12345, 0]
+    for score in scores:
+        add(store, 'ana', score)
+    for probe in {score + delta for score in scores for delta in (-1, 0, 1)}:
+        assert store.rank(probe) == 1 + sum(score >= probe for score in scores)
+
+
+def test_counts_rebuilt_for_existing_database(tmp_path):
+    path = tmp_path / 'scores.db'
+    store = ScoreStore(path, legacy_json=None)
+    for score in (100, 2100, 3100):
+        add(store, 'ana', score)
+    # Base de datos anterior a los conteos
+    store.conn.execute("DELETE FROM score_counts")
+    store.conn.execute("DELETE FROM score_buckets")
+    store.conn.execute("DELETE FROM meta WHERE key = 'score_bucket'")
+    store.conn.commit()
+    store.close()
+
+    store = ScoreStore(path, legacy_json=None)
+    assert store.rank(2000, 'song-a', 'normal') == 3
+    assert store.rank(2100) == 3
+    store.close()
+
+
+def test_personal_best_keeps_highest_run(store):
+    add(store, 'ana', 300)
+    best_id = add(store, 'ana', 900)
+    add(store, 'ana', 500)
+    add(store, 'bo', 2000)
+    add(store, 'ana', 5000, difficulty='hard')
+
+    best = store.personal_best('ana', 'song-a', 'normal')
+    assert best['id'] == best_id
+    assert best['score'] == 900
+    assert store.personal_best('ana', 'song-b', 'normal') is None
+    assert store.count() == 5
+
+
+def test_leaderboard_reports_position_shown_on_board(tmp_path):
+    from src.ui.leaderboard import Leaderboard
+    leaderboard = Leaderboard(max_entries=10, db_path=tmp_path / 'scores.db')
+    for score in (700, 500, 500):
+        leaderboard.add_score('ana', score, 'normal', 0, 0, 'song.mp3', 'song-a')
+
+    position = leaderboard.add_score('bo', 500, 'normal', 0, 0, 'song.mp3', 'song-a')
+    board = leaderboard.get_scores('normal', 'song-a')
+    assert position == 4
+    assert board[position - 1]['id'] == leaderboard.last_run_id
+    leaderboard.store.close()
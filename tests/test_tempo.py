@@ -0,0 +1,70 @@
+# tests/test_tempo.py - Conversiones de TempoMap y búsquedas de BeatGrid
+
+import numpy as np
+import pytest
+from src.core.tempo_map import TempoMap
+from src.core.beat_grid import BeatGrid, TimingJudge
+
+
+def steady_beats(bpm, count, start=0.0):
+    return start + np.arange(count) * 60.0 / bpm
+
+
+def test_time_and_beat_are_inverse():
+    tempo = TempoMap(steady_beats(120, 32, start=1.0))
+    for time in (0.25, 1.0, 3.3, 16.5, 20.0):
+        assert tempo.beat_to_time(tempo.time_to_beat(time)) == pytest.approx(time)
+    assert tempo.time_to_beat(2.0) == pytest.approx(2.0)
+
+
+def test_extrapolates_with_edge_periods():
+    tempo = TempoMap(steady_beats(120, 8))
+    assert tempo.time_to_beat(-0.5) == pytest.approx(-1.0)
+    assert tempo.time_to_beat(4.5) == pytest.approx(9.0)
+    assert tempo.beat_to_time(10.0) == pytest.approx(5.0)
+
+
+def test_tempo_change_splits_segments():
+    slow = steady_beats(120, 40)
+    fast = steady_beats(150, 40, start=slow[-1] + 0.4)
+    tempo = TempoMap(np.concatenate([slow, fast]))
+
+    assert len(tempo.segments) == 2
+    assert tempo.tempo_at(5.0) == pytest.approx(120, abs=1)
+    assert tempo.tempo_at(fast[20]) == pytest.approx(150, abs=1)
+    assert tempo.period_at(fast[20]) == pytest.approx(0.4)
+
+
+def test_beat_grid_nearest_and_ranges():
+    grid = BeatGrid([1.5, 0.5, 1.0, 2.0])
+    assert grid.nearest(0.74) == 0.5
+    assert grid.nearest(0.76) == 1.0
+    assert grid.nearest(9.0) == 2.0
+    assert grid.offset(0.9) == pytest.approx(-0.1)
+    assert grid.next_after(1.0) == 1.5
+    assert grid.next_after(2.0) is None
+    assert grid.between(1.0, 1.5) == [1.0, 1.5]
+    assert grid.within(1.04, 0.05)
+    assert not grid.within(1.2, 0.05)
+
+
+def test_empty_beat_grid():
+    grid = BeatGrid([])
+    assert grid.nearest(1.0) is None
+    assert grid.offset(1.0) is None
+    assert not grid.within(1.0, 1.0)
+
+
+def test_judge_grades_without_counting_until_recorded():
+    grid = BeatGrid([1.0, 2.0])
+    judge = TimingJudge('normal', input_offset=0.0)
+
+    on_beat = judge.judge(grid, 1.0)
+    off_beat = judge.judge(grid, 1.5)
+    assert on_beat['grade'] == 'perfect'
+    assert off_beat['grade'] == 'miss'
+    assert sum(judge.counts.values()) == 0
+
+    judge.record(on_beat)
+    assert judge.counts['perfect'] == 1
+    assert judge.counts['miss'] == 0
@@ -0,0 +1,70 @@
+# tests/test_timers.py - TimerHeap: orden, reinicio, cancelación y compactación
+
+import pytest
+from src.core.timers import TimerHeap
+
+
+def test_fires_in_due_order():
+    timers = TimerHeap()
+    fired = []
+    timers.schedule(0.3, lambda: fired.append('c'))
+    timers.schedule(0.1, lambda: fired.append('a'))
+    timers.schedule(0.2, lambda: fired.append('b'))
+    timers.advance(0.15)
+    assert fired == ['a']
+    timers.advance(1.0)
+    assert fired == ['a', 'b', 'c']
+    assert len(timers) == 0
+
+
+def test_restart_postpones_and_fires_once():
+    timers = TimerHeap()
+    fired = []
+    handle = timers.schedule(1.0, lambda: fired.append(timers.time))
+    timers.advance(0.8)
+    timers.restart(handle)
+    timers.advance(0.8)
+    assert fired == []
+    assert timers.remaining(handle) == pytest.approx(0.2)
+    timers.advance(0.3)
+    assert len(fired) == 1
+    timers.advance(5.0)
+    assert len(fired) == 1
+
+
+def test_restart_after_firing_reactivates():
+    timers = TimerHeap()
+    fired = []
+    handle = timers.schedule(0.5, lambda: fired.append(1))
+    timers.advance(1.0)
+    timers.restart(handle, 0.25)
+    assert len(timers) == 1
+    timers.advance(0.25)
+    assert fired == [1, 1]
+
+
+def test_cancel_skips_callback():
+    timers = TimerHeap()
+    fired = []
+    handle = timers.schedule(0.5, lambda: fired.append(1))
+    timers.cancel(handle)
+    timers.cancel(handle)
+    timers.cancel(None)
+    timers.advance(1.0)
+    assert fired == []
+    assert len(timers) == 0
+    assert timers.remaining(handle) == 0.0
+
+
+def test_compaction_drops_stale_entries():
+    timers = TimerHeap()
+    fired = []
+    handle = timers.schedule(1.0, lambda: fired.append(1))
+    for _ in range(500):
+        timers.restart(handle)
+    # Cada reinicio deja una entrada obsoleta; el heap no crece sin límite
+    assert len(timers._heap) < 100
+    timers.advance(2.0)
+    assert fired == [1]
+    assert timers._heap == []
+